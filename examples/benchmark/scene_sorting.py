@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+# vispy: testskip
+# -----------------------------------------------------------------------------
+# Copyright (c) Vispy Development Team. All Rights Reserved.
+# Distributed under the (new) BSD License. See LICENSE.txt for more info.
+# -----------------------------------------------------------------------------
+"""
+Compare drawing a mixed scene in scene graph order to drawing it with
+``SceneCanvas.sort_visuals`` enabled.
+
+The scene interleaves opaque images and meshes with translucent markers and
+lines, so that consecutive visuals in the scene graph use different programs
+and GL states. For both modes, the mean frame time and the number of GL state
+changes that were emitted and skipped per frame are printed.
+"""
+import sys
+import time
+
+import numpy as np
+
+from vispy import scene
+from vispy.geometry import create_sphere
+from vispy.visuals.transforms import STTransform
+
+n_cells = 12 if len(sys.argv) < 2 else int(sys.argv[1])
+n_frames = 200
+
+canvas = scene.SceneCanvas(keys='interactive', size=(800, 800), show=True)
+view = canvas.central_widget.add_view()
+view.camera = 'panzoom'
+view.camera.set_range(x=(0, n_cells), y=(0, n_cells))
+
+rng = np.random.RandomState(0)
+sphere = create_sphere(16, 16, radius=0.3)
+for i in range(n_cells):
+    for j in range(n_cells):
+        kind = (i + j) % 4
+        tr = STTransform(translate=(i + 0.5, j + 0.5, rng.rand()))
+        if kind == 0:
+            image = rng.rand(16, 16, 3).astype(np.float32)
+            v = scene.visuals.Image(image, parent=view.scene)
+            v.transform = STTransform(scale=(0.05, 0.05),
+                                      translate=(i + 0.1, j + 0.1))
+            v.set_gl_state('opaque')
+        elif kind == 1:
+            v = scene.visuals.Markers(parent=view.scene)
+            v.set_data(rng.rand(50, 2) - 0.5, face_color=(1, 1, 1, 0.5),
+                       size=4)
+            v.transform = tr
+        elif kind == 2:
+            v = scene.visuals.Mesh(meshdata=sphere, color=(0.2, 0.6, 1, 1),
+                                   parent=view.scene)
+            v.transform = tr
+            v.set_gl_state('opaque')
+        else:
+            v = scene.visuals.Line(rng.rand(50, 2) - 0.5,
+                                   color=(1, 0.5, 0, 0.5), parent=view.scene)
+            v.transform = tr
+
+
+def run(sort_visuals):
+    canvas.sort_visuals = sort_visuals
+    # warm up: compile programs and upload data
+    for _ in range(5):
+        canvas.events.draw(region=None)
+    canvas.context.finish()
+    counts = dict(emitted=0, skipped=0)
+    t0 = time.perf_counter()
+    for _ in range(n_frames):
+        canvas.events.draw(region=None)
+        for key, val in canvas.context.get_state_counts().items():
+            counts[key] = counts.get(key, 0) + val
+    canvas.context.finish()
+    dt = (time.perf_counter() - t0) / n_frames
+    print('sort_visuals=%-5s  %6.2f ms/frame  ' % (sort_visuals, dt * 1e3) +
+          '  '.join('%s=%.1f' % (key, val / n_frames)
+                    for key, val in sorted(counts.items())))
+
+
+if __name__ == '__main__':
+    canvas.app.process_events()
+    print('%d visuals, %d frames' % (n_cells ** 2, n_frames))
+    run(False)
+    run(True)
+    canvas.close()
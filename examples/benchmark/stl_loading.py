@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+# vispy: testskip
+# -----------------------------------------------------------------------------
+# Copyright (c) Vispy Development Team. All Rights Reserved.
+# Distributed under the (new) BSD License. See LICENSE.txt for more info.
+# -----------------------------------------------------------------------------
+"""
+Benchmark loading a large binary STL file, with and without welding the
+vertices of the triangles.
+
+The file is generated from a sphere, with the number of triangles given as
+argument (default 10M, which gives a 500 MB file).
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from vispy.geometry import create_sphere
+from vispy.io.stl import load_stl, _stl_dtype, _stl_dtype_header
+
+n_triangles = int(float(sys.argv[1])) if len(sys.argv) > 1 else 10000000
+
+# a sphere with 2 * rows * cols triangles
+n = int(np.sqrt(n_triangles / 2.))
+mesh = create_sphere(n, n)
+vertices, faces = mesh.get_vertices(), mesh.get_faces()
+fname = os.path.join(tempfile.mkdtemp(), 'sphere.stl')
+with open(fname, 'wb') as fid:
+    header = np.zeros(1, _stl_dtype_header)
+    header['face_count'] = len(faces)
+    fid.write(header.tobytes())
+    for start in range(0, len(faces), 1000000):
+        chunk = faces[start:start + 1000000]
+        records = np.zeros(len(chunk), _stl_dtype)
+        records['vertices'] = vertices[chunk]
+        records['normals'] = mesh.get_face_normals()[start:start + len(chunk)]
+        fid.write(records.tobytes())
+print('%d triangles, %d unique vertices, %.0f MB'
+      % (len(faces), len(vertices), os.path.getsize(fname) / 1e6))
+
+for weld in (False, True):
+    t0 = time.perf_counter()
+    with open(fname, 'rb') as fid:
+        result = load_stl(fid, weld=weld)
+    dt = time.perf_counter() - t0
+    nbytes = sum(result[key].nbytes for key in result)
+    print('weld=%-5s  %6.2f s  %d vertices  %.0f MB in memory'
+          % (weld, dt, len(result['vertices']), nbytes / 1e6))
+
+os.remove(fname)
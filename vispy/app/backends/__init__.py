@@ -32,6 +32,7 @@ CORE_BACKENDS = [
 # canvas, the pseudo backends act more like a proxy.
 PSEUDO_BACKENDS = [
     ('jupyter_rfb', '_jupyter_rfb', None),
+    ('asyncio', '_asyncio', None),
     ('_test', '_test', 'vispy.app.backends._test'),  # add one that will fail
 ]
 
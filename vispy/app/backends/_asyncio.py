@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) Vispy Development Team. All Rights Reserved.
+# Distributed under the (new) BSD License. See LICENSE.txt for more info.
+
+"""vispy backend that is driven by an asyncio event loop.
+
+Canvases are rendered offscreen (to a framebuffer object in a hidden GL
+context) and draw events and timers are scheduled on the asyncio event
+loop, so that an asyncio program, e.g. a render server, can interleave
+many canvases with its other I/O. Use ``Canvas.render_async`` or
+``SceneCanvas.render_async`` to obtain images without blocking the loop.
+"""
+
+from __future__ import division
+
+import asyncio
+import warnings
+
+from ..base import BaseApplicationBackend, BaseCanvasBackend, BaseTimerBackend
+from ._offscreen_util import OffscreenContext, FrameBufferHelper
+
+
+# asyncio is part of the standard library, but a GL context for the
+# offscreen rendering is needed (see OffscreenContext)
+available, testable, why_not, which = True, False, None, 'asyncio'
+
+
+# -------------------------------------------------------------- capability ---
+
+capability = dict(
+    title=True,
+    size=True,
+    position=False,
+    show=False,
+    vsync=False,
+    resizable=True,
+    decorate=False,
+    fullscreen=False,
+    context=False,
+    multi_window=True,
+    scroll=False,
+    parent=False,
+    always_on_top=False,
+)
+
+
+def _get_loop():
+    """Get the running event loop, or else the event loop of this thread,
+    creating one if needed.
+    """
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    with warnings.catch_warnings():
+        # get_event_loop() warns if it has to create a loop
+        warnings.simplefilter('ignore', DeprecationWarning)
+        try:
+            return asyncio.get_event_loop()
+        except RuntimeError:
+            pass
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    return loop
+
+
+# ------------------------------------------------------------- application ---
+
+class ApplicationBackend(BaseApplicationBackend):
+
+    def __init__(self):
+        BaseApplicationBackend.__init__(self)
+
+    def _vispy_get_backend_name(self):
+        return 'asyncio'
+
+    def _vispy_process_events(self):
+        loop = _get_loop()
+        if loop.is_running():
+            # The callbacks run as soon as the caller yields to the loop
+            return
+        # Run the callbacks that are ready, without waiting for timers
+        loop.run_until_complete(asyncio.sleep(0))
+
+    def _vispy_run(self):
+        loop = _get_loop()
+        if loop.is_running():
+            return  # the loop is owned by the caller, e.g. asyncio.run()
+        loop.run_forever()
+
+    def _vispy_quit(self):
+        loop = _get_loop()
+        if loop.is_running():
+            loop.stop()
+
+    def _vispy_get_native_app(self):
+        return _get_loop()
+
+
+# ------------------------------------------------------------------ canvas ---
+
+class CanvasBackend(BaseCanvasBackend):
+    """Offscreen canvas that draws from the asyncio event loop
+
+    Calls to ``update()`` are coalesced into a single draw event, which is
+    scheduled with ``call_soon`` on the event loop that is running when the
+    update is requested. A canvas can thus be created before the loop is
+    started (e.g. by ``asyncio.run()``); a draw that is still pending on
+    another loop is scheduled again on the next ``update()``. The canvas
+    draws into a framebuffer object; its contents can be obtained with
+    ``get_frame()``.
+    """
+
+    def __init__(self, vispy_canvas, **kwargs):
+        BaseCanvasBackend.__init__(self, vispy_canvas)
+        p = self._process_backend_kwargs(kwargs)
+        # Use a context per canvas, because we make assumptions about
+        # OpenGL state being local to the canvas.
+        self._context = OffscreenContext()
+        self._helper = FrameBufferHelper()
+        self._title = p.title
+        self._size = 1, 1
+        self._lifecycle = 0  # 0: not initialized, 1: initialized, 2: closed
+        self._draw_handle = None
+        self._draw_loop = None
+        self._resize_pending = False
+        self._vispy_set_size(*p.size)
+
+    def _initialize(self):
+        self._lifecycle = 1
+        self._vispy_canvas.set_current()
+        self._vispy_canvas.events.initialize()
+        self._emit_resize_event()
+
+    def _emit_resize_event(self):
+        self._resize_pending = False
+        if self._lifecycle == 1:
+            self._vispy_canvas.events.resize(size=self._size,
+                                             physical_size=self._size)
+
+    def _draw(self):
+        self._draw_handle = self._draw_loop = None
+        if self._lifecycle == 2:
+            return
+        if not self._lifecycle:
+            self._initialize()
+        elif self._resize_pending:
+            self._emit_resize_event()
+        self._vispy_canvas.set_current()
+        with self._helper:
+            self._vispy_canvas.events.draw(region=None)
+        self._vispy_canvas.context.flush_commands()
+
+    def get_frame(self):
+        """Draw now if an update is pending and return the image array
+
+        Returns
+        -------
+        image : array
+            Numpy array of type ubyte and shape (h, w, 4) with the contents
+            of the framebuffer that the canvas draws into.
+        """
+        if self._draw_handle is not None:
+            self._draw_handle.cancel()
+            self._draw()
+        elif not self._lifecycle:
+            self._draw()
+        self._vispy_canvas.set_current()
+        with self._helper:
+            return self._helper.get_frame()
+
+    def _vispy_warmup(self):
+        self._vispy_canvas.set_current()
+
+    def _vispy_set_current(self):
+        self._context.make_current()
+
+    def _vispy_swap_buffers(self):
+        pass
+
+    def _vispy_set_title(self, title):
+        self._title = title
+
+    def _vispy_set_size(self, w, h):
+        self._size = int(w), int(h)
+        self._helper.set_physical_size(*self._size)
+        # The resize event is emitted by the draw that is scheduled here
+        self._resize_pending = True
+        self._vispy_update()
+
+    def _vispy_set_position(self, x, y):
+        pass
+
+    def _vispy_set_visible(self, visible):
+        pass  # offscreen canvases are never shown
+
+    def _vispy_set_fullscreen(self, fullscreen):
+        raise NotImplementedError()
+
+    def _vispy_update(self):
+        if self._lifecycle == 2:
+            return
+        loop = _get_loop()
+        if self._draw_handle is not None and self._draw_loop is not loop:
+            # The draw was scheduled on a loop that is not the current one,
+            # e.g. before asyncio.run() started a new loop; it may never run
+            self._draw_handle.cancel()
+            self._draw_handle = None
+        if self._draw_handle is None:
+            self._draw_handle = loop.call_soon(self._draw)
+            self._draw_loop = loop
+
+    def _vispy_close(self):
+        if self._draw_handle is not None:
+            self._draw_handle.cancel()
+            self._draw_handle = self._draw_loop = None
+        self._lifecycle = 2
+        self._context.close()
+
+    def _vispy_get_size(self):
+        return self._size
+
+    def _vispy_get_position(self):
+        return 0, 0
+
+    def _vispy_get_fullscreen(self):
+        return False
+
+
+# ------------------------------------------------------------------- timer ---
+
+class TimerBackend(BaseTimerBackend):
+    """Timer that is scheduled with ``loop.call_at``
+
+    Timeouts are scheduled relative to the previous deadline rather than to
+    the time the previous timeout was handled, so the timer does not drift
+    when the loop is busy.
+    """
+
+    def __init__(self, vispy_timer):
+        BaseTimerBackend.__init__(self, vispy_timer)
+        self._loop = None
+        self._handle = None
+        self._interval = 0.
+        self._deadline = 0.
+
+    def _vispy_start(self, interval):
+        self._vispy_stop()
+        self._loop = _get_loop()
+        self._interval = max(interval, 0.)
+        self._deadline = self._loop.time()
+        self._schedule()
+
+    def _schedule(self):
+        self._deadline = max(self._deadline + self._interval,
+                             self._loop.time())
+        self._handle = self._loop.call_at(self._deadline, self._vispy_timeout)
+
+    def _vispy_stop(self):
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    def _vispy_timeout(self):
+        # Schedule the next timeout first, so that stopping the timer in a
+        # callback cancels it
+        self._schedule()
+        self._vispy_timer._timeout()
+
+    def _vispy_get_native_timer(self):
+        return self._handle
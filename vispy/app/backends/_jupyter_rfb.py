@@ -1,5 +1,9 @@
 import sys
+import zlib
 import asyncio
+from time import perf_counter
+
+import numpy as np
 
 from ..base import BaseApplicationBackend, BaseCanvasBackend, BaseTimerBackend
 from ...app import Timer
@@ -67,12 +71,121 @@ class ApplicationBackend(BaseApplicationBackend):
         return asyncio
 
 
+# ------------------------------------------------------------ frame filter ---
+
+class FrameFilter(object):
+    """Decide which frames are sent to the client, and at what resolution
+
+    Frames are hashed (with adler32, which is much cheaper than encoding
+    the frame) so that a frame that is identical to the previous one is
+    skipped. While interacting, frames are downsampled; the client scales
+    them to the size of the widget.
+
+    Parameters
+    ----------
+    downsample : int
+        The factor by which frames are subsampled while interacting.
+    skip_unchanged : bool
+        Whether to skip frames that are identical to the previous frame.
+    dirty_rects : bool
+        Whether to compute the rectangle of the frame that changed since
+        the previous frame, which is reported as ``'dirty_rect'`` in the
+        stats.
+    """
+
+    def __init__(self, downsample=2, skip_unchanged=True, dirty_rects=False):
+        self.downsample = int(downsample)
+        self.skip_unchanged = skip_unchanged
+        self.dirty_rects = dirty_rects
+        self._last_key = None
+        self._last_frame = None
+        self._stats = dict(frames=0, skipped=0, bytes=0, last_bytes=0,
+                           dirty_rect=None, filter_time=0.)
+
+    @property
+    def stats(self):
+        """Frame counters
+
+        A dict with the number of ``'frames'`` that were sent and that
+        were ``'skipped'``, the total number of ``'bytes'`` and the
+        ``'last_bytes'`` of the raw frames that were sent, the
+        ``'dirty_rect'`` (x, y, w, h) of the last frame (None if unknown,
+        or if the whole frame changed in size) and the ``'filter_time'``
+        spent hashing and comparing frames.
+        """
+        return dict(self._stats)
+
+    def reset(self):
+        """Forget the previous frame, so that the next one is sent."""
+        self._last_key = None
+        self._last_frame = None
+
+    def filter(self, frame, interacting=False):
+        """Filter a frame
+
+        Parameters
+        ----------
+        frame : array
+            The rendered frame, of shape (h, w, 4).
+        interacting : bool
+            Whether the user is interacting with the canvas.
+
+        Returns
+        -------
+        frame : array | None
+            The frame to send, or None if it should be skipped.
+        """
+        t0 = perf_counter()
+        stats = self._stats
+        if interacting and self.downsample > 1:
+            frame = frame[::self.downsample, ::self.downsample]
+        frame = np.ascontiguousarray(frame)
+        key = None
+        if self.skip_unchanged:
+            key = frame.shape, interacting, zlib.adler32(frame)
+            if key == self._last_key:
+                stats['skipped'] += 1
+                stats['filter_time'] += perf_counter() - t0
+                return None
+        if self.dirty_rects:
+            stats['dirty_rect'] = _dirty_rect(self._last_frame, frame)
+            self._last_frame = frame
+        self._last_key = key
+        stats['frames'] += 1
+        stats['bytes'] += frame.nbytes
+        stats['last_bytes'] = frame.nbytes
+        stats['filter_time'] += perf_counter() - t0
+        return frame
+
+
+def _dirty_rect(previous, frame):
+    """Get the rectangle (x, y, w, h) in which two frames differ"""
+    if previous is None or previous.shape != frame.shape:
+        return None
+    changed = (previous != frame).any(axis=-1)
+    rows = np.flatnonzero(changed.any(axis=1))
+    if not len(rows):
+        return 0, 0, 0, 0
+    cols = np.flatnonzero(changed.any(axis=0))
+    return (int(cols[0]), int(rows[0]), int(cols[-1] - cols[0] + 1),
+            int(rows[-1] - rows[0] + 1))
+
+
 # ------------------------------------------------------------------ canvas ---
 
 class CanvasBackend(BaseCanvasBackend, RemoteFrameBuffer):
 
     _double_click_supported = True
 
+    # Quality settings for the frames sent while interacting (JPEG quality
+    # and downsampling), and the time without input events after which a
+    # full quality frame is sent. When idle, the quality is set back to
+    # idle_quality, or if that is None, to the quality from before the
+    # interaction. Set idle_quality to 100 for lossless frames when idle.
+    interaction_quality = 50
+    idle_quality = None
+    idle_timeout = 0.25
+
     # Set jupyter_rfb bitmask to accept new style events with 'type' 'timestamp' and 'ratio'
     _event_compatibility = 2
 
@@ -100,6 +213,10 @@ class CanvasBackend(BaseCanvasBackend, RemoteFrameBuffer):
         self._physical_size = 1, 1
         self._lifecycle = 0  # 0: not initialized, 1: initialized, 2: closed
         self._buttons = []
+        self.frame_filter = FrameFilter()
+        self._quality_before_interaction = None
+        self._interacting = False
+        self._last_interaction = 0.
         # Init more based on kwargs (could maybe handle, title, show, context)
         self._vispy_set_size(*kwargs["size"])
         self.resizable = kwargs["resizable"]
@@ -114,6 +231,9 @@ class CanvasBackend(BaseCanvasBackend, RemoteFrameBuffer):
         # These could be removed when we pin jupyter_rfb to 1.x
         type = ev.get("type", None) or ev["event_type"]
         assert type
+        if type in _INTERACTION_EVENTS and (type != "pointer_move" or
+                                            self._buttons):
+            self._notify_interaction()
         if type == "resize":
             # Note that jupyter_rfb already throttles this event
             w, h = ev["width"], ev["height"],
@@ -194,6 +314,40 @@ class CanvasBackend(BaseCanvasBackend, RemoteFrameBuffer):
         else:
             pass  # event ignored / unknown
 
+    @property
+    def frame_stats(self):
+        """Counters of the frames that were sent and skipped (see
+        ``FrameFilter.stats``), and whether the user is interacting.
+        """
+        stats = self.frame_filter.stats
+        stats['interacting'] = self._interacting
+        return stats
+
+    def _notify_interaction(self):
+        """Send lower quality frames until the interaction stops"""
+        self._last_interaction = perf_counter()
+        if not self._interacting:
+            self._interacting = True
+            self._quality_before_interaction = self.quality
+            self.quality = self.interaction_quality
+            self._loop.call_later(self.idle_timeout, self._check_idle)
+
+    def _check_idle(self):
+        if not self._interacting:
+            return
+        remaining = self._last_interaction + self.idle_timeout - perf_counter()
+        if remaining > 0:
+            self._loop.call_later(remaining, self._check_idle)
+            return
+        # Send the current view at full quality
+        self._interacting = False
+        if self.idle_quality is not None:
+            self.quality = self.idle_quality
+        else:
+            self.quality = self._quality_before_interaction
+        self.frame_filter.reset()
+        self._vispy_update()
+
     def _modifiers(self, ev):
         return tuple(getattr(keys, m.upper()) for m in ev["modifiers"])
 
@@ -229,6 +383,17 @@ class CanvasBackend(BaseCanvasBackend, RemoteFrameBuffer):
 
         return array
 
+    def _rfb_send_frame(self, array, is_lossless_redraw=False):
+        # This gets called by the RFB widget with the result of get_frame().
+        # Frames are filtered here, so that get_frame() (which is also used
+        # for snapshots) always returns the full current frame.
+        if is_lossless_redraw:
+            # Send the previous frame again, losslessly
+            return super()._rfb_send_frame(array, is_lossless_redraw)
+        array = self.frame_filter.filter(array, self._interacting)
+        if array is not None:
+            return super()._rfb_send_frame(array)
+
     def _vispy_warmup(self):
         self._vispy_canvas.set_current()
 
@@ -276,6 +441,11 @@ class CanvasBackend(BaseCanvasBackend, RemoteFrameBuffer):
         return False
 
 
+# Events that make the canvas send lower quality frames (pointer_move only
+# while a button is pressed)
+_INTERACTION_EVENTS = ("pointer_down", "pointer_move", "wheel", "key_down")
+
+
 # ------------------------------------------------------------------- timer ---
 
 class TimerBackend(BaseTimerBackend):
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) Vispy Development Team. All Rights Reserved.
+# Distributed under the (new) BSD License. See LICENSE.txt for more info.
+import asyncio
+
+import numpy as np
+from vispy import gloo
+from vispy.app import Application, Canvas, Timer
+from vispy.app.backends import _asyncio
+from vispy.testing import run_tests_if_main, requires_application
+
+
+def test_asyncio_app():
+    """Test running and quitting the asyncio application backend"""
+    app = Application('asyncio')
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        assert app.backend_name == 'asyncio'
+        assert app.native is loop
+        calls = []
+        loop.call_soon(calls.append, 1)
+        app.process_events()
+        assert calls == [1]
+        # run() blocks until quit() is called from the loop
+        loop.call_soon(app.quit)
+        app.run()
+
+        async def main():
+            # run() does not block a loop that is already running
+            app.run()
+            app.process_events()
+            return app.native
+        assert loop.run_until_complete(main()) is loop
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+
+
+def test_asyncio_timer():
+    """Test timers that are driven by the running asyncio loop"""
+    app = Application('asyncio')
+    events = []
+
+    async def main():
+        timer = Timer(0.01, connect=events.append, iterations=3, app=app,
+                      start=True)
+        assert isinstance(timer.native, asyncio.TimerHandle)
+        for _ in range(200):
+            if not timer.running:
+                break
+            await asyncio.sleep(0.01)
+        return timer
+
+    timer = asyncio.run(main())
+    assert not timer.running
+    assert [ev.iteration for ev in events] == [0, 1, 2]
+    assert all(ev.dt >= 0 for ev in events)
+
+    # stopping the timer in a callback cancels the next timeout
+    events = []
+
+    async def stop_early():
+        timer = Timer(0.01, app=app)
+
+        @timer.connect
+        def on_timeout(event):
+            events.append(event)
+            timer.stop()
+        timer.start()
+        await asyncio.sleep(0.1)
+
+    asyncio.run(stop_early())
+    assert len(events) == 1
+
+
+class _GreenCanvas(Canvas):
+
+    def __init__(self, **kwargs):
+        Canvas.__init__(self, **kwargs)
+        self.draws = 0
+
+    def on_draw(self, event):
+        self.draws += 1
+        gloo.set_clear_color((0, 1, 0))
+        gloo.clear()
+
+
+@requires_application()
+def test_asyncio_canvas():
+    """Test drawing and rendering offscreen canvases from the loop"""
+    app = Application('asyncio')
+
+    async def main():
+        canvas = _GreenCanvas(app=app, size=(20, 10))
+        assert isinstance(canvas.native, _asyncio.CanvasBackend)
+        # updates are coalesced into one draw event
+        canvas.update()
+        canvas.update()
+        await asyncio.sleep(0)
+        assert canvas.draws == 1
+        frame = canvas.native.get_frame()
+        assert frame.shape == (10, 20, 4)
+        assert np.all(frame[..., 1] == 255)
+
+        # concurrent renders of several canvases
+        others = [_GreenCanvas(app=app, size=(8, 8)) for _ in range(3)]
+        images = await asyncio.gather(*[c.render_async(alpha=False)
+                                        for c in [canvas] + others])
+        assert images[0].shape == (10, 20, 3)
+        for image in images:
+            assert np.all(image[..., 1] == 255)
+        for c in [canvas] + others:
+            c.close()
+
+    asyncio.run(main())
+
+
+@requires_application()
+def test_asyncio_canvas_before_loop():
+    """Test a canvas that is created before the event loop runs"""
+    app = Application('asyncio')
+    canvas = _GreenCanvas(app=app, size=(20, 10))
+    canvas.update()
+    sizes = []
+    canvas.events.resize.connect(lambda event: sizes.append(event.size))
+
+    async def main():
+        # the pending draw is scheduled again on the running loop
+        canvas.update()
+        await asyncio.sleep(0)
+        assert canvas.draws == 1
+        canvas.size = (8, 6)
+        await asyncio.sleep(0)
+        assert canvas.draws == 2
+        return canvas.native.get_frame()
+
+    try:
+        frame = asyncio.run(main())
+        assert frame.shape == (6, 8, 4)
+        assert np.all(frame[..., 1] == 255)
+        assert sizes == [(20, 10), (8, 6)]
+    finally:
+        canvas.close()
+
+
+run_tests_if_main()
@@ -23,6 +23,37 @@ def test_rfb_app():
     app_backend._vispy_quit()
 
 
+def test_rfb_frame_filter():
+    frame_filter = _jupyter_rfb.FrameFilter(dirty_rects=True)
+    frame = np.zeros((8, 6, 4), np.uint8)
+    assert frame_filter.filter(frame) is frame
+    # unchanged frames are skipped
+    assert frame_filter.filter(frame.copy()) is None
+    frame2 = frame.copy()
+    frame2[2:4, 1, 0] = 255
+    assert frame_filter.filter(frame2) is frame2
+    stats = frame_filter.stats
+    assert stats['frames'] == 2
+    assert stats['skipped'] == 1
+    assert stats['bytes'] == 2 * frame.nbytes
+    assert stats['last_bytes'] == frame.nbytes
+    assert stats['dirty_rect'] == (1, 2, 1, 2)
+
+    # frames are downsampled while interacting
+    small = frame_filter.filter(frame2, interacting=True)
+    assert small.shape == (4, 3, 4)
+    assert frame_filter.stats['dirty_rect'] is None
+    assert frame_filter.filter(frame2, interacting=True) is None
+    # and sent again at full resolution afterwards
+    assert frame_filter.filter(frame2).shape == (8, 6, 4)
+    frame_filter.reset()
+    assert frame_filter.filter(frame2) is frame2
+
+    frame_filter.skip_unchanged = False
+    assert frame_filter.filter(frame2) is frame2
+    assert frame_filter.stats['dirty_rect'] == (0, 0, 0, 0)
+
+
 class MyCanvas(Canvas):
 
     def on_draw(self, event):
@@ -32,7 +63,7 @@ class MyCanvas(Canvas):
 
 @pytest.mark.skipif(jupyter_rfb is None, reason='jupyter_rfb is not installed')
 @requires_application()
-def test_rfb_canvas():
+def test_rfb_canvas(monkeypatch):
 
     app = Application("jupyter_rfb")
     canvas = MyCanvas(app=app)
@@ -66,6 +97,20 @@ def test_rfb_canvas():
     assert np.all(frame[:, :, 0] == 0)
     assert np.all(frame[:, :, 1] == 255)
 
+    # get_frame() always returns the current frame, but unchanged frames
+    # are not sent again
+    sent = []
+    monkeypatch.setattr(jupyter_rfb.RemoteFrameBuffer, '_rfb_send_frame',
+                        lambda self, array, *args: sent.append(array))
+    assert canvas_backend.get_frame().shape[:2] == (60, 60)
+    canvas_backend._rfb_send_frame(canvas_backend.get_frame())
+    canvas_backend._rfb_send_frame(canvas_backend.get_frame())
+    assert len(sent) == 1
+    assert canvas_backend.frame_stats['skipped'] == 1
+    # lossless redraws of the previous frame are passed on
+    canvas_backend._rfb_send_frame(sent[0], True)
+    assert len(sent) == 2
+
     # Test mouse event
     events = []
     canvas.events.mouse_press.connect(lambda e: events.append(e))
@@ -73,5 +118,28 @@ def test_rfb_canvas():
     assert len(events) == 1
     assert tuple(events[0].pos) == (11, 12)
 
+    # Lower quality and resolution while interacting
+    quality = canvas_backend.quality
+    assert canvas_backend.frame_stats['interacting']
+    assert canvas_backend.quality == canvas_backend.interaction_quality
+    assert canvas_backend.get_frame().shape[:2] == (60, 60)
+    canvas_backend._rfb_send_frame(canvas_backend.get_frame())
+    assert sent[-1].shape[:2] == (30, 30)
+    canvas_backend._last_interaction -= canvas_backend.idle_timeout
+    canvas_backend._check_idle()
+    assert not canvas_backend.frame_stats['interacting']
+    assert canvas_backend.quality == quality
+    canvas_backend._rfb_send_frame(canvas_backend.get_frame())
+    assert sent[-1].shape[:2] == (60, 60)
+
+    # The idle quality is used after every interaction
+    canvas_backend.idle_quality = 100
+    for _ in range(2):
+        canvas_backend.handle_event({"event_type": "wheel", "x": 1, "y": 1, "dx": 0, "dy": 100, "modifiers": []})
+        assert canvas_backend.quality == canvas_backend.interaction_quality
+        canvas_backend._last_interaction -= canvas_backend.idle_timeout
+        canvas_backend._check_idle()
+        assert canvas_backend.quality == 100
+
 
 run_tests_if_main()
@@ -5,6 +5,8 @@
 from __future__ import annotations, division, print_function
 
 import sys
+import asyncio
+import itertools
 import numpy as np
 from time import sleep
 
@@ -593,6 +595,89 @@ class Canvas(object):
             result = result[..., :3]
         return result
 
+    async def finish_async(self, interval=0.001):
+        """Wait for the GPU to complete the commands issued so far, without
+        blocking the asyncio event loop.
+
+        The GLIR commands are flushed and a fence is inserted after them,
+        which is then polled every *interval* seconds. Other tasks may use
+        other canvases in the meantime. If the GL implementation does not
+        support fences, this returns right after flushing.
+
+        Parameters
+        ----------
+        interval : float
+            The time in seconds between polls of the fence.
+        """
+        key = next(_fence_keys)
+        self.set_current()
+        self.context.glir.command('FENCE', 0, key)
+        self.context.flush_commands()
+        parser = self.context.shared.parser
+        signaled = getattr(parser, 'fence_signaled', None)
+        if signaled is None:
+            return
+        while True:
+            # other tasks may have made another canvas current
+            self.set_current()
+            if signaled(key):
+                return
+            await asyncio.sleep(interval)
+
+    async def render_async(self, alpha=True, interval=0.001):
+        """Render the canvas to an offscreen buffer and return the image
+        array, yielding to the asyncio event loop while the GPU draws.
+
+        Parameters
+        ----------
+        alpha : bool
+            If True (default) produce an RGBA array (M, N, 4). If False,
+            remove the Alpha channel and return the RGB array (M, N, 3).
+        interval : float
+            The time in seconds between checks whether the GPU is done.
+
+        Returns
+        -------
+        image : array
+            Numpy array of type ubyte and shape (h, w, 4). Index [0, 0] is the
+            upper-left corner of the rendered region. If ``alpha`` is ``False``,
+            then only 3 channels will be returned (RGB).
+
+        See Also
+        --------
+        render, finish_async
+        """
+        self.set_current()
+        size = self.physical_size
+        fbo = FrameBuffer(color=RenderBuffer(size[::-1]),
+                          depth=RenderBuffer(size[::-1]))
+
+        try:
+            fbo.activate()
+            self.events.draw()
+        finally:
+            fbo.deactivate()
+        await self.finish_async(interval)
+        result = _read_fbo(self, fbo)
+
+        if not alpha:
+            result = result[..., :3]
+        return result
+
+
+# Keys of the GPU fences inserted by Canvas.finish_async
+_fence_keys = itertools.count()
+
+
+def _read_fbo(canvas, fbo, crop=None):
+    """Read the color buffer of a framebuffer that has been drawn to"""
+    canvas.set_current()
+    fbo.activate()
+    try:
+        return fbo.read(crop=crop)
+    finally:
+        fbo.deactivate()
+
 
 # Event subclasses specific to the Canvas
 class MouseEvent(Event):
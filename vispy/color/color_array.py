@@ -36,6 +36,39 @@ def _string_to_rgb(color):
     return color
 
 
+# Parsed color strings, shared by all calls to _strings_to_rgba
+_string_rgb_cache = {}
+_string_rgb_cache_size = 4096
+
+
+def _strings_to_rgba(colors):
+    """Convert an array-like of color names and hex strings to an RGB(A)
+    array, parsing each distinct string once
+    """
+    uniques, inverse = np.unique(np.asarray(colors).ravel(),
+                                 return_inverse=True)
+    parsed = []
+    for string in uniques:
+        rgb = _string_rgb_cache.get(string)
+        if rgb is None:
+            rgb = _string_to_rgb(str(string))
+            if len(_string_rgb_cache) >= _string_rgb_cache_size:
+                _string_rgb_cache.clear()
+            _string_rgb_cache[string] = rgb
+        parsed.append(rgb)
+    table = np.ones((len(parsed), max(len(rgb) for rgb in parsed)),
+                    np.float32)
+    for row, rgb in zip(table, parsed):
+        row[:len(rgb)] = rgb
+    return table[inverse.ravel()]
+
+
+def _is_categorical(color):
+    """Whether color is a (codes, palette) tuple"""
+    return (isinstance(color, tuple) and len(color) == 2 and
+            isinstance(color[0], np.ndarray) and color[0].dtype.kind in 'iu')
+
+
 def _user_to_rgba(color, expand=True, clip=False):
     """Convert color(s) from any set of fmts (str/hex/arr) to RGB(A) array"""
     if color is None:
@@ -44,9 +77,16 @@ def _user_to_rgba(color, expand=True, clip=False):
         color = _string_to_rgb(color)
     elif isinstance(color, ColorArray):
         color = color.rgba
+    elif _is_categorical(color):
+        codes, palette = color
+        color = _user_to_rgba(palette, expand=expand, clip=clip)[codes.ravel()]
+    elif isinstance(color, np.ndarray) and color.dtype.kind in 'US':
+        color = _strings_to_rgba(color)
     # We have to treat this specially
     elif isinstance(color, (list, tuple)):
-        if any(isinstance(c, (str, ColorArray)) for c in color):
+        if len(color) > 1 and all(isinstance(c, str) for c in color):
+            color = _strings_to_rgba(color)
+        elif any(isinstance(c, (str, ColorArray)) for c in color):
             color = [_user_to_rgba(c, expand=expand, clip=clip) for c in color]
             if any(len(c) > 1 for c in color):
                 raise RuntimeError('could not parse colors, are they nested?')
@@ -89,7 +129,10 @@ class ColorArray(object):
         Can also be a hex value if it starts with ``'#'`` as ``'#ff0000'``.
         If array-like, it must be an Nx3 or Nx4 array-like object.
         Can also be a list of colors, such as
-        ``['red', '#00ff00', ColorArray('blue')]``.
+        ``['red', '#00ff00', ColorArray('blue')]``, or an array of color
+        names and hex strings. For categorical colors, a tuple
+        ``(codes, palette)`` of an integer array and a list of colors can
+        be given, which selects ``palette[codes[i]]`` for each color.
     alpha : float | None
         If no alpha is not supplied in ``color`` entry and ``alpha`` is None,
         then this will default to 1.0 (opaque). If float, it will override
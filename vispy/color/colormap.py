@@ -6,6 +6,9 @@ from __future__ import division  # just to be safe...
 import warnings
 
 import re
+import hashlib
+import weakref
+from collections import OrderedDict
 import numpy as np
 
 from .color_array import ColorArray, Color
@@ -20,6 +23,38 @@ import vispy.gloo
 # Length of the texture map used for luminance to RGBA conversion
 LUT_len = 1024
 
+# Number of LUT textures that are kept for reuse in each GL context
+LUT_cache_size = 64
+
+# LUT textures by content, for each GLShared object, so that colormaps with
+# the same LUT share one texture in contexts that share objects
+_lut_textures = weakref.WeakKeyDictionary()
+
+
+def _create_lut_texture(data, interpolation):
+    texture = vispy.gloo.Texture2D(np.zeros(data.shape, dtype=np.float32),
+                                   interpolation=interpolation)
+    texture.set_data(data, offset=None, copy=True)
+    return texture
+
+
+def _get_lut_texture(data, interpolation):
+    """Get a LUT texture holding data, cached for the current canvas"""
+    canvas = vispy.gloo.get_current_canvas()
+    if canvas is None:
+        # the texture could end up in any context, so it is not shared
+        return _create_lut_texture(data, interpolation)
+    cache = _lut_textures.setdefault(canvas.context.shared, OrderedDict())
+    key = (interpolation, data.shape,
+           hashlib.sha1(np.ascontiguousarray(data)).hexdigest())
+    texture = cache.pop(key, None)
+    if texture is None:
+        texture = _create_lut_texture(data, interpolation)
+    cache[key] = texture  # most recently used last
+    while len(cache) > LUT_cache_size:
+        cache.popitem(last=False)
+    return texture
+
 
 # Utility functions for interpolation in NumPy.
 def _vector_or_scalar(x, type='row'):
@@ -254,6 +289,11 @@ class BaseColormap(object):
     # for luminance to RGBA conversion.
     texture_map_data = None
 
+    # Lookup tables used by map_lut, by size and dtype, and the colors and
+    # interpolation they were computed for
+    _luts = None
+    _luts_state = None
+
     def __init__(self, colors=None, *, bad_color=None, low_color=None, high_color=None):
         # Ensure the colors are arrays.
         if colors is not None:
@@ -347,6 +387,86 @@ class BaseColormap(object):
             colors = np.where((param == 0).reshape(-1, 1), self.low_color.rgba, colors)
         return colors
 
+    def map_lut(self, x, lut_size=4096, dtype=np.float32, chunk_size=2**20):
+        """Map values to colors with a precomputed lookup table
+
+        This is a faster alternative to indexing the colormap for large
+        arrays. The values are clipped to [0, 1] and rounded to the nearest
+        of ``lut_size`` evenly spaced entries, so that each color is found
+        with a single gather. NaN values map to ``bad_color``, and values
+        at or beyond 0 and 1 to ``low_color`` and ``high_color`` if these
+        are set.
+
+        Parameters
+        ----------
+        x : array-like
+            The values to map.
+        lut_size : int
+            The number of entries of the lookup table.
+        dtype : dtype
+            The type of the colors: a float type for values in [0, 1], or
+            ``np.uint8`` for values in [0, 255].
+        chunk_size : int
+            The number of values that are mapped at once, which bounds the
+            size of the temporary arrays.
+
+        Returns
+        -------
+        rgba : ndarray
+            The colors, with shape ``x.shape + (4,)``.
+        """
+        x = np.asarray(x)
+        lut = self._get_lut(int(lut_size), np.dtype(dtype))
+        out = np.empty((x.size, 4), dtype=lut.dtype)
+        flat = x.reshape(-1)
+        scale = lut_size - 1
+        for start in range(0, flat.size, chunk_size):
+            chunk = flat[start:start + chunk_size]
+            t = np.multiply(chunk, scale, dtype=np.float32)
+            t += 0.5
+            np.clip(t, 0, scale, out=t)
+            nan = np.isnan(t)
+            t[nan] = 0
+            index = t.astype(np.intp)
+            if self.low_color is not None:
+                index[chunk <= 0] = lut_size + 1
+            if self.high_color is not None:
+                index[chunk >= 1] = lut_size + 2
+            index[nan] = lut_size
+            np.take(lut, index, axis=0, out=out[start:start + chunk.size])
+        return out.reshape(x.shape + (4,))
+
+    def _get_lut(self, lut_size, dtype):
+        """Get the lookup table for map_lut, followed by the bad, low and
+        high colors
+        """
+        # the tables are computed again when the colormap changed
+        state = [getattr(self, 'interpolation', None),
+                 getattr(self, '_controls', np.zeros(0)).tobytes()]
+        state += [None if c is None else c.rgba.tobytes() for c in
+                  (self.colors, self.bad_color, self.low_color,
+                   self.high_color)]
+        if self._luts is None or self._luts_state != state:
+            self._luts = {}
+            self._luts_state = state
+        luts = self._luts
+        key = (lut_size, dtype)
+        if key not in luts:
+            # stay off the exact ends, which map to low_color and high_color
+            t = np.linspace(0., 1., lut_size).clip(1e-7, 1 - 1e-7)
+            colors = np.asarray(self.map(t[:, np.newaxis]), dtype=np.float64)
+            colors = colors.reshape(lut_size, 4)
+            extra = [self.bad_color.rgba,
+                     colors[0] if self.low_color is None
+                     else self.low_color.rgba,
+                     colors[-1] if self.high_color is None
+                     else self.high_color.rgba]
+            lut = np.concatenate([colors, extra]).clip(0, 1)
+            if dtype == np.uint8:
+                lut = np.round(lut * 255)
+            luts[key] = lut.astype(dtype)
+        return luts[key]
+
     def texture_lut(self):
         """Return a texture2D object for LUT after its value is set. Can be None."""
         return None
@@ -506,14 +626,17 @@ class Colormap(BaseColormap):
         return self._map_edge_case_colors(x, colors)
 
     def texture_lut(self):
-        """Return a texture2D object for LUT after its value is set. Can be None."""
+        """Return a texture2D object for LUT after its value is set. Can be None.
+
+        Textures are cached by the content of the LUT and shared by all
+        colormaps with the same LUT in the GL context of the current canvas,
+        so they should not be modified. Without a current canvas, a new
+        texture is returned.
+        """
         if self.texture_map_data is None:
             return None
         interp = 'linear' if self.interpolation == 'linear' else 'nearest'
-        texture_LUT = vispy.gloo.Texture2D(np.zeros(self.texture_map_data.shape, dtype=np.float32),
-                                           interpolation=interp)
-        texture_LUT.set_data(self.texture_map_data, offset=None, copy=True)
-        return texture_LUT
+        return _get_lut_texture(self.texture_map_data, interp)
 
 
 class MatplotlibColormap(Colormap):
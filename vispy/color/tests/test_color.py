@@ -67,6 +67,28 @@ def test_color_array():
     assert len(x.rgb) == 2
 
 
+def test_color_array_bulk():
+    """Test parsing many color strings and categorical colors"""
+    names = ['red', '#00ff00', 'b', '#0000ff80', 'red'] * 20
+    expected = np.array([Color(name).rgba for name in names])
+    assert_array_equal(ColorArray(names).rgba, expected)
+    assert_array_equal(ColorArray(np.array(names)).rgba, expected)
+    assert_array_equal(ColorArray(tuple(names)).rgba, expected)
+    # colors without alpha are kept that way when setting rgba
+    x = ColorArray(['r', 'g'])
+    x.rgba = ['#0000ff', '#00ff00']
+    assert_array_equal(x.rgba, [[0, 0, 1, 1], [0, 1, 0, 1]])
+    assert_raises(ValueError, ColorArray, ['red', 'notacolor'])
+
+    codes = np.array([2, 0, 0, 1])
+    x = ColorArray((codes, ['r', 'g', (0, 0, 1, 0.5)]))
+    assert_array_equal(x.rgba, [[0, 0, 1, 0.5], [1, 0, 0, 1],
+                                [1, 0, 0, 1], [0, 1, 0, 1]])
+    x = ColorArray((codes.astype(np.uint8), np.eye(3)))
+    assert_array_equal(x.rgb, np.eye(3)[codes])
+    assert_raises(IndexError, ColorArray, (np.array([3]), ['r', 'g']))
+
+
 def test_color_interpretation():
     """Test basic color interpretation API"""
     # test useful ways of single color init
@@ -334,6 +356,71 @@ def test_colormap():
         assert colors.rgba.max() <= 1
 
 
+def test_colormap_texture_lut():
+    """Test sharing LUT textures between colormaps."""
+    from vispy.color import colormap as colormap_module
+    from vispy.gloo.context import (FakeCanvas, forget_canvas,
+                                    get_current_canvas)
+    # without a current canvas, textures are not shared
+    if get_current_canvas() is None:
+        cmap = Colormap(['r', 'g'])
+        assert cmap.texture_lut() is not cmap.texture_lut()
+
+    canvas = FakeCanvas()
+    try:
+        lut = Colormap(['r', 'g']).texture_lut()
+        assert Colormap(['r', 'g']).texture_lut() is lut
+        assert Colormap(['r', 'b']).texture_lut() is not lut
+        zero = Colormap(['r', 'g'], interpolation='zero')
+        assert zero.texture_lut() is not lut
+        assert zero.texture_lut().interpolation == 'nearest'
+        cache = colormap_module._lut_textures[canvas.context.shared]
+        for i in range(colormap_module.LUT_cache_size + 1):
+            Colormap([(i / 100., 0, 0), 'g']).texture_lut()
+        assert len(cache) == colormap_module.LUT_cache_size
+        assert Colormap(['r', 'g']).texture_lut() is not lut
+
+        # canvases that do not share objects do not share textures
+        lut = Colormap(['r', 'g']).texture_lut()
+        other = FakeCanvas()
+        try:
+            other_lut = Colormap(['r', 'g']).texture_lut()
+        finally:
+            forget_canvas(other)
+        assert other_lut is not lut
+        assert Colormap(['r', 'g']).texture_lut() is lut
+    finally:
+        forget_canvas(canvas)
+
+
+def test_colormap_map_lut():
+    """Test mapping values with a lookup table."""
+    x = np.linspace(0, 1, 1001).reshape(7, 11, 13)
+    for name in ('viridis', 'fire', 'hot', 'RdBu'):
+        cm = get_colormap(name)
+        expected = cm[x.ravel()].rgba.reshape(x.shape + (4,))
+        colors = cm.map_lut(x, chunk_size=100)
+        assert colors.shape == x.shape + (4,)
+        assert colors.dtype == np.float32
+        assert_allclose(colors, expected, atol=2e-3)
+        colors = cm.map_lut(x, lut_size=256, dtype=np.uint8)
+        assert colors.dtype == np.uint8
+        assert np.abs(colors - expected * 255).max() <= 4
+    cm = Colormap(['r', 'g', 'b'], bad_color='y', low_color='w',
+                  high_color='k')
+    assert_array_equal(cm.map_lut([np.nan, -1, 0, 0.5, 1, 2], lut_size=3),
+                       [[1, 1, 0, 1], [1, 1, 1, 1], [1, 1, 1, 1],
+                        [0, 1, 0, 1], [0, 0, 0, 1], [0, 0, 0, 1]])
+    # changes of the colormap are applied
+    cm.colors = ColorArray(['r', 'g', 'r'])
+    cm.high_color = None
+    assert_allclose(cm.map_lut([1, 2], lut_size=3),
+                    [[1, 0, 0, 1], [1, 0, 0, 1]], atol=1e-6)
+    cm.interpolation = 'zero'
+    cm._controls = np.array([0, 0.1, 0.9, 1.], dtype=np.float32)
+    assert_allclose(cm.map_lut([0.5], lut_size=3), [[0, 1, 0, 1]], atol=1e-6)
+
+
 def test_normalize():
     """Test the _normalize() function."""
     from vispy.color.colormap import _normalize
@@ -6,15 +6,16 @@
 
 from __future__ import division
 
-__all__ = ['MeshData', 'PolygonData', 'Rect', 'Triangulation', 'triangulate',
-           'create_arrow', 'create_box', 'create_cone', 'create_cube',
-           'create_cylinder', 'create_grid_mesh', 'create_plane',
-           'create_sphere', 'resize']
+__all__ = ['MeshData', 'PolygonData', 'Rect', 'Triangulation',
+           'IncrementalTriangulation', 'triangulate', 'create_arrow',
+           'create_box', 'create_cone', 'create_cube', 'create_cylinder',
+           'create_grid_mesh', 'create_plane', 'create_sphere', 'resize']
 
 from .polygon import PolygonData  # noqa
 from .meshdata import MeshData  # noqa
 from .rect import Rect  # noqa
-from .triangulation import Triangulation, triangulate  # noqa
+from .triangulation import (Triangulation, IncrementalTriangulation,  # noqa
+                            triangulate)  # noqa
 from .torusknot import TorusKnot  # noqa
 from .calculations import (_calculate_normals, _cross_2d, _fast_cross_3d,  # noqa
                            resize)  # noqa
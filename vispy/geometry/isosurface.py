@@ -3,14 +3,21 @@ import numpy as np
 _data_cache = None
 
 
-def isosurface(data, level):
+def isosurface(data, level, chunk_size=None, n_threads=1):
     """
     Generate isosurface from volumetric data using marching cubes algorithm.
     See Paul Bourke, "Polygonising a Scalar Field"  
     (http://paulbourke.net/geometry/polygonise/)
 
-    *data*   3D numpy array of scalar values
-    *level*  The level at which to generate an isosurface
+    *data*        3D numpy array of scalar values
+    *level*       The level at which to generate an isosurface
+    *chunk_size*  Number of grid cells along the first axis of *data* that
+                  are processed at once. Large volumes are split into slabs
+                  of this thickness (overlapping by one sample) so that the
+                  intermediate arrays stay small; vertices on the slab
+                  boundaries are merged afterwards. If None, the whole
+                  volume is processed as a single slab.
+    *n_threads*   Number of threads used to process the slabs.
 
     Returns an array of vertex coordinates (Nv, 3) and an array of 
     per-face vertex indexes (Nf, 3)    
@@ -22,117 +29,102 @@ def isosurface(data, level):
     # Thomas Lewiner, Helio Lopes, Antonio Wilson Vieira and Geovan Tavares.
     # Journal of Graphics Tools 8(2): pp. 1-15 (december 2003)
 
-    (face_shift_tables, edge_shifts, 
-     edge_table, n_table_faces) = _get_data_cache()
+    data = np.asarray(data)
+    if data.ndim != 3:
+        raise ValueError('data must be a 3D array, got %dD' % data.ndim)
+    n_cells = max(data.shape[0] - 1, 0)
+    if chunk_size is None:
+        chunk_size = max(n_cells, 1)
+    chunk_size = int(chunk_size)
+    if chunk_size < 1:
+        raise ValueError('chunk_size must be at least 1')
+    starts = list(range(0, n_cells, chunk_size))
 
-    # mark everything below the isosurface level
-    mask = data < level
+    def process(start):
+        return _isosurface_slab(data, level, start,
+                                min(start + chunk_size, n_cells))
 
-    # Because we make use of the strides data attribute below, we have to make 
-    # sure that the data is contiguous (which it won't be if the user did 
-    # data.transpose() for example). Note that this doesn't copy the data if it 
-    # is already contiguous.
-    data = np.ascontiguousarray(data)
+    if n_threads > 1 and len(starts) > 1:
+        # numpy releases the GIL in most of the heavy operations used here
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=n_threads) as pool:
+            slabs = list(pool.map(process, starts))
+    else:
+        slabs = [process(start) for start in starts]
 
-    # make eight sub-fields and compute indexes for grid cells
-    index = np.zeros([x-1 for x in data.shape], dtype=np.ubyte)
-    fields = np.empty((2, 2, 2), dtype=object)
-    slices = [slice(0, -1), slice(1, None)]
-    for i in [0, 1]:
-        for j in [0, 1]:
-            for k in [0, 1]:
-                fields[i, j, k] = mask[slices[i], slices[j], slices[k]]
-                # this is just to match Bourk's vertex numbering scheme:
-                vertIndex = i - 2*j*i + 3*j + 4*k
-                index += (fields[i, j, k] * 2**vertIndex).astype(np.ubyte)
-
-    # Generate table of edges that have been cut
-    cut_edges = np.zeros([x+1 for x in index.shape]+[3], dtype=np.uint32)
-    edges = edge_table[index]
-    for i, shift in enumerate(edge_shifts[:12]):        
-        slices = [slice(shift[j], cut_edges.shape[j]+(shift[j]-1)) 
-                  for j in range(3)]
-        cut_edges[slices[0], slices[1], slices[2], shift[3]] += edges & 2**i
-
-    # for each cut edge, interpolate to see where exactly the edge is cut and 
-    # generate vertex positions
-    m = cut_edges > 0
-    vertex_inds = np.argwhere(m)  # argwhere is slow!
-    vertexes = vertex_inds[:, :3].astype(np.float32).copy()
-    dataFlat = data.reshape(data.shape[0]*data.shape[1]*data.shape[2])
-
-    # re-use the cut_edges array as a lookup table for vertex IDs
-    cut_edges[vertex_inds[:, 0], 
-              vertex_inds[:, 1], 
-              vertex_inds[:, 2], 
-              vertex_inds[:, 3]] = np.arange(vertex_inds.shape[0])
+    # Stitch the slabs together. Each vertex is identified by the global
+    # index of the grid edge it lies on, so vertices on the boundary between
+    # two slabs get the same key and are merged here.
+    if len(slabs) == 0:
+        keys = np.zeros(0, np.int64)
+        faces = np.zeros((0, 3), np.uint32)
+    elif len(slabs) == 1:
+        keys, faces = slabs[0]
+    else:
+        keys, inverse = np.unique(np.concatenate([k for k, _ in slabs]),
+                                  return_inverse=True)
+        inverse = inverse.ravel().astype(np.uint32)
+        faces = []
+        offset = 0
+        for slab_keys, slab_faces in slabs:
+            faces.append(inverse[offset:offset + len(slab_keys)][slab_faces])
+            offset += len(slab_keys)
+        faces = np.concatenate(faces)
 
-    for i in [0, 1, 2]:
-        vim = vertex_inds[:, 3] == i
-        vi = vertex_inds[vim, :3]
-        vi_flat = (vi * (np.array(data.strides[:3]) // 
-                         data.itemsize)[np.newaxis, :]).sum(axis=1)
-        v1 = dataFlat[vi_flat]
-        v2 = dataFlat[vi_flat + data.strides[i]//data.itemsize]
-        vertexes[vim, i] += (level-v1) / (v2-v1)
+    return _edge_vertices(data, level, keys), faces
 
-    # compute the set of vertex indexes for each face. 
 
-    # This works, but runs a bit slower.
-    # all cells with at least one face:
-    # cells = np.argwhere((index != 0) & (index != 255))  
-    # cellInds = index[cells[:, 0], cells[:, 1], cells[:, 2]]
-    # verts = faceTable[cellInds]
-    # mask = verts[..., 0, 0] != 9
-    # we now have indexes into cut_edges:
-    # verts[...,:3] += cells[:, np.newaxis, np.newaxis,:]
-    # verts = verts[mask]
-    # and these are the vertex indexes we want:
-    # faces = cut_edges[verts[..., 0], verts[..., 1], verts[..., 2], 
-    #                  verts[..., 3]]  
+def _isosurface_slab(data, level, start, stop):
+    """Run marching cubes over the cells ``start:stop`` of the first axis
 
-    # To allow this to be vectorized efficiently, we count the number of faces 
-    # in each grid cell and handle each group of cells with the same number 
-    # together.
-
-    # determine how many faces to assign to each grid cell
-    n_faces = n_table_faces[index]
-    tot_faces = n_faces.sum()
-    faces = np.empty((tot_faces, 3), dtype=np.uint32)
-    ptr = 0
-
-    # this helps speed up an indexing operation later on
-    cs = np.array(cut_edges.strides)//cut_edges.itemsize
-    cut_edges = cut_edges.flatten()
+    Returns the sorted, unique edge keys of the vertices in the slab and
+    the (Nf, 3) faces indexing into them.
+    """
+    edge_shifts, n_table_faces, tri_table = _get_data_cache()[1:]
+    mask = data[start:stop + 1] < level
+    shape = tuple(x - 1 for x in mask.shape)
 
-    # this, strangely, does not seem to help.
-    # ins = np.array(index.strides)/index.itemsize
-    # index = index.flatten()
+    # compute the case index of every grid cell, 1 byte per cell
+    index = np.zeros(shape, dtype=np.ubyte)
+    for i in [0, 1]:
+        for j in [0, 1]:
+            for k in [0, 1]:
+                # this is just to match Bourk's vertex numbering scheme:
+                vert_index = i - 2*j*i + 3*j + 4*k
+                corner = mask[i:i + shape[0], j:j + shape[1], k:k + shape[2]]
+                index |= corner.view(np.ubyte) << vert_index
 
-    for i in range(1, 6):
-        # expensive:
-        # all cells which require i faces  (argwhere is expensive)
-        cells = np.argwhere(n_faces == i)  
-        if cells.shape[0] == 0:
-            continue
-        # index values of cells to process for this round:
-        cellInds = index[cells[:, 0], cells[:, 1], cells[:, 2]]
+    # only the cells that the surface passes through are considered further
+    index = index.ravel()
+    cells = np.flatnonzero(n_table_faces[index])
+    tris = tri_table[index[cells]]
+    valid = tris >= 0
+    # triangle corners are stored contiguously, so the (cell, edge) pairs of
+    # the valid entries come out grouped per triangle
+    cell_of, _ = np.nonzero(valid)
+    shifts = edge_shifts[tris[valid]].astype(np.int64)
+    x, y, z = np.unravel_index(cells[cell_of], shape)
 
-        # expensive:
-        verts = face_shift_tables[i][cellInds]
-        # we now have indexes into cut_edges:
-        verts[..., :3] += (cells[:, np.newaxis,
-                                 np.newaxis, :]).astype(np.uint16)
-        verts = verts.reshape((verts.shape[0]*i,)+verts.shape[2:])
+    # global key of each cut edge: its position in a (nx, ny, nz, 3) grid
+    ny, nz = data.shape[1:]
+    keys = (((x + shifts[:, 0] + start) * ny + y + shifts[:, 1]) * nz +
+            z + shifts[:, 2]) * 3 + shifts[:, 3]
+    keys, faces = np.unique(keys, return_inverse=True)
+    return keys, faces.ravel().astype(np.uint32).reshape(-1, 3)
 
-        # expensive:
-        verts = (verts * cs[np.newaxis, np.newaxis, :]).sum(axis=2)
-        vert_inds = cut_edges[verts]
-        nv = vert_inds.shape[0]
-        faces[ptr:ptr+nv] = vert_inds  # .reshape((nv, 3))
-        ptr += nv
 
-    return vertexes, faces
+def _edge_vertices(data, level, keys):
+    """Interpolate the vertex positions on the grid edges given by *keys*"""
+    axis = keys % 3
+    coords = np.unravel_index(keys // 3, data.shape)
+    vertices = np.stack(coords, axis=1).astype(np.float32)
+    v1 = data[coords].astype(np.float64)
+    coords[0][axis == 0] += 1
+    coords[1][axis == 1] += 1
+    coords[2][axis == 2] += 1
+    v2 = data[coords].astype(np.float64)
+    vertices[np.arange(len(keys)), axis] += (level - v1) / (v2 - v1)
+    return vertices
 
 
 def _get_data_cache():
@@ -449,17 +441,11 @@ def _get_data_cache():
             # will need the extra precision.
         ], dtype=np.uint16) 
         n_table_faces = np.array([len(f)/3 for f in triTable], dtype=np.ubyte)
-        face_shift_tables = [None]
-        for i in range(1, 6):
-            # compute lookup table of index: vertexes mapping
-            faceTableI = np.zeros((len(triTable), i*3), dtype=np.ubyte)
-            faceTableInds = np.argwhere(n_table_faces == i)[:, 0]
-            faceTableI[faceTableInds] = np.array([triTable[j] for j in
-                                                  faceTableInds])
-            faceTableI = faceTableI.reshape((len(triTable), i, 3))
-            face_shift_tables.append(edge_shifts[faceTableI])
+        # edges cut by each triangle, padded with -1 up to 5 triangles
+        tri_table = np.full((len(triTable), 15), -1, dtype=np.int8)
+        for i, tris in enumerate(triTable):
+            tri_table[i, :len(tris)] = tris
 
-        _data_cache = (face_shift_tables, edge_shifts, edge_table, 
-                       n_table_faces)
+        _data_cache = (edge_table, edge_shifts, n_table_faces, tri_table)
 
     return _data_cache
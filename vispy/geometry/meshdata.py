@@ -69,6 +69,46 @@ def _compute_vertex_normals(face_normals, faces, vertices):
     return vertex_normals
 
 
+def _compute_vertex_faces(faces, n_vertices):
+    """Compute the faces adjacent to each vertex in CSR form
+
+    Returns ``(offsets, indices)`` such that the faces using vertex ``i``
+    are ``indices[offsets[i]:offsets[i + 1]]``, in increasing order.
+    """
+    if faces.ndim != 2:
+        raise ValueError("Expected (F, C) array of face vertex indices, got"
+                         f" {faces.shape}.")
+    corners = faces.ravel()
+    counts = np.bincount(corners, minlength=n_vertices)
+    offsets = np.zeros(len(counts) + 1, dtype=np.intp)
+    np.cumsum(counts, out=offsets[1:])
+    # a stable sort keeps the faces of each vertex in increasing order
+    order = np.argsort(corners, kind='stable')
+    indices = (order // faces.shape[1]).astype(np.uint32)
+    return offsets, indices
+
+
+def _compute_unique_edges(faces):
+    """Compute the unique edges of triangular faces
+
+    Returns the (Ne, 2) array of sorted vertex index pairs, and the (Nf, 3)
+    array mapping each face side to its index in that array.
+    """
+    faces = np.asarray(faces, dtype=np.int64)
+    starts = faces.ravel()
+    stops = faces[:, [1, 2, 0]].ravel()
+    lo = np.minimum(starts, stops)
+    hi = np.maximum(starts, stops)
+    # encode each edge as a single integer so that np.unique works on a
+    # flat array instead of on rows
+    n = int(hi.max()) + 1 if len(hi) else 1
+    keys, face_edges = np.unique(lo * n + hi, return_inverse=True)
+    edges = np.empty((len(keys), 2), dtype=np.uint32)
+    edges[:, 0] = keys // n
+    edges[:, 1] = keys % n
+    return edges, face_edges.reshape(faces.shape)
+
+
 class MeshData(object):
     """
     Class for storing and operating on 3D mesh data.
@@ -125,6 +165,8 @@ class MeshData(object):
         # self._vertices, 3 edge / face and 2 verts/edge
         # inverse mappings
         self._vertex_faces = None  # maps vertex ID to a list of face IDs
+        self._vertex_faces_csr = None  # (offsets, face IDs) adjacency
+        self._face_edges = None  # (Nf, 3) indices into self._edges
         self._vertex_edges = None  # maps vertex ID to a list of edge IDs
 
         # Per-vertex data
@@ -204,14 +246,19 @@ class MeshData(object):
             of a triangular face.
         """
         self._faces = faces
-        self._edges = None
-        self._edges_indexed_by_faces = None
-        self._vertex_faces = None
+        self._reset_adjacency()
         self._vertices_indexed_by_faces = None
         self.reset_normals()
         self._vertex_colors_indexed_by_faces = None
         self._face_colors_indexed_by_faces = None
 
+    def _reset_adjacency(self):
+        self._edges = None
+        self._edges_indexed_by_faces = None
+        self._face_edges = None
+        self._vertex_faces = None
+        self._vertex_faces_csr = None
+
     def get_vertices(self, indexed=None):
         """Get the vertices
 
@@ -584,54 +631,66 @@ class MeshData(object):
 
         # I think generally this should be discouraged..
         faces = self._vertices_indexed_by_faces
-        verts = {}  # used to remember the index of each vertex position
-        self._faces = np.empty(faces.shape[:2], dtype=np.uint32)
-        self._vertices = []
-        self._vertex_faces = []
+        points = faces.reshape(-1, faces.shape[-1])
+        # quantize to ensure nearly-identical points will be merged
+        quantized = np.round(points.astype(np.float64) * 1e14)
+        _, first, inverse = np.unique(quantized, axis=0, return_index=True,
+                                      return_inverse=True)
+        # number the vertices in order of first appearance
+        order = np.argsort(first)
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order))
+        self._faces = rank[inverse.ravel()].astype(np.uint32).reshape(
+            faces.shape[:2])
+        self._vertices = points[first[order]].astype(np.float32)
+        self._reset_adjacency()
         self._face_normals = None
         self._vertex_normals = None
-        for i in range(faces.shape[0]):
-            face = faces[i]
-            for j in range(face.shape[0]):
-                pt = face[j]
-                # quantize to ensure nearly-identical points will be merged
-                pt2 = tuple([round(x*1e14) for x in pt])
-                index = verts.get(pt2, None)
-                if index is None:
-                    self._vertices.append(pt)
-                    self._vertex_faces.append([])
-                    index = len(self._vertices)-1
-                    verts[pt2] = index
-                # track which vertices belong to which faces
-                self._vertex_faces[index].append(i)
-                self._faces[i, j] = index
-        self._vertices = np.array(self._vertices, dtype=np.float32)
+
+    def get_vertex_face_adjacency(self):
+        """Faces adjacent to each vertex, in compressed sparse row form.
+
+        Returns
+        -------
+        offsets : ndarray, shape (Nv + 1,)
+            The faces using vertex ``i`` are
+            ``indices[offsets[i]:offsets[i + 1]]``.
+        indices : ndarray
+            Face indices, grouped by vertex and in increasing order.
+        """
+        if self._vertex_faces_csr is None:
+            n_vertices = len(self.get_vertices())
+            self._vertex_faces_csr = _compute_vertex_faces(
+                np.asarray(self.get_faces()), n_vertices)
+        return self._vertex_faces_csr
 
     def get_vertex_faces(self):
-        """List mapping each vertex index to a list of face indices that use it."""
+        """List mapping each vertex index to an array of face indices that use it.
+
+        The arrays are views into the adjacency returned by
+        :meth:`get_vertex_face_adjacency`, which should be preferred for
+        large meshes.
+        """
         if self._vertex_faces is None:
-            self._vertex_faces = [[] for i in range(len(self.get_vertices()))]
-            for i in range(self._faces.shape[0]):
-                face = self._faces[i]
-                for ind in face:
-                    self._vertex_faces[ind].append(i)
+            offsets, indices = self.get_vertex_face_adjacency()
+            self._vertex_faces = np.split(indices, offsets[1:-1])
         return self._vertex_faces
 
+    def get_face_edges(self):
+        """Array (Nf, 3) of indices into :meth:`get_edges` for each face side.
+
+        Side ``j`` of a face joins its corners ``j`` and ``(j + 1) % 3``.
+        """
+        if self._face_edges is None:
+            self._compute_edges(indexed=None)
+        return self._face_edges
+
     def _compute_edges(self, indexed=None):
         if indexed is None:
             if self._faces is not None:
                 # generate self._edges from self._faces
-                nf = len(self._faces)
-                edges = np.empty(nf*3, dtype=[('i', np.uint32, 2)])
-                edges['i'][0:nf] = self._faces[:, :2]
-                edges['i'][nf:2*nf] = self._faces[:, 1:3]
-                edges['i'][-nf:, 0] = self._faces[:, 2]
-                edges['i'][-nf:, 1] = self._faces[:, 0]
-                # sort per-edge
-                mask = edges['i'][:, 0] > edges['i'][:, 1]
-                edges['i'][mask] = edges['i'][mask][:, ::-1]
-                # remove duplicate entries
-                self._edges = np.unique(edges)['i']
+                self._edges, self._face_edges = \
+                    _compute_unique_edges(self._faces)
             else:
                 raise Exception("MeshData cannot generate edges--no faces in "
                                 "this data.")
@@ -6,7 +6,7 @@
 
 import numpy as np
 
-from .triangulation import Triangulation
+from .triangulation import Triangulation, IncrementalTriangulation
 
 
 class PolygonData(object):
@@ -32,6 +32,7 @@ class PolygonData(object):
         self._edges = edges
         self._faces = faces
         self._convex_hull = None
+        self._triangulation = None
 
     @property
     def faces(self):
@@ -103,10 +104,16 @@ class PolygonData(object):
             self.triangulate()
         return self._convex_hull
 
-    def triangulate(self):
+    def triangulate(self, incremental=False):
         """
         Triangulates the set of vertices and stores the triangles in faces and
         the convex hull in convex_hull.
+
+        Parameters
+        ----------
+        incremental : bool
+            If True, use an :class:`IncrementalTriangulation`, which
+            `move_vertex` can update locally.
         """
         npts = self._vertices.shape[0]
         if np.any(self._vertices[0] != self._vertices[1]):
@@ -121,10 +128,40 @@ class PolygonData(object):
             edges[:, 0] = np.arange(npts)
             edges[:, 1] = edges[:, 0] + 1
 
-        tri = Triangulation(self._vertices, edges)
-        tri.triangulate()
+        if incremental:
+            tri = IncrementalTriangulation(self._vertices, edges)
+            self._triangulation = tri
+        else:
+            tri = Triangulation(self._vertices, edges)
+            tri.triangulate()
+            self._triangulation = None
         return tri.pts, tri.tris
 
+    def move_vertex(self, index, vertex):
+        """
+        Moves the given vertex and updates only the faces around it, using
+        the incremental triangulation (see `triangulate`).
+
+        Parameters
+        ----------
+        index : int
+            The index of the vertex.
+        vertex : array-like
+            The new position of the vertex.
+
+        Returns
+        -------
+        pts : array
+            The points of the triangulation, as returned by `triangulate`.
+        tris : array
+            The triangles of the triangulation.
+        """
+        self._vertices[index] = vertex
+        if self._triangulation is None:
+            return self.triangulate(incremental=True)
+        self._triangulation.move_point(index, vertex)
+        return self._triangulation.pts, self._triangulation.tris
+
     def add_vertex(self, vertex):
         """
         Adds given vertex and retriangulates to generate new faces.
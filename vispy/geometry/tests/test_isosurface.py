@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) Vispy Development Team. All Rights Reserved.
+# Distributed under the (new) BSD License. See LICENSE.txt for more info.
+import numpy as np
+from numpy.testing import assert_allclose, assert_array_equal
+
+from vispy.testing import run_tests_if_main, assert_raises
+from vispy.geometry.isosurface import isosurface
+
+
+def _sphere_field(n=24):
+    x, y, z = np.ogrid[-1:1:n * 1j, -1:1:n * 1j, -1:1:n * 1j]
+    return (x ** 2 + y ** 2 + z ** 2).astype(np.float32)
+
+
+def test_isosurface_sphere():
+    """Test isosurface of a spherical field"""
+    n = 24
+    vertices, faces = isosurface(_sphere_field(n), 0.5)
+    assert vertices.dtype == np.float32
+    assert faces.dtype == np.uint32
+    assert faces.shape[1] == 3
+    assert_array_equal(np.unique(faces), np.arange(len(vertices)))
+    radii = np.sqrt((((vertices / (n - 1)) * 2 - 1) ** 2).sum(axis=1))
+    assert_allclose(radii, np.sqrt(0.5), atol=0.02)
+    # every edge of a closed surface is shared by exactly two faces
+    edges = np.sort(faces[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2), axis=1)
+    _, counts = np.unique(edges, axis=0, return_counts=True)
+    assert np.all(counts == 2)
+
+    # nothing to extract
+    vertices, faces = isosurface(_sphere_field(n), 10.)
+    assert vertices.shape == (0, 3)
+    assert faces.shape == (0, 3)
+    assert_raises(ValueError, isosurface, np.zeros((3, 3)), 0.5)
+    assert_raises(ValueError, isosurface, np.zeros((3, 3, 3)), 0.5,
+                  chunk_size=0)
+
+
+def test_isosurface_chunked():
+    """Test that chunked isosurface extraction matches a single pass"""
+    data = np.random.RandomState(0).rand(17, 11, 9)
+    vertices, faces = isosurface(data, 0.5)
+    for chunk_size, n_threads in ((1, 1), (4, 1), (5, 3), (100, 2)):
+        v, f = isosurface(data, 0.5, chunk_size=chunk_size,
+                          n_threads=n_threads)
+        assert_allclose(v, vertices)
+        assert set(map(tuple, f.tolist())) == set(map(tuple, faces.tolist()))
+
+
+run_tests_if_main()
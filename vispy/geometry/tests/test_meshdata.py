@@ -103,4 +103,42 @@ def test_face_normals_indexed_faces():
     assert_array_equal(expected_face_normals, computed_face_normals)
 
 
+def test_vertex_face_adjacency():
+    vertices = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1],
+                         [1, 1, 1]], dtype=np.float32)
+    faces = np.array([[0, 2, 1], [0, 3, 2], [0, 1, 3]], dtype=np.int64)
+    mesh = MeshData(vertices=vertices, faces=faces)
+
+    offsets, indices = mesh.get_vertex_face_adjacency()
+    assert_array_equal(offsets, [0, 3, 5, 7, 9, 9])
+    assert_array_equal(indices, [0, 1, 2, 0, 2, 0, 1, 1, 2])
+    vertex_faces = mesh.get_vertex_faces()
+    assert len(vertex_faces) == 5
+    assert_array_equal(vertex_faces[2], [0, 1])
+    assert len(vertex_faces[4]) == 0
+    assert mesh.get_vertex_faces() is vertex_faces
+
+    assert_array_equal(mesh.get_edges(),
+                       [[0, 1], [0, 2], [0, 3], [1, 2], [1, 3], [2, 3]])
+    face_edges = mesh.get_face_edges()
+    assert_array_equal(face_edges, [[1, 3, 0], [2, 5, 1], [0, 4, 2]])
+
+    # adjacency is recomputed once the faces change
+    mesh.set_faces(faces[:1])
+    assert mesh.get_vertex_faces() is not vertex_faces
+    assert_array_equal(mesh.get_vertex_face_adjacency()[0],
+                       [0, 1, 2, 3, 3, 3])
+    assert_array_equal(mesh.get_edges(), [[0, 1], [0, 2], [1, 2]])
+
+
+def test_unindexed_vertices():
+    vertices = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]],
+                        dtype=np.float32)
+    faces = np.array([[0, 2, 1], [0, 3, 2], [0, 1, 3]])
+    mesh = MeshData(vertices=vertices[faces])
+    assert_array_equal(mesh.get_vertices(), vertices[[0, 2, 1, 3]])
+    assert_array_equal(mesh.get_faces(), [[0, 1, 2], [0, 3, 1], [0, 2, 3]])
+    assert_array_equal(mesh.get_vertex_faces()[3], [1, 2])
+
+
 run_tests_if_main()
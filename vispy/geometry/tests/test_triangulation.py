@@ -7,6 +7,8 @@ from numpy.testing import assert_array_almost_equal
 
 from vispy.testing import run_tests_if_main
 from vispy.geometry.triangulation import Triangulation as T
+from vispy.geometry.triangulation import (IncrementalTriangulation,
+                                          _segment_intersections)
 
 
 def assert_array_eq(a, b):
@@ -579,6 +581,183 @@ def test_triangulate_collinear_path_with_repeat():
     _assert_triangle_pts_in_input(t, pts)
 
 
+def _polygon_area(pts):
+    x, y = pts.T
+    return 0.5 * abs(np.dot(x, np.roll(y, 1)) - np.dot(y, np.roll(x, 1)))
+
+
+def _triangles_area(pts, tris):
+    a, b, c = pts[tris[:, 0]], pts[tris[:, 1]], pts[tris[:, 2]]
+    return 0.5 * np.abs((b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1]) -
+                        (b[:, 1] - a[:, 1]) * (c[:, 0] - a[:, 0])).sum()
+
+
+def _closed_edges(n):
+    inds = np.arange(n)[:, np.newaxis]
+    return np.hstack([inds, np.roll(inds, -1)])
+
+
+def test_segment_intersections():
+    p0 = np.array([[0, 0], [0, 1], [2, 0], [0, 0.5]], dtype=float)
+    p1 = np.array([[1, 1], [1, 0], [3, 1], [1, 0.5]], dtype=float)
+    i, j, s, t = _segment_intersections(p0, p1, max_pairs=2)
+    crossings = sorted(zip(np.minimum(i, j), np.maximum(i, j)))
+    assert crossings == [(0, 1), (0, 3), (1, 3)]
+    assert_array_almost_equal(s, 0.5)
+    assert_array_almost_equal(t, 0.5)
+
+
+def test_incremental_polygon():
+    np.random.seed(0)
+    for n in (3, 10, 200):
+        theta = np.linspace(0, 2 * np.pi, n, endpoint=False)
+        r = 1 + 0.5 * np.random.rand(n)
+        pts = np.stack([r * np.cos(theta), r * np.sin(theta)], axis=1)
+        t = IncrementalTriangulation(pts, _closed_edges(n))
+        assert len(t.pts) == n
+        assert len(t.tris) == n - 2
+        assert_array_almost_equal(_triangles_area(t.pts, t.tris),
+                                  _polygon_area(pts), decimal=5)
+
+        # moving vertices only updates the triangulation
+        for i in np.random.randint(0, n, 5):
+            pts[i] *= 0.8
+            t.move_point(i, pts[i])
+        assert len(t.tris) == n - 2
+        assert_array_almost_equal(_triangles_area(t.pts, t.tris),
+                                  _polygon_area(pts), decimal=5)
+
+
+def test_incremental_constraints():
+    # crossing edges are split and the even-odd rule is used
+    bowtie = np.array([[0, 0], [2, 2], [2, 0], [0, 2]], dtype=float)
+    t = IncrementalTriangulation(bowtie, _closed_edges(4))
+    assert len(t.pts) == 5
+    assert_array_almost_equal(t.pts[4], [1, 1])
+    assert len(t.tris) == 2
+    assert_array_almost_equal(_triangles_area(t.pts, t.tris), 2)
+
+    # a hole inside a square
+    square = np.array([[0, 0], [4, 0], [4, 4], [0, 4]], dtype=float)
+    t = IncrementalTriangulation(np.concatenate([square, square / 4 + 1.5]))
+    assert len(t.tris) == 0
+    t.add_edges(_closed_edges(4))
+    assert_array_almost_equal(_triangles_area(t.pts, t.tris), 16)
+    t.add_edges(_closed_edges(4) + 4)
+    assert_array_almost_equal(_triangles_area(t.pts, t.tris), 15)
+    t.remove_edges(_closed_edges(4) + 4)
+    assert_array_almost_equal(_triangles_area(t.pts, t.tris), 16)
+
+    # duplicate points are merged and points can be added later
+    t = IncrementalTriangulation(np.concatenate([square, square[:1]]),
+                                 [[0, 1], [1, 2], [2, 3], [3, 4]])
+    assert_array_almost_equal(_triangles_area(t.pts, t.tris), 16)
+    assert t.add_points([[10, 10]]) == [5]
+    t.move_point(2, [10, 10])
+    assert_array_almost_equal(_triangles_area(t.pts, t.tris), 40)
+
+    # a collinear path encloses nothing
+    t = IncrementalTriangulation(np.array([[4, 4], [3, 4], [1, 4]]),
+                                 _closed_edges(3))
+    assert len(t.tris) == 0
+
+
+def _even_odd(polygon, pts):
+    """Whether each point is inside the polygon according to the even-odd
+    rule, by counting the edges crossed by a ray towards +x
+    """
+    inside = np.zeros(len(pts), dtype=bool)
+    x, y = pts.T
+    for (x0, y0), (x1, y1) in zip(polygon, np.roll(polygon, -1, axis=0)):
+        if y0 == y1:
+            continue
+        crossed = (y0 > y) != (y1 > y)
+        inside ^= crossed & (x < x0 + (y - y0) * (x1 - x0) / (y1 - y0))
+    return inside
+
+
+def test_incremental_random_polygons():
+    """Test that self-intersecting polygons fill the same area as with
+    Triangulation
+    """
+    rng = np.random.RandomState(0)
+    compared = 0
+    for n in (5, 10, 30):
+        for _ in range(30):
+            pts = rng.randn(n, 2).astype(np.float32)
+            t = IncrementalTriangulation(pts, _closed_edges(n))
+            try:
+                old = T(pts.copy(), _closed_edges(n))
+                old.triangulate()
+            except Exception:  # Triangulation fails on some of them
+                continue
+            compared += 1
+            assert_array_almost_equal(_triangles_area(t.pts, t.tris),
+                                      _triangles_area(old.pts, old.tris),
+                                      decimal=4)
+    assert compared > 80
+
+    # the same with a spiral crossing itself many times
+    theta = np.sort(rng.rand(60)) * 6 * np.pi
+    r = 1 + rng.rand(60)
+    pts = np.stack([r * np.cos(theta), r * np.sin(theta)], axis=1)
+    t = IncrementalTriangulation(pts, _closed_edges(60))
+    old = T(pts.astype(np.float32), _closed_edges(60))
+    old.triangulate()
+    assert_array_almost_equal(_triangles_area(t.pts, t.tris),
+                              _triangles_area(old.pts, old.tris), decimal=4)
+
+
+def test_incremental_degenerate_polygons():
+    """Test polygons with overlapping edges and vertices on edges"""
+    # two squares drawn as one path share an edge, which is crossed twice
+    pts = np.array([[0, 0], [2, 0], [2, 2], [0, 2], [0, 0], [-2, 0],
+                    [-2, 2], [0, 2]], dtype=float)
+    t = IncrementalTriangulation(pts, _closed_edges(8))
+    assert_array_almost_equal(_triangles_area(t.pts, t.tris), 8)
+
+    # points on an integer grid make such cases common
+    rng = np.random.RandomState(0)
+    for n in (10, 20, 40):
+        for _ in range(10):
+            pts = rng.randint(0, 10, (n, 2)).astype(float)
+            t = IncrementalTriangulation(pts, _closed_edges(n))
+            mesh = t._pts[t._tris[:t._n_tris][t._alive[:t._n_tris]]]
+            a, b, c = mesh.transpose(1, 0, 2)
+            area = ((b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1]) -
+                    (b[:, 1] - a[:, 1]) * (c[:, 0] - a[:, 0]))
+            # the triangles tile the super triangle
+            assert (area > 0).all()
+            assert_array_almost_equal(area.sum() / 2, _polygon_area(
+                t._pts[:3]))
+
+            # and those inside the polygon are the filled ones
+            tris = t._tris[:t._n_tris][t._alive[:t._n_tris]]
+            tris = tris[(tris >= 3).all(axis=1)] - 3
+            filled = set(map(tuple, np.sort(t.tris, axis=1).tolist()))
+            is_filled = [tri in filled
+                         for tri in map(tuple, np.sort(tris, axis=1).tolist())]
+            centers = t._pts[tris + 3].mean(axis=1)
+            assert_array_eq(np.array(is_filled), _even_odd(pts, centers))
+
+
+def test_incremental_locate():
+    """Test that walks reach the triangle containing a point from any
+    triangle of a constrained triangulation
+    """
+    rng = np.random.RandomState(0)
+    t = IncrementalTriangulation(rng.randn(50, 2), _closed_edges(50))
+    alive = np.flatnonzero(t._alive[:t._n_tris])
+    for x, y in rng.randn(50, 2):
+        for start in rng.choice(alive, 10):
+            t._last = start
+            a, b, c = t._pts[t._tris[t._locate(x, y)]]
+            assert min((b[0] - a[0]) * (y - a[1]) - (b[1] - a[1]) * (x - a[0]),
+                       (c[0] - b[0]) * (y - b[1]) - (c[1] - b[1]) * (x - b[0]),
+                       (a[0] - c[0]) * (y - c[1]) -
+                       (a[1] - c[1]) * (x - c[0])) >= 0
+
+
 def _assert_triangle_pts_in_input(t, input_pts):
     pt_indices_in_tris = set(v for tri in t.tris for v in tri)
     for i in pt_indices_in_tris:
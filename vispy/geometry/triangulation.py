@@ -28,6 +28,8 @@ class Triangulation(object):
       triangulation, but adding legalisation would produce fewer thin
       triangles.
     * The pts and edges arrays may be modified.
+    * :class:`IncrementalTriangulation` can be updated locally when points
+      move.
 
     References
     ----------
@@ -874,3 +876,928 @@ def triangulate(vertices):
     vertices[:, :2] = vertices_2d
     vertices[:, 2] = zmean
     return vertices, triangles
+
+
+def _orient(ax, ay, bx, by, cx, cy):
+    # positive if a, b, c are in counterclockwise order
+    return (bx - ax) * (cy - ay) - (by - ay) * (cx - ax)
+
+
+def _incircle(ax, ay, bx, by, cx, cy, dx, dy):
+    # positive if d is inside the circumcircle of counterclockwise a, b, c
+    adx, ady = ax - dx, ay - dy
+    bdx, bdy = bx - dx, by - dy
+    cdx, cdy = cx - dx, cy - dy
+    return ((adx * adx + ady * ady) * (bdx * cdy - cdx * bdy) +
+            (bdx * bdx + bdy * bdy) * (cdx * ady - adx * cdy) +
+            (cdx * cdx + cdy * cdy) * (adx * bdy - bdx * ady))
+
+
+def _insertion_order(pts, seed=0):
+    """Order points for incremental insertion.
+
+    The points are shuffled and inserted in rounds of doubling size, each of
+    which is sorted spatially: the random order keeps the expected number of
+    triangles changed per insertion constant, even for points along curves,
+    and the sorting keeps the walks to the next point short.
+    """
+    order = np.random.RandomState(seed).permutation(len(pts))
+    rounds = []
+    stop = len(pts)
+    while stop > 0:
+        start = stop // 2 if stop > 64 else 0
+        rounds.append(order[start:stop])
+        stop = start
+    return np.concatenate([r[_spatial_order(pts[r])] for r in rounds[::-1]])
+
+
+def _spatial_order(pts):
+    """Order points along rows of a grid, alternating the direction of the
+    rows, so that consecutive insertions are close to each other.
+    """
+    if len(pts) < 3:
+        return np.arange(len(pts))
+    lo = pts.min(axis=0)
+    extent = np.maximum(pts.max(axis=0) - lo, 1e-300)
+    n_rows = max(1, int(np.sqrt(len(pts) / 4.)))
+    row = np.minimum(((pts[:, 1] - lo[1]) / extent[1] * n_rows).astype(int),
+                     n_rows - 1)
+    x = np.where(row % 2, -pts[:, 0], pts[:, 0])
+    return np.lexsort((x, row))
+
+
+def _segment_intersections(p0, p1, max_pairs=2 ** 22):
+    """Find all pairs of segments that cross each other.
+
+    The segments are swept along x: after sorting them by their smallest x
+    coordinate, the candidates of each segment are the following segments
+    that start before it ends, which are tested all at once. Collinear
+    segments and segments touching at an end point are not reported.
+
+    Parameters
+    ----------
+    p0, p1 : array
+        Nx2 arrays with the end points of the segments.
+    max_pairs : int
+        The maximum number of candidate pairs tested at once.
+
+    Returns
+    -------
+    i, j : array
+        The indices of the crossing segments.
+    s, t : array
+        The positions of the crossing along segments i and j, between 0 and 1.
+    """
+    xmin = np.minimum(p0[:, 0], p1[:, 0])
+    xmax = np.maximum(p0[:, 0], p1[:, 0])
+    order = np.argsort(xmin, kind='stable')
+    xmin_sorted = xmin[order]
+    # candidates of the k-th sorted segment are the sorted segments k+1:stop
+    stop = np.searchsorted(xmin_sorted, xmax[order], side='right')
+    counts = np.maximum(stop - np.arange(len(order)) - 1, 0)
+    cum = np.cumsum(counts)
+
+    results = []
+    start = 0
+    while start < len(order):
+        # take as many segments as fit in max_pairs candidate pairs
+        offset = cum[start - 1] if start else 0
+        end = max(np.searchsorted(cum, offset + max_pairs, side='right'),
+                  start + 1)
+        n = counts[start:end]
+        first = np.repeat(np.arange(start, end), n)
+        # the k-th candidate of segment first is first + 1 + k
+        steps = np.arange(n.sum()) - np.repeat(np.cumsum(n) - n, n)
+        i, j = order[first], order[first + 1 + steps]
+        start = end
+
+        ymin_i = np.minimum(p0[i, 1], p1[i, 1])
+        ymax_i = np.maximum(p0[i, 1], p1[i, 1])
+        ymin_j = np.minimum(p0[j, 1], p1[j, 1])
+        ymax_j = np.maximum(p0[j, 1], p1[j, 1])
+        keep = (ymin_i <= ymax_j) & (ymin_j <= ymax_i)
+        i, j = i[keep], j[keep]
+
+        di = p1[i] - p0[i]
+        dj = p1[j] - p0[j]
+        diff = p0[j] - p0[i]
+        denom = _cross_2d(di, dj)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            s = _cross_2d(diff, dj) / denom
+            t = _cross_2d(diff, di) / denom
+        keep = (denom != 0) & (s > 0) & (s < 1) & (t > 0) & (t < 1)
+        results.append((i[keep], j[keep], s[keep], t[keep]))
+
+    if not results:
+        empty = np.zeros(0)
+        return empty.astype(int), empty.astype(int), empty, empty
+    return tuple(np.concatenate(r) for r in zip(*results))
+
+
+class IncrementalTriangulation(object):
+    """Incremental constrained Delaunay triangulation
+
+    The triangles and their adjacency are kept in arrays, which are updated
+    locally when points and constraining edges are added or when a point is
+    moved. Editing a vertex of a large polygon therefore only changes the
+    triangles around it instead of triangulating everything again.
+
+    Parameters
+    ----------
+    pts : array | None
+        Nx2 array of points.
+    edges : array | None
+        Nx2 array of constraining edges (dtype=int).
+
+    Notes
+    -----
+    * Like :class:`Triangulation`, crossing edges are split by adding their
+      intersection to the points, duplicate points are merged and only the
+      triangles inside the area enclosed by the edges are returned, using the
+      even-odd rule.
+    * The points are inserted with the Bowyer-Watson algorithm and edges are
+      enforced by re-triangulating the triangles they cross [1]_.
+
+    References
+    ----------
+    .. [1] Anglada, M.V. An improved incremental algorithm for constructing
+       restricted Delaunay triangulations. Computers & Graphics 21(2), 1997.
+    """
+
+    def __init__(self, pts=None, edges=None):
+        # the number of times each constraint was added, whose parity tells
+        # whether it bounds the inside
+        self._counts = {}
+        self._n_pts = 0
+        self._pts = np.zeros((16, 2))
+        self._reset(np.zeros((0, 2)))
+        if pts is not None:
+            self.add_points(pts)
+        if edges is not None:
+            self.add_edges(edges)
+
+    @property
+    def pts(self):
+        """The Nx2 array of points, including the edge intersections"""
+        return self._pts[3:self._n_pts].astype(np.float32)
+
+    @property
+    def tris(self):
+        """The Nx3 array of triangles inside the constraining edges"""
+        if self._tris_out is None:
+            self._tris_out = self._inside_triangles() - 3
+        return self._tris_out
+
+    @property
+    def edges(self):
+        """The Nx2 array of constraining edges"""
+        return np.array(sorted(self._constraints), dtype=int).reshape(-1, 2)
+
+    def add_points(self, pts):
+        """Add points to the triangulation.
+
+        Parameters
+        ----------
+        pts : array
+            Nx2 array of points.
+
+        Returns
+        -------
+        indices : array
+            The indices of the new points.
+        """
+        pts = np.asarray(pts, dtype=np.float64)
+        if pts.ndim != 2 or pts.shape[1] < 2:
+            raise TypeError('pts argument must be ndarray of shape (N, 2).')
+        first = self._n_pts == 3
+        indices = self._append_points(pts[:, :2])
+        if first or not self._in_bounds(pts[:, :2]):
+            self._rebuild()
+        else:
+            self._insert_points(indices)
+        return indices - 3
+
+    def add_edges(self, edges):
+        """Add constraining edges to the triangulation.
+
+        Edges crossing other edges are split at their intersection, which is
+        added to the points.
+
+        Parameters
+        ----------
+        edges : array
+            Nx2 array of indices into the points.
+        """
+        edges = self._check_edges(edges)
+        keys = []
+        for key in map(tuple, np.sort(edges, axis=1).tolist()):
+            if key[0] == key[1]:
+                continue
+            if key not in self._counts:
+                keys.append(key)
+            self._counts[key] = self._counts.get(key, 0) + 1
+        if keys:
+            self._insert_constraints(keys)
+
+    def remove_edges(self, edges):
+        """Remove constraining edges from the triangulation.
+
+        An edge that was added several times is removed once.
+
+        Parameters
+        ----------
+        edges : array
+            Nx2 array of indices into the points.
+        """
+        edges = self._check_edges(edges)
+        for key in map(tuple, np.sort(edges, axis=1).tolist()):
+            count = self._counts.get(key, 0) - 1
+            if count > 0:
+                self._counts[key] = count
+                self._tris_out = None
+            elif count == 0:
+                del self._counts[key]
+                self._remove_constraint(key)
+
+    def move_point(self, index, pos):
+        """Move a point, updating only the triangles around it.
+
+        The edges attached to the point, or passing through it, are added
+        again afterwards.
+
+        Parameters
+        ----------
+        index : int
+            The index of the point.
+        pos : array-like
+            The new (x, y) position.
+        """
+        if not 0 <= index < self._n_pts - 3:
+            raise IndexError('Point index %d out of range' % index)
+        pos = np.asarray(pos, dtype=np.float64).ravel()[:2]
+        v = index + 3
+        m = self._canon[v]
+        if m == v:
+            # all edges in the mesh ending at the point belong to constraints
+            # that have to be added again
+            keys = set()
+            for w in self._neighbors(v):
+                keys.update(self._segments.get((min(v, w), max(v, w)), ()))
+        else:
+            keys = set()
+        keys.update(key for key in self._constraints if index in key)
+        for key in keys:
+            self._remove_constraint(key)
+
+        if m == v:
+            self._remove_vertex(v)
+            aliases = np.flatnonzero(self._canon[:self._n_pts] == v)
+            aliases = aliases[aliases != v]
+            if len(aliases):
+                self._canon[aliases] = aliases[0]
+                self._insert_point(aliases[0])
+        self._pts[v] = pos
+        self._canon[v] = -1
+        if not self._in_bounds(pos[np.newaxis]):
+            self._rebuild()
+        else:
+            self._insert_point(v)
+        if keys:
+            self._insert_constraints(sorted(keys))
+        self._tris_out = None
+
+    def _check_edges(self, edges):
+        edges = np.asarray(edges, dtype=np.intp).reshape(-1, 2)
+        if edges.size and (edges.min() < 0 or
+                           edges.max() >= self._n_pts - 3):
+            raise IndexError('edges refer to points that do not exist')
+        return edges
+
+    # Construction
+
+    def _reset(self, pts):
+        """Start again from a super triangle containing *pts*"""
+        if len(pts):
+            lo, hi = pts.min(axis=0), pts.max(axis=0)
+        else:
+            lo, hi = np.zeros(2), np.ones(2)
+        self._center = (lo + hi) / 2.
+        self._radius = max(np.abs(hi - lo).max(), 1e-12) * 5
+        # points closer than this are considered the same, so that rounding
+        # errors cannot leave a vertex just beside an edge
+        self._tol = 1e-10 * self._radius
+        angles = np.radians([90, 210, 330])
+        r = 4 * self._radius
+        self._pts[:3] = self._center + r * np.stack((np.cos(angles),
+                                                     np.sin(angles)), axis=1)
+        self._n_pts = max(self._n_pts, 3)
+        self._canon = np.full(len(self._pts), -1, dtype=np.intp)
+        self._canon[:3] = np.arange(3)
+        self._vert_tri = np.zeros(len(self._pts), dtype=np.intp)
+
+        self._tris = np.zeros((16, 3), dtype=np.intp)
+        self._adj = np.full((16, 3), -1, dtype=np.intp)
+        self._cons = np.zeros((16, 3), dtype=bool)
+        self._alive = np.zeros(16, dtype=bool)
+        self._tris[0] = 0, 1, 2
+        self._alive[0] = True
+        self._n_tris = 1
+        self._free = []
+        self._last = 0
+        self._update_views()
+
+        # constraints are stored as sorted pairs of point indices, mapped to
+        # the segments between mesh vertices that they are made of
+        self._constraints = {}
+        self._segments = {}
+        self._tris_out = None
+
+    def _update_views(self):
+        # memoryviews give fast access to single elements
+        self._pv = memoryview(self._pts)
+        self._tv = memoryview(self._tris)
+        self._av = memoryview(self._adj)
+        self._cv = memoryview(self._cons)
+
+    def _in_bounds(self, pts):
+        distance = np.sqrt(((pts - self._center) ** 2).sum(axis=1))
+        return bool((distance <= self._radius).all())
+
+    def _rebuild(self):
+        """Triangulate everything again with a larger super triangle"""
+        constraints = sorted(self._constraints)
+        self._reset(self._pts[3:self._n_pts])
+        self._insert_points(np.arange(3, self._n_pts))
+        if constraints:
+            self._insert_constraints(constraints)
+
+    def _append_points(self, pts):
+        n = self._n_pts
+        if n + len(pts) > len(self._pts):
+            size = max(2 * len(self._pts), n + len(pts))
+            self._pts = np.resize(self._pts, (size, 2))
+            self._canon = np.resize(self._canon, size)
+            self._vert_tri = np.resize(self._vert_tri, size)
+            self._update_views()
+        self._pts[n:n + len(pts)] = pts
+        self._canon[n:n + len(pts)] = -1
+        self._n_pts = n + len(pts)
+        return np.arange(n, n + len(pts))
+
+    def _insert_points(self, indices):
+        if len(indices) == 0:
+            return
+        # merge duplicate points before inserting them
+        _, first, inverse = np.unique(self._pts[indices], axis=0,
+                                      return_index=True, return_inverse=True)
+        unique = indices[first]
+        empty = self._n_tris - len(self._free) == 1
+        if not (empty and len(unique) > 64 and self._insert_qhull(unique)):
+            for v in unique[_insertion_order(self._pts[unique])].tolist():
+                self._insert_point(v)
+        # duplicates point to the vertex used in the mesh
+        self._canon[indices] = self._canon[unique[inverse.ravel()]]
+        self._tris_out = None
+
+    def _insert_qhull(self, vertices):
+        """Triangulate all vertices at once with scipy, if available"""
+        try:
+            from scipy.spatial import Delaunay
+        except ImportError:
+            return False
+        vertices = np.concatenate(([0, 1, 2], vertices))
+        try:
+            delaunay = Delaunay(self._pts[vertices])
+        except Exception:  # degenerate input, use the incremental version
+            return False
+        if len(delaunay.coplanar):
+            return False
+        tris = vertices[delaunay.simplices]
+        adj = delaunay.neighbors.astype(np.intp)
+        # use counterclockwise triangles
+        a, b, c = self._pts[tris].transpose(1, 0, 2)
+        cw = _cross_2d(b - a, c - a) < 0
+        tris[cw] = tris[cw][:, ::-1]
+        adj[cw] = adj[cw][:, ::-1]
+
+        n = len(tris)
+        self._tris = np.zeros((2 * n, 3), dtype=np.intp)
+        self._adj = np.full((2 * n, 3), -1, dtype=np.intp)
+        self._cons = np.zeros((2 * n, 3), dtype=bool)
+        self._alive = np.zeros(2 * n, dtype=bool)
+        self._tris[:n] = tris
+        self._adj[:n] = adj
+        self._alive[:n] = True
+        self._n_tris = n
+        self._free = []
+        self._last = 0
+        self._vert_tri[tris.ravel()] = np.repeat(np.arange(n), 3)
+        self._canon[vertices] = vertices
+        self._update_views()
+        return True
+
+    def _insert_constraints(self, keys):
+        """Insert constraints given as sorted pairs of point indices"""
+        keys = np.array(keys, dtype=np.intp).reshape(-1, 2)
+        p0, p1 = self._pts[keys[:, 0] + 3], self._pts[keys[:, 1] + 3]
+
+        # split the crossing constraints at their intersections
+        i, j, s, t = _segment_intersections(p0, p1)
+        # rounding can make segments with a common end point cross
+        ends = self._canon[keys + 3]
+        keep = ((ends[i, :1] != ends[j]) & (ends[i, 1:] != ends[j])).all(axis=1)
+        i, j, s, t = i[keep], j[keep], s[keep], t[keep]
+        cuts = [[] for _ in range(len(keys))]
+        if len(i):
+            # intersections at the same place are merged by rounding them
+            tol = self._tol
+            crossings = self._append_points(np.round(
+                (p0[i] + s[:, np.newaxis] * (p1[i] - p0[i])) / tol) * tol)
+            self._insert_points(crossings)
+            for ii, jj, ss, tt, v in zip(i.tolist(), j.tolist(), s.tolist(),
+                                         t.tolist(), crossings.tolist()):
+                cuts[ii].append((ss, v))
+                cuts[jj].append((tt, v))
+
+        canon = self._canon
+        for key, cut in zip(map(tuple, keys.tolist()), cuts):
+            self._constraints[key] = set()
+            chain = [key[0] + 3] + [v for _, v in sorted(cut)] + [key[1] + 3]
+            for a, b in zip(chain[:-1], chain[1:]):
+                self._insert_segment(canon[a], canon[b], key)
+        self._tris_out = None
+
+    def _remove_constraint(self, key):
+        segments = self._constraints.pop(key, ())
+        legalize = []
+        for segment in segments:
+            owners = self._segments[segment]
+            owners.discard(key)
+            if not owners:
+                del self._segments[segment]
+                self._set_constrained(segment[0], segment[1], False)
+                legalize.append(segment)
+        self._legalize(legalize)
+        self._tris_out = None
+
+    # Mesh queries
+
+    def _star(self, v):
+        """The triangles around vertex *v* in counterclockwise order"""
+        tv = self._tv
+        t0 = t = self._vert_tri[v]
+        star = []
+        while True:
+            star.append(t)
+            k = 0 if tv[t, 0] == v else (1 if tv[t, 1] == v else 2)
+            t = self._av[t, (k + 1) % 3]
+            if t == t0 or t < 0:
+                return star
+
+    def _neighbors(self, v):
+        tv = self._tv
+        out = []
+        for t in self._star(v):
+            k = 0 if tv[t, 0] == v else (1 if tv[t, 1] == v else 2)
+            out.append(tv[t, (k + 1) % 3])
+        return out
+
+    def _find_edge(self, a, b):
+        """Return (t, i) such that a -> b is the edge opposite vertex i of
+        triangle t, or None.
+        """
+        tv = self._tv
+        for t in self._star(a):
+            k = 0 if tv[t, 0] == a else (1 if tv[t, 1] == a else 2)
+            if tv[t, (k + 1) % 3] == b:
+                return t, (k + 2) % 3
+        return None
+
+    def _set_constrained(self, a, b, value):
+        edge = self._find_edge(a, b)
+        if edge is None:
+            return
+        t, i = edge
+        av = self._av
+        self._cv[t, i] = value
+        n = av[t, i]
+        if n >= 0:
+            self._cv[n, 0 if av[n, 0] == t else (1 if av[n, 1] == t else 2)] = value
+
+    def _add_segment(self, a, b, owners):
+        segment = (min(a, b), max(a, b))
+        self._segments.setdefault(segment, set()).update(owners)
+        for key in owners:
+            self._constraints[key].add(segment)
+        self._set_constrained(a, b, True)
+
+    def _locate(self, x, y):
+        """Walk to the triangle containing (x, y)"""
+        pv, tv, av = self._pv, self._tv, self._av
+        t = self._last
+        if not self._alive[t]:
+            t = int(np.flatnonzero(self._alive)[0])
+        # walks can cycle in constrained triangulations and through rounding
+        # errors, so they are bounded
+        n_alive = self._n_tris - len(self._free)
+        start = 0
+        for _ in range(32 + 4 * int(np.sqrt(n_alive))):
+            for ii in range(3):
+                i = (start + ii) % 3
+                u, w = tv[t, (i + 1) % 3], tv[t, (i + 2) % 3]
+                if _orient(pv[u, 0], pv[u, 1], pv[w, 0], pv[w, 1], x, y) < 0:
+                    t = av[t, i]
+                    # vary the order of the tests to avoid walking in circles
+                    start = (start + 1) % 3
+                    break
+            else:
+                return t
+            if t < 0:
+                break
+        return self._locate_all(x, y)
+
+    def _locate_all(self, x, y):
+        """Find the triangle containing (x, y) by testing all triangles, or
+        the one it is the least outside of
+        """
+        alive = np.flatnonzero(self._alive[:self._n_tris])
+        a, b, c = self._pts[self._tris[alive]].transpose(1, 0, 2)
+        inside = np.minimum(np.minimum(
+            _orient(b[:, 0], b[:, 1], c[:, 0], c[:, 1], x, y),
+            _orient(c[:, 0], c[:, 1], a[:, 0], a[:, 1], x, y)),
+            _orient(a[:, 0], a[:, 1], b[:, 0], b[:, 1], x, y))
+        return int(alive[np.argmax(inside)])
+
+    # Mesh updates
+
+    def _replace(self, removed, new_tris):
+        """Replace the triangles *removed* by *new_tris*, which must cover
+        the same area, and return the indices of the new triangles.
+        """
+        tv, av, cv = self._tv, self._av, self._cv
+        removed_set = set(removed)
+        outer = {}
+        for t in removed:
+            for i in range(3):
+                n = av[t, i]
+                if n in removed_set:
+                    continue
+                j = -1
+                if n >= 0:
+                    j = 0 if av[n, 0] == t else (1 if av[n, 1] == t else 2)
+                outer[(tv[t, (i + 1) % 3], tv[t, (i + 2) % 3])] = (n, j,
+                                                                   cv[t, i])
+            self._alive[t] = False
+        self._free.extend(removed)
+
+        indices = self._allocate(len(new_tris))
+        tv, av, cv = self._tv, self._av, self._cv
+        vert_tri = self._vert_tri
+        inner = {}
+        for s, tri in zip(indices, new_tris):
+            for i in range(3):
+                tv[s, i] = tri[i]
+                vert_tri[tri[i]] = s
+            for i in range(3):
+                edge = (tri[(i + 1) % 3], tri[(i + 2) % 3])
+                if edge in outer:
+                    n, j, constrained = outer.pop(edge)
+                    av[s, i] = n
+                    cv[s, i] = constrained
+                    if n >= 0:
+                        av[n, j] = s
+                elif edge[::-1] in inner:
+                    s2, i2 = inner.pop(edge[::-1])
+                    av[s, i] = s2
+                    av[s2, i2] = s
+                    cv[s, i] = cv[s2, i2] = False
+                else:
+                    inner[edge] = (s, i)
+        if outer or inner:
+            raise RuntimeError('Triangulation became inconsistent')
+        self._last = indices[-1]
+        return indices
+
+    def _allocate(self, n):
+        indices = []
+        while self._free and len(indices) < n:
+            indices.append(self._free.pop())
+        n_new = n - len(indices)
+        if self._n_tris + n_new > len(self._tris):
+            size = max(2 * len(self._tris), self._n_tris + n_new)
+            self._tris = np.resize(self._tris, (size, 3))
+            self._adj = np.resize(self._adj, (size, 3))
+            self._cons = np.resize(self._cons, (size, 3))
+            self._alive = np.resize(self._alive, size)
+            self._alive[self._n_tris:] = False
+            self._update_views()
+        indices.extend(range(self._n_tris, self._n_tris + n_new))
+        self._n_tris += n_new
+        self._alive[indices] = True
+        return indices
+
+    def _insert_point(self, v, edge=None):
+        """Insert point *v* with the Bowyer-Watson algorithm, optionally
+        splitting the given (triangle, index) edge on which it lies.
+        """
+        pv, tv, av, cv = self._pv, self._tv, self._av, self._cv
+        x, y = pv[v, 0], pv[v, 1]
+        tol = self._tol
+        if edge is None:
+            t = self._locate(x, y)
+            on_edge = None
+            for i in range(3):
+                u = tv[t, i]
+                if abs(pv[u, 0] - x) <= tol and abs(pv[u, 1] - y) <= tol:
+                    self._canon[v] = u
+                    return
+            for i in range(3):
+                u, w = tv[t, (i + 1) % 3], tv[t, (i + 2) % 3]
+                ux, uy, wx, wy = pv[u, 0], pv[u, 1], pv[w, 0], pv[w, 1]
+                # the distance to the edge is its orientation over its length
+                o = _orient(ux, uy, wx, wy, x, y)
+                if o * o <= tol * tol * ((wx - ux) ** 2 + (wy - uy) ** 2):
+                    on_edge = i
+            edge = (t, on_edge)
+        t, on_edge = edge
+        self._canon[v] = v
+
+        cavity = [t]
+        split = None
+        if on_edge is not None:
+            n = av[t, on_edge]
+            if n >= 0:
+                cavity.append(n)
+            if cv[t, on_edge]:
+                split = (tv[t, (on_edge + 1) % 3], tv[t, (on_edge + 2) % 3])
+        in_cavity = set(cavity)
+        stack = list(cavity)
+        while stack:
+            t = stack.pop()
+            for i in range(3):
+                n = av[t, i]
+                if n < 0 or n in in_cavity or cv[t, i]:
+                    continue
+                a, b, c = tv[n, 0], tv[n, 1], tv[n, 2]
+                u, w = tv[t, (i + 1) % 3], tv[t, (i + 2) % 3]
+                # the cavity must stay star-shaped as seen from the point
+                if (_incircle(pv[a, 0], pv[a, 1], pv[b, 0], pv[b, 1],
+                              pv[c, 0], pv[c, 1], x, y) > 0 or
+                        _orient(pv[u, 0], pv[u, 1], pv[w, 0], pv[w, 1],
+                                x, y) <= 0):
+                    in_cavity.add(n)
+                    cavity.append(n)
+                    stack.append(n)
+
+        new_tris = []
+        for t in cavity:
+            for i in range(3):
+                if av[t, i] not in in_cavity:
+                    new_tris.append((tv[t, (i + 1) % 3], tv[t, (i + 2) % 3],
+                                     v))
+        self._replace(cavity, new_tris)
+
+        if split is not None:
+            a, b = split
+            owners = self._segments.pop((min(a, b), max(a, b)))
+            for key in owners:
+                self._constraints[key].discard((min(a, b), max(a, b)))
+            self._add_segment(a, v, owners)
+            self._add_segment(v, b, owners)
+
+    def _insert_segment(self, a, b, key):
+        """Enforce the segment between mesh vertices a and b"""
+        pv, tv, av, cv = self._pv, self._tv, self._av, self._cv
+        while a != b:
+            if self._find_edge(a, b) is not None:
+                self._add_segment(a, b, (key,))
+                return
+            ax, ay, bx, by = pv[a, 0], pv[a, 1], pv[b, 0], pv[b, 1]
+            # vertices closer to the segment than this lie on it
+            eps = self._tol * ((bx - ax) ** 2 + (by - ay) ** 2) ** 0.5
+
+            # find the triangle around a in the direction of b
+            first = None
+            for t in self._star(a):
+                k = 0 if tv[t, 0] == a else (1 if tv[t, 1] == a else 2)
+                c, d = tv[t, (k + 1) % 3], tv[t, (k + 2) % 3]
+                oc = _orient(ax, ay, bx, by, pv[c, 0], pv[c, 1])
+                od = _orient(ax, ay, bx, by, pv[d, 0], pv[d, 1])
+                if abs(oc) <= eps:
+                    if ((pv[c, 0] - ax) * (bx - ax) +
+                            (pv[c, 1] - ay) * (by - ay)) > 0:
+                        first = c
+                        break
+                elif oc < 0 and od > eps:
+                    first = (t, k)
+                    break
+            if first is None:
+                raise RuntimeError('Could not insert edge (%d, %d)'
+                                   % (a - 3, b - 3))
+            if not isinstance(first, tuple):
+                # the segment passes through vertex c
+                self._add_segment(a, first, (key,))
+                a = first
+                continue
+
+            # walk through the triangles crossed by the segment
+            t, k = first
+            removed = [t]
+            right, left = [tv[t, (k + 1) % 3]], [tv[t, (k + 2) % 3]]
+            i = k
+            end = None
+            while True:
+                if cv[t, i]:
+                    break
+                n = av[t, i]
+                removed.append(n)
+                m = 0
+                while av[n, m] != t:
+                    m += 1
+                e = tv[n, m]
+                if e == b:
+                    end = b
+                    break
+                oe = _orient(ax, ay, bx, by, pv[e, 0], pv[e, 1])
+                if abs(oe) <= eps:
+                    end = e
+                    break
+                # the next crossed edge goes from the right to the left side
+                if oe > 0:
+                    left.append(e)
+                    i = (m + 1) % 3
+                else:
+                    right.append(e)
+                    i = (m + 2) % 3
+                t = n
+
+            if end is None:
+                # crossing another constraint: split it at the intersection
+                u, w = tv[t, (i + 1) % 3], tv[t, (i + 2) % 3]
+                ux, uy, wx, wy = pv[u, 0], pv[u, 1], pv[w, 0], pv[w, 1]
+                s = (_orient(ux, uy, wx, wy, ax, ay) /
+                     (_orient(ux, uy, wx, wy, ax, ay) -
+                      _orient(ux, uy, wx, wy, bx, by)))
+                v = self._append_points([[ax + s * (bx - ax),
+                                          ay + s * (by - ay)]])[0]
+                self._insert_point(v, (t, i))
+                pv, tv, av, cv = self._pv, self._tv, self._av, self._cv
+                self._insert_segment(a, v, key)
+                a = v
+                continue
+
+            new_tris = (self._pseudo_polygon(a, end, left) +
+                        self._pseudo_polygon(end, a, right[::-1]))
+            self._replace(removed, new_tris)
+            pv, tv, av, cv = self._pv, self._tv, self._av, self._cv
+            self._add_segment(a, end, (key,))
+            a = end
+
+    def _pseudo_polygon(self, a, b, chain):
+        """Delaunay triangles filling the polygon a, b, reversed *chain*,
+        whose points are all to the left of a -> b.
+        """
+        if not chain:
+            return []
+        pv = self._pv
+        ci = 0
+        for j in range(1, len(chain)):
+            c, d = chain[ci], chain[j]
+            if _incircle(pv[a, 0], pv[a, 1], pv[b, 0], pv[b, 1],
+                         pv[c, 0], pv[c, 1], pv[d, 0], pv[d, 1]) > 0:
+                ci = j
+        c = chain[ci]
+        return ([(a, b, c)] + self._pseudo_polygon(a, c, chain[:ci]) +
+                self._pseudo_polygon(c, b, chain[ci + 1:]))
+
+    def _remove_vertex(self, v):
+        """Remove vertex v, which must not be part of a constraint"""
+        pv, tv = self._pv, self._tv
+        star = self._star(v)
+        ring = []
+        for t in star:
+            k = 0 if tv[t, 0] == v else (1 if tv[t, 1] == v else 2)
+            ring.append(tv[t, (k + 1) % 3])
+
+        # clip ears that have no other ring point in their circumcircle
+        new_tris = []
+        while len(ring) > 3:
+            best, best_area = None, 0
+            for j in range(len(ring)):
+                u, w, x = ring[j - 1], ring[j], ring[(j + 1) % len(ring)]
+                area = _orient(pv[u, 0], pv[u, 1], pv[w, 0], pv[w, 1],
+                               pv[x, 0], pv[x, 1])
+                if area <= 0:
+                    continue
+                if not any(_incircle(pv[u, 0], pv[u, 1], pv[w, 0], pv[w, 1],
+                                     pv[x, 0], pv[x, 1], pv[o, 0],
+                                     pv[o, 1]) > 0
+                           for o in ring if o not in (u, w, x)):
+                    best = j
+                    break
+                if area > best_area:
+                    best, best_area = j, area
+            if best is None:
+                best = 0
+            new_tris.append((ring[best - 1], ring[best],
+                             ring[(best + 1) % len(ring)]))
+            ring.pop(best)
+        new_tris.append(tuple(ring))
+        self._replace(star, new_tris)
+        self._canon[v] = -1
+        self._legalize([(a, b) for tri in new_tris
+                        for a, b in zip(tri, tri[1:] + tri[:1])])
+
+    def _legalize(self, edges):
+        """Flip the given edges, and the edges around them, until they are
+        locally Delaunay.
+        """
+        stack = list(edges)
+        while stack:
+            a, b = stack.pop()
+            edge = self._find_edge(a, b)
+            if edge is None:
+                continue
+            pv, tv, av, cv = self._pv, self._tv, self._av, self._cv
+            t, i = edge
+            n = av[t, i]
+            if n < 0 or cv[t, i]:
+                continue
+            m = 0
+            while av[n, m] != t:
+                m += 1
+            x, y = tv[t, i], tv[n, m]
+            if _incircle(pv[x, 0], pv[x, 1], pv[a, 0], pv[a, 1],
+                         pv[b, 0], pv[b, 1], pv[y, 0], pv[y, 1]) <= 0:
+                continue
+            # the flipped triangles must not be inverted
+            if (_orient(pv[x, 0], pv[x, 1], pv[a, 0], pv[a, 1],
+                        pv[y, 0], pv[y, 1]) <= 0 or
+                    _orient(pv[x, 0], pv[x, 1], pv[y, 0], pv[y, 1],
+                            pv[b, 0], pv[b, 1]) <= 0):
+                continue
+            self._replace([t, n], [(x, a, y), (x, y, b)])
+            stack.extend([(a, y), (y, b), (b, x), (x, a)])
+
+    # Output
+
+    def _inside_triangles(self):
+        """Select the triangles inside the constraints with the even-odd
+        rule, by labeling the regions separated by constrained edges.
+        """
+        alive = np.flatnonzero(self._alive[:self._n_tris])
+        tris = self._tris[alive]
+        adj = self._adj[alive]
+        cons = self._cons[alive]
+        local = np.full(self._n_tris, -1, dtype=np.intp)
+        local[alive] = np.arange(len(alive))
+        src = np.repeat(np.arange(len(alive)), 3)
+        dst = local[np.where(adj < 0, 0, adj)].ravel()
+        valid = (adj >= 0).ravel()
+        cons = cons.ravel()
+        if cons.any():
+            # edges covered by an even number of constraints (e.g. where
+            # edges overlap) do not bound the inside
+            n = self._n_pts
+            odd = [a * n + b for (a, b), owners in self._segments.items()
+                   if sum(self._counts.get(key, 0) for key in owners) % 2]
+            u = np.roll(tris, -1, axis=1).ravel()
+            w = np.roll(tris, -2, axis=1).ravel()
+            codes = np.minimum(u, w) * n + np.maximum(u, w)
+            cons &= np.isin(codes, odd)
+
+        # connected components of triangles through unconstrained edges,
+        # by hooking and pointer jumping
+        label = np.arange(len(alive))
+        a, b = src[valid & ~cons], dst[valid & ~cons]
+        while True:
+            la, lb = label[a], label[b]
+            differ = la != lb
+            if not differ.any():
+                break
+            np.minimum.at(label, np.maximum(la, lb)[differ],
+                          np.minimum(la, lb)[differ])
+            while True:
+                jumped = label[label]
+                if (jumped == label).all():
+                    break
+                label = jumped
+
+        # alternate inside and outside across the constrained edges
+        a, b = label[src[valid & cons]], label[dst[valid & cons]]
+        pairs = np.unique(np.stack((a, b), axis=1), axis=0)
+        neighbors = {}
+        for la, lb in pairs.tolist():
+            neighbors.setdefault(la, []).append(lb)
+        outside = label[np.flatnonzero((tris < 3).any(axis=1))[0]]
+        inside = {outside: False}
+        queue = [outside]
+        while queue:
+            la = queue.pop(0)
+            for lb in neighbors.get(la, ()):
+                if lb not in inside:
+                    inside[lb] = not inside[la]
+                    queue.append(lb)
+        inside_labels = [la for la, value in inside.items() if value]
+        mask = np.isin(label, inside_labels)
+        return tris[mask]
@@ -64,6 +64,8 @@ def set_current_canvas(canvas):
     """Make a canvas active. Used primarily by the canvas itself."""
     # Notify glir 
     canvas.context._do_CURRENT_command = True
+    # GL state may have been changed by other canvases sharing the context
+    canvas.context.glir.invalidate_gl_state()
     # Try to be quick
     if canvasses and canvasses[-1]() is canvas:
         return
@@ -101,6 +103,7 @@ class GLContext(BaseGlooFunctions):
         self._glir = GlirQueue()
         self._do_CURRENT_command = False  # flag that CURRENT cmd must be given
         self._last_viewport = None
+        self._state_counts = {}
 
     def __repr__(self):
         return "<GLContext at 0x%x>" % id(self)
@@ -170,6 +173,29 @@ class GLContext(BaseGlooFunctions):
                 fbo = 0
             self.shared.parser.parse([('CURRENT', 0, fbo)])
         self.glir.flush(self.shared.parser)
+        if event is not None:
+            # Called at the end of a draw event: collect the state counts
+            self._state_counts = {}
+            for counts in (self.glir.state_counts,
+                           getattr(self.shared.parser, 'state_counts', {})):
+                self._state_counts.update(counts)
+                counts.update(dict.fromkeys(counts, 0))
+            if self.glir.metrics is not None:
+                self.glir.metrics.end_frame(self._state_counts)
+
+    def get_state_counts(self):
+        """Get the number of GL state changes during the last frame
+
+        Returns
+        -------
+        counts : dict
+            The number of state changes that were queued (``'emitted'``)
+            and that were dropped because the state was already set
+            (``'skipped'``). If the parser keeps track of the GL state,
+            the number of state changes that it ``'applied'`` and the
+            number of ``'redundant'`` ones that it dropped are included.
+        """
+        return dict(self._state_counts)
 
     def set_viewport(self, *args):
         BaseGlooFunctions.set_viewport(self, *args)
@@ -124,12 +124,16 @@ class FrameBuffer(GLObject):
         canvas = get_current_canvas()
         if canvas is not None:
             canvas.context.glir.associate(self.glir)
+            canvas.context.glir.invalidate_gl_state()
 
     def deactivate(self):
         """Stop using this frame buffer, the previous framebuffer will be
         made active.
         """
         self._glir.command('FRAMEBUFFER', self._id, False)
+        canvas = get_current_canvas()
+        if canvas is not None:
+            canvas.context.glir.invalidate_gl_state()
 
     def __enter__(self):
         self.activate()
@@ -357,6 +357,36 @@ cause shaders to be detached and deleted. See the
 `OpenGL documentation <https://www.khronos.org/registry/OpenGL-Refpages/gl4/html/glLinkProgram.xhtml>`_
 for details on program linking.
 
+TIMER
+~~~~~
+
+::
+
+    ('TIMER', 0, <'begin' or 'end'>, <key>)
+    # Example:
+    ('TIMER', 0, 'begin', 1234)
+
+Measure the GPU time of the commands between the ``begin`` and ``end``
+command with the same key, e.g. using GL timer queries. The measurement
+must not stall the pipeline; results become available when the GPU has
+completed the commands, and GLIR implementations that cannot measure GPU
+time ignore this command.
+
+FENCE
+~~~~~
+
+::
+
+    ('FENCE', 0, <key>)
+    # Example:
+    ('FENCE', 0, 1234)
+
+Insert a fence after the preceding commands, e.g. using GL sync objects, so
+that the client can poll whether the GPU has completed them without waiting
+(see ``GlirParser.fence_signaled``). A new fence with the same key replaces
+the previous one. GLIR implementations that do not support fences ignore
+this command and report fences as signaled.
+
 """
 
 import os
@@ -364,6 +394,8 @@ import sys
 import re
 import json
 import weakref
+from collections import deque
+from time import perf_counter
 from packaging.version import Version
 
 import numpy as np
@@ -417,6 +449,16 @@ _internalformats = dict([(enum.name, enum) for enum in _internalformats])
 JUST_DELETED = 'JUST_DELETED'
 
 
+# GL functions that set fixed-function state, with arguments that fully
+# determine that state, so that the parser can skip redundant calls
+_STATE_FUNCS = frozenset([
+    'glEnable', 'glDisable', 'glViewport', 'glDepthRange', 'glFrontFace',
+    'glCullFace', 'glLineWidth', 'glPolygonOffset', 'glClearColor',
+    'glClearDepth', 'glClearStencil', 'glBlendFuncSeparate', 'glBlendColor',
+    'glBlendEquationSeparate', 'glScissor', 'glDepthFunc', 'glDepthMask',
+    'glColorMask', 'glSampleCoverage', 'glHint'])
+
+
 def as_enum(enum):
     """Turn a possibly string enum into an integer enum."""
     if isinstance(enum, str):
@@ -498,12 +540,15 @@ class _GlirQueueShare(object):
         self._commands = []
         return commands
 
-    def flush(self, parser):
+    def flush(self, parser, metrics=None):
         """Flush all current commands to the GLIR interpreter."""
         if self._verbose:
             show = self._verbose if isinstance(self._verbose, str) else None
             self.show(show)
-        parser.parse(self._filter(self.clear(), parser))
+        commands = self._filter(self.clear(), parser)
+        if metrics is not None:
+            metrics.add_commands(commands)
+        parser.parse(commands)
 
     def _filter(self, commands, parser):
         """Filter DATA/SIZE commands that are overridden by a
@@ -539,6 +584,23 @@ class GlirQueue(object):
         # We do not actually queue any commands here, but on a shared queue
         # object that may be joined with others as queues are associated.
         self._shared = _GlirQueueShare(self)
+        # The GL state that the queued commands leave the context in, so
+        # that redundant state changes are not queued (see set_state)
+        self.gl_state = {}
+        self.state_counts = dict(emitted=0, skipped=0)
+        # Optional (salpha, dalpha) that replace the alpha factors of the
+        # blend functions that are set, e.g. to accumulate premultiplied
+        # alpha in an offscreen layer
+        self.blend_alpha = None
+        # Optional FrameMetrics collector that the flushed commands are
+        # reported to
+        self.metrics = None
+
+    def invalidate_gl_state(self):
+        """Forget the GL state, e.g. after the context or framebuffer changed,
+        so that the next state changes are queued unconditionally.
+        """
+        self.gl_state.clear()
 
     def command(self, *args):
         """Send a command. See the command spec at:
@@ -557,6 +619,8 @@ class GlirQueue(object):
         """Pop the whole queue (and associated queues) and return a
         list of commands.
         """
+        # the state changes that were queued will not be applied here
+        self.invalidate_gl_state()
         return self._shared.clear()
 
     def associate(self, queue):
@@ -581,7 +645,13 @@ class GlirQueue(object):
 
     def flush(self, parser):
         """Flush all current commands to the GLIR interpreter."""
-        self._shared.flush(parser)
+        metrics = self.metrics
+        if metrics is None:
+            self._shared.flush(parser)
+        else:
+            t0 = perf_counter()
+            self._shared.flush(parser, metrics)
+            metrics.add_flush(perf_counter() - t0)
 
 
 def _convert_es2_shader(shader):
@@ -729,6 +799,24 @@ class GlirParser(BaseGlirParser):
         # when two Canvases share a context.
         self.env = {}
 
+        # Shadow of the fixed-function GL state, cleared on context and
+        # framebuffer switches, and the number of applied and skipped
+        # state changes
+        self._gl_state = {}
+        self.state_counts = dict(applied=0, redundant=0)
+
+        # Optional FrameMetrics collector that the time spent executing
+        # commands is reported to
+        self.metrics = None
+
+        # GPU timer queries; None until the first TIMER command, False if
+        # they are not supported
+        self._timer = None
+
+        # GPU sync objects; None until the first FENCE command, False if
+        # they are not supported
+        self._fences = None
+
     @property
     def shader_compatibility(self):
         """Type of shader compatibility"""
@@ -747,16 +835,23 @@ class GlirParser(BaseGlirParser):
         if cmd == 'CURRENT':
             # This context is made current
             self.env.clear()
+            self._gl_state.clear()
             self._gl_initialize()
             self.env['fbo'] = args[0]
             gl.glBindFramebuffer(gl.GL_FRAMEBUFFER, args[0])
         elif cmd == 'FUNC':
             # GL function call
             args = [as_enum(a) for a in args]
+            if id_ in _STATE_FUNCS and self._redundant_state(id_, args):
+                return
             try:
                 getattr(gl, id_)(*args)
             except AttributeError:
                 logger.warning('Invalid gl command: %r' % id_)
+        elif cmd == 'TIMER':
+            self._timer_command(*args)
+        elif cmd == 'FENCE':
+            self._fence_command(*args)
         elif cmd == 'CREATE':
             # Creating an object
             if args[0] is not None:
@@ -797,6 +892,7 @@ class GlirParser(BaseGlirParser):
             elif cmd == 'ATTACH':  # FrameBuffer, Program
                 ob.attach(*args)
             elif cmd == 'FRAMEBUFFER':  # FrameBuffer
+                self._gl_state.clear()
                 ob.set_framebuffer(*args)
             # elif cmd == 'SHADERS':  # Program
             #     ob.set_shaders(*args)
@@ -809,6 +905,81 @@ class GlirParser(BaseGlirParser):
             else:
                 logger.warning('Invalid GLIR command %r' % cmd)
 
+    def _timer_command(self, action, key):
+        """Begin or end a GPU timer query, if supported"""
+        if self._timer is None:
+            self._timer = _get_timer_queries() or False
+            if not self._timer:
+                logger.info('GPU timer queries are not supported')
+        if self._timer:
+            try:
+                getattr(self._timer, action)(key)
+            except Exception as err:
+                logger.warning('Disabling GPU timer queries: %s' % err)
+                self._timer = False
+
+    def _fence_command(self, key):
+        """Insert a GPU fence, if supported"""
+        if self._fences is None:
+            self._fences = _get_fences() or False
+            if not self._fences:
+                logger.info('GPU fences are not supported')
+        if self._fences:
+            try:
+                self._fences.insert(key)
+            except Exception as err:
+                logger.warning('Disabling GPU fences: %s' % err)
+                self._fences = False
+
+    def fence_signaled(self, key):
+        """Whether the GPU has completed the commands before the FENCE
+        command with the given key
+
+        This does not wait for the GPU. The GL context of the fence must be
+        current. Unknown keys, and all keys if fences are not supported,
+        are reported as signaled.
+
+        Parameters
+        ----------
+        key : hashable
+            The key of the FENCE command.
+
+        Returns
+        -------
+        signaled : bool
+            True if the commands are completed.
+        """
+        if not self._fences:
+            return True
+        try:
+            return self._fences.signaled(key)
+        except Exception as err:
+            logger.warning('Disabling GPU fences: %s' % err)
+            self._fences = False
+            return True
+
+    @property
+    def timer_results(self):
+        """Dict with the most recent GPU time in milliseconds measured for
+        each key of the TIMER commands (empty if not supported)
+        """
+        return dict(self._timer.results) if self._timer else {}
+
+    def _redundant_state(self, funcname, args):
+        """Whether a state function would leave the GL state unchanged"""
+        if funcname in ('glEnable', 'glDisable'):
+            key, value = args[0], funcname
+        elif funcname == 'glHint':
+            key, value = (funcname, args[0]), args
+        else:
+            key, value = funcname, args
+        if self._gl_state.get(key) == value:
+            self.state_counts['redundant'] += 1
+            return True
+        self._gl_state[key] = value
+        self.state_counts['applied'] += 1
+        return False
+
     def parse(self, commands):
         """Parse a list of commands."""
         # Get rid of dummy objects that represented deleted objects in
@@ -820,8 +991,13 @@ class GlirParser(BaseGlirParser):
         for id_ in to_delete:
             self._objects.pop(id_)
 
+        metrics = self.metrics
+        if metrics is not None:
+            t0 = perf_counter()
         for command in commands:
             self._parse(command)
+        if metrics is not None:
+            metrics.add_parse(perf_counter() - t0)
 
     def get_object(self, id_):
         """Get the object with the given id or None if it does not exist."""
@@ -1594,6 +1770,158 @@ def _check_pyopengl_3D():
     return _gl
 
 
+GL_TIME_ELAPSED = 35007
+GL_QUERY_RESULT = 34918
+GL_QUERY_RESULT_AVAILABLE = 34919
+
+
+def _get_timer_queries():
+    """Get a GlirTimerQueries object for the current context, or None if
+    timer queries are not available.
+    """
+    if '.es' in gl.current_backend.__name__:
+        return None
+    try:
+        import OpenGL.GL as _gl
+        if not (_gl.glGenQueries and _gl.glGetQueryObjectui64v):
+            return None
+    except Exception:
+        return None
+    match = re.match(r'(\d+)\.(\d+)', gl.glGetParameter(gl.GL_VERSION))
+    supported = (match is not None and
+                 (int(match.group(1)), int(match.group(2))) >= (3, 3))
+    if not supported:
+        try:
+            extensions = gl.glGetParameter(gl.GL_EXTENSIONS)
+            supported = 'GL_ARB_timer_query' in extensions
+        except Exception:
+            pass
+    return GlirTimerQueries(_gl) if supported else None
+
+
+class GlirTimerQueries(object):
+    """Measure the GPU time of GLIR commands with GL_TIME_ELAPSED queries
+
+    Finished queries are polled without waiting for the GPU, so that the
+    result for a key typically becomes available a few frames after it
+    was measured. Query objects are reused once their result is read.
+
+    Parameters
+    ----------
+    gl_ : module
+        The PyOpenGL GL namespace.
+    """
+
+    def __init__(self, gl_):
+        self._gl = gl_
+        self._free = []
+        self._pending = deque()
+        self._active = None
+        self._available = np.zeros(1, np.int32)
+        self._elapsed = np.zeros(1, np.uint64)
+        self.results = {}
+
+    def begin(self, key):
+        """Start measuring the GPU time for key"""
+        self.collect()
+        if self._active is not None:
+            return  # time elapsed queries cannot be nested
+        if self._free:
+            query = self._free.pop()
+        else:
+            query = int(np.ravel(self._gl.glGenQueries(1))[0])
+        self._gl.glBeginQuery(GL_TIME_ELAPSED, query)
+        self._active = key, query
+
+    def end(self, key):
+        """Stop measuring the GPU time for key"""
+        if self._active is None or self._active[0] != key:
+            return
+        self._gl.glEndQuery(GL_TIME_ELAPSED)
+        self._pending.append(self._active)
+        self._active = None
+
+    def collect(self):
+        """Read the results of the queries that the GPU has completed"""
+        while self._pending:
+            key, query = self._pending[0]
+            self._gl.glGetQueryObjectiv(query, GL_QUERY_RESULT_AVAILABLE,
+                                        self._available)
+            if not self._available[0]:
+                break  # queries complete in order
+            self._gl.glGetQueryObjectui64v(query, GL_QUERY_RESULT,
+                                           self._elapsed)
+            self.results[key] = float(self._elapsed[0]) / 1e6
+            self._pending.popleft()
+            self._free.append(query)
+
+
+GL_SYNC_GPU_COMMANDS_COMPLETE = 37143
+GL_ALREADY_SIGNALED = 37146
+GL_CONDITION_SATISFIED = 37148
+GL_WAIT_FAILED = 37149
+
+
+def _get_fences():
+    """Get a GlirFences object for the current context, or None if sync
+    objects are not available.
+    """
+    if '.es' in gl.current_backend.__name__:
+        return None
+    try:
+        import OpenGL.GL as _gl
+        if not (_gl.glFenceSync and _gl.glClientWaitSync):
+            return None
+    except Exception:
+        return None
+    match = re.match(r'(\d+)\.(\d+)', gl.glGetParameter(gl.GL_VERSION))
+    supported = (match is not None and
+                 (int(match.group(1)), int(match.group(2))) >= (3, 2))
+    if not supported:
+        try:
+            extensions = gl.glGetParameter(gl.GL_EXTENSIONS)
+            supported = 'GL_ARB_sync' in extensions
+        except Exception:
+            pass
+    return GlirFences(_gl) if supported else None
+
+
+class GlirFences(object):
+    """Track the completion of GLIR commands with GL sync objects
+
+    Parameters
+    ----------
+    gl_ : module
+        The PyOpenGL GL namespace.
+    """
+
+    def __init__(self, gl_):
+        self._gl = gl_
+        self._syncs = {}
+
+    def insert(self, key):
+        """Insert a fence for key after the commands issued so far"""
+        old = self._syncs.pop(key, None)
+        if old is not None:
+            self._gl.glDeleteSync(old)
+        self._syncs[key] = self._gl.glFenceSync(GL_SYNC_GPU_COMMANDS_COMPLETE,
+                                                0)
+        # make sure that the fence reaches the GPU, or it never signals
+        self._gl.glFlush()
+
+    def signaled(self, key):
+        """Poll whether the fence for key is signaled, without waiting"""
+        sync = self._syncs.get(key)
+        if sync is None:
+            return True
+        status = self._gl.glClientWaitSync(sync, 0, 0)
+        if status in (GL_ALREADY_SIGNALED, GL_CONDITION_SATISFIED,
+                      GL_WAIT_FAILED):
+            self._gl.glDeleteSync(self._syncs.pop(key))
+            return True
+        return False
+
+
 def glTexImage3D(target, level, internalformat, format, type, pixels):
     # Import from PyOpenGL
     _gl = _check_pyopengl_3D()
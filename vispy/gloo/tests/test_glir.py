@@ -66,6 +66,127 @@ def test_queue():
     assert shader3.startswith('precision')
 
 
+def test_parser_state_shadow():
+    parser = glir.GlirParser()
+    assert not parser._redundant_state('glEnable', [1])
+    assert parser._redundant_state('glEnable', [1])
+    assert not parser._redundant_state('glDisable', [1])
+    assert not parser._redundant_state('glLineWidth', [2.])
+    assert parser._redundant_state('glLineWidth', [2.])
+    assert not parser._redundant_state('glHint', [3, 4])
+    assert not parser._redundant_state('glHint', [5, 4])
+    assert parser._redundant_state('glHint', [3, 4])
+    assert parser.state_counts == dict(applied=5, redundant=3)
+    parser._gl_state.clear()
+    assert not parser._redundant_state('glLineWidth', [2.])
+
+
+class _FakeQueryGL(object):
+    """Stand-in for PyOpenGL timer query functions"""
+
+    def __init__(self):
+        self.n_queries = 0
+        self.available = set()
+
+    def glGenQueries(self, n):
+        self.n_queries += 1
+        return self.n_queries
+
+    def glBeginQuery(self, target, query):
+        assert target == glir.GL_TIME_ELAPSED
+
+    def glEndQuery(self, target):
+        pass
+
+    def glGetQueryObjectiv(self, query, pname, params):
+        params[0] = query in self.available
+
+    def glGetQueryObjectui64v(self, query, pname, params):
+        params[0] = query * 1000000
+
+
+def test_timer_queries():
+    fake = _FakeQueryGL()
+    timer = glir.GlirTimerQueries(fake)
+    timer.begin('a')
+    timer.begin('b')  # cannot be nested, ignored
+    timer.end('b')
+    timer.end('a')
+    timer.begin('b')
+    timer.end('b')
+    assert timer.results == {}
+    # results are read in order, once available
+    fake.available.add(2)
+    timer.collect()
+    assert timer.results == {}
+    fake.available.add(1)
+    timer.begin('c')
+    timer.end('c')
+    assert timer.results == dict(a=1., b=2.)
+    assert fake.n_queries == 2  # queries are reused
+
+    # unsupported timer queries are a no-op
+    parser = glir.GlirParser()
+    parser._timer = False
+    parser.parse([('TIMER', 0, 'begin', 1), ('TIMER', 0, 'end', 1)])
+    assert parser.timer_results == {}
+    parser._timer = timer
+    assert parser.timer_results == dict(a=1., b=2.)
+
+
+class _FakeSyncGL(object):
+
+    def __init__(self):
+        self.n_syncs = 0
+        self.signaled = set()
+        self.deleted = []
+        self.flushes = 0
+
+    def glFenceSync(self, condition, flags):
+        self.n_syncs += 1
+        return self.n_syncs
+
+    def glFlush(self):
+        self.flushes += 1
+
+    def glClientWaitSync(self, sync, flags, timeout):
+        assert timeout == 0  # never wait
+        if sync in self.signaled:
+            return glir.GL_ALREADY_SIGNALED
+        return 37147  # GL_TIMEOUT_EXPIRED
+
+    def glDeleteSync(self, sync):
+        self.deleted.append(sync)
+
+
+def test_fences():
+    fake = _FakeSyncGL()
+    fences = glir.GlirFences(fake)
+    fences.insert('a')
+    fences.insert('b')
+    fences.insert('b')  # replaces the previous fence
+    assert fake.deleted == [2]
+    assert fake.flushes == 3
+    assert not fences.signaled('a')
+    fake.signaled.add(1)
+    assert fences.signaled('a')
+    assert fences.signaled('a')  # deleted, so unknown
+    assert fake.deleted == [2, 1]
+    assert not fences.signaled('b')
+    assert fences.signaled('c')
+
+    # unsupported fences are always signaled
+    parser = glir.GlirParser()
+    parser._fences = False
+    parser.parse([('FENCE', 0, 1)])
+    assert parser.fence_signaled(1)
+    parser._fences = fences
+    parser.parse([('FENCE', 0, 1)])
+    assert not parser.fence_signaled(1)
+    fake.signaled.add(4)
+    assert parser.fence_signaled(1)
+
+
 @requires_application()
 def test_log_parser():
     """Test GLIR log parsing"""
@@ -140,6 +140,53 @@ def test_wrappers_glir():
     reset_glir()
 
 
+def test_wrappers_state_diffing():
+    """Test that redundant GL state changes are not queued"""
+    glir = install_dummy_glir()
+    glir.state_counts.update(emitted=0, skipped=0)
+
+    gloo.set_state(blend=True, depth_test=False, line_width=2,
+                   blend_func=('src_alpha', 'one'))
+    cmds = glir._shared._commands
+    assert_equal(len(cmds), 4)
+    # Setting the same state again emits nothing
+    gloo.set_state(blend=True, depth_test=False, line_width=2,
+                   blend_func=('src_alpha', 'one'))
+    gloo.set_line_width(2.)
+    assert_equal(len(cmds), 4)
+    assert_equal(glir.state_counts, dict(emitted=4, skipped=5))
+    # Only the changes are emitted
+    gloo.set_state(blend=False, depth_test=False, line_width=3)
+    assert_equal(len(cmds), 6)
+    assert_equal(set(cmds[4:]), set([('FUNC', 'glDisable', 'blend'),
+                                     ('FUNC', 'glLineWidth', 3.)]))
+    # Presets are diffed too
+    gloo.set_state('translucent')
+    n = len(cmds)
+    gloo.set_state('translucent')
+    assert_equal(len(cmds), n)
+    # Clearing the queue or invalidating forgets the state
+    glir.clear()
+    gloo.set_state(blend=False)
+    assert_equal(len(glir.clear()), 1)
+    gloo.set_state(blend=False)
+    glir.invalidate_gl_state()
+    gloo.set_state(blend=False)
+    assert_equal(len(glir.clear()), 2)
+    # The alpha factors of the blend functions can be replaced
+    glir.blend_alpha = ('one', 'one_minus_src_alpha')
+    gloo.set_state(blend_func=('src_alpha', 'one_minus_src_alpha'))
+    glir.blend_alpha = None
+    gloo.set_state(blend_func=('src_alpha', 'one_minus_src_alpha'))
+    assert_equal(glir.clear(), [
+        ('FUNC', 'glBlendFuncSeparate', 'src_alpha', 'one_minus_src_alpha',
+         'one', 'one_minus_src_alpha'),
+        ('FUNC', 'glBlendFuncSeparate', 'src_alpha', 'one_minus_src_alpha',
+         'src_alpha', 'one_minus_src_alpha')])
+
+    reset_glir()
+
+
 def assert_cmd_raises(E, fun, *args, **kwargs):
     gloo.flush()  # no error here
     fun(*args, **kwargs)
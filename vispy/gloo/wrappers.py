@@ -114,7 +114,7 @@ class BaseGlooFunctions(object):
             individual components, or as a single tuple with four values.
         """
         x, y, w, h = args[0] if len(args) == 1 else args
-        self.glir.command('FUNC', 'glViewport', int(x), int(y), int(w), int(h))
+        self._set_gl_state('glViewport', int(x), int(y), int(w), int(h))
 
     def set_depth_range(self, near=0., far=1.):
         """Set depth values
@@ -126,7 +126,7 @@ class BaseGlooFunctions(object):
         far : float
             Far clipping plane.
         """
-        self.glir.command('FUNC', 'glDepthRange', float(near), float(far))
+        self._set_gl_state('glDepthRange', float(near), float(far))
 
     def set_front_face(self, mode='ccw'):
         """Set which faces are front-facing
@@ -136,7 +136,7 @@ class BaseGlooFunctions(object):
         mode : str
             Can be 'cw' for clockwise or 'ccw' for counter-clockwise.
         """
-        self.glir.command('FUNC', 'glFrontFace', mode)
+        self._set_gl_state('glFrontFace', mode)
 
     def set_cull_face(self, mode='back'):
         """Set front, back, or both faces to be culled
@@ -146,7 +146,7 @@ class BaseGlooFunctions(object):
         mode : str
             Culling mode. Can be "front", "back", or "front_and_back".
         """
-        self.glir.command('FUNC', 'glCullFace', mode)
+        self._set_gl_state('glCullFace', mode)
 
     def set_line_width(self, width=1.):
         """Set line width
@@ -159,7 +159,7 @@ class BaseGlooFunctions(object):
         width = float(width)
         if width < 0:
             raise RuntimeError('Cannot have width < 0')
-        self.glir.command('FUNC', 'glLineWidth', width)
+        self._set_gl_state('glLineWidth', width)
 
     def set_polygon_offset(self, factor=0., units=0.):
         """Set the scale and units used to calculate depth values
@@ -173,8 +173,8 @@ class BaseGlooFunctions(object):
             Multiplied by an implementation-specific value to create a
             constant depth offset.
         """
-        self.glir.command('FUNC', 'glPolygonOffset', float(factor),
-                          float(units))
+        self._set_gl_state('glPolygonOffset', float(factor),
+                           float(units))
 
     ##########################################################################
     # FRAGMENT/SCREEN
@@ -227,7 +227,7 @@ class BaseGlooFunctions(object):
         alpha : float | None
             Alpha to use.
         """
-        self.glir.command('FUNC', 'glClearColor', *Color(color, alpha).rgba)
+        self._set_gl_state('glClearColor', *Color(color, alpha).rgba)
 
     def set_clear_depth(self, depth=1.0):
         """Set the clear value for the depth buffer
@@ -239,7 +239,7 @@ class BaseGlooFunctions(object):
         depth : float
             The depth to use.
         """
-        self.glir.command('FUNC', 'glClearDepth', float(depth))
+        self._set_gl_state('glClearDepth', float(depth))
 
     def set_clear_stencil(self, index=0):
         """Set the clear value for the stencil buffer
@@ -251,7 +251,7 @@ class BaseGlooFunctions(object):
         index : int
             The index to use when the stencil buffer is cleared.
         """
-        self.glir.command('FUNC', 'glClearStencil', int(index))
+        self._set_gl_state('glClearStencil', int(index))
 
     # glBlendFunc(Separate), glBlendColor, glBlendEquation(Separate)
 
@@ -269,11 +269,18 @@ class BaseGlooFunctions(object):
             Source alpha factor. If None, ``srgb`` is used.
         dalpha : str
             Destination alpha factor. If None, ``drgb`` is used.
+
+        Notes
+        -----
+        If ``blend_alpha`` of the GLIR queue is set, it replaces the alpha
+        factors.
         """
         salpha = srgb if salpha is None else salpha
         dalpha = drgb if dalpha is None else dalpha
-        self.glir.command('FUNC', 'glBlendFuncSeparate',
-                          srgb, drgb, salpha, dalpha)
+        if self.glir.blend_alpha is not None:
+            salpha, dalpha = self.glir.blend_alpha
+        self._set_gl_state('glBlendFuncSeparate',
+                           srgb, drgb, salpha, dalpha)
 
     def set_blend_color(self, color):
         """Set the blend color
@@ -283,7 +290,7 @@ class BaseGlooFunctions(object):
         color : str | tuple | instance of Color
             Color to use. See vispy.color.Color for options.
         """
-        self.glir.command('FUNC', 'glBlendColor', *Color(color).rgba)
+        self._set_gl_state('glBlendColor', *Color(color).rgba)
 
     def set_blend_equation(self, mode_rgb, mode_alpha=None):
         """Specify the equation for RGB and alpha blending
@@ -300,8 +307,8 @@ class BaseGlooFunctions(object):
         See ``set_blend_equation`` for valid modes.
         """
         mode_alpha = mode_rgb if mode_alpha is None else mode_alpha
-        self.glir.command('FUNC', 'glBlendEquationSeparate',
-                          mode_rgb, mode_alpha)
+        self._set_gl_state('glBlendEquationSeparate',
+                           mode_rgb, mode_alpha)
 
     # glScissor, glStencilFunc(Separate), glStencilMask(Separate),
     # glStencilOp(Separate),
@@ -320,7 +327,7 @@ class BaseGlooFunctions(object):
         h : int
             The height of the box.
         """
-        self.glir.command('FUNC', 'glScissor', int(x), int(y), int(w), int(h))
+        self._set_gl_state('glScissor', int(x), int(y), int(w), int(h))
 
     def set_stencil_func(self, func='always', ref=0, mask=8,
                          face='front_and_back'):
@@ -385,7 +392,7 @@ class BaseGlooFunctions(object):
             The depth comparison function. Must be one of 'never', 'less',
             'equal', 'lequal', 'greater', 'gequal', 'notequal', or 'always'.
         """
-        self.glir.command('FUNC', 'glDepthFunc', func)
+        self._set_gl_state('glDepthFunc', func)
 
     def set_depth_mask(self, flag):
         """Toggle writing into the depth buffer
@@ -395,7 +402,7 @@ class BaseGlooFunctions(object):
         flag : bool
             Whether depth writing should be enabled.
         """
-        self.glir.command('FUNC', 'glDepthMask', bool(flag))
+        self._set_gl_state('glDepthMask', bool(flag))
 
     def set_color_mask(self, red, green, blue, alpha):
         """Toggle writing of frame buffer color components
@@ -411,8 +418,8 @@ class BaseGlooFunctions(object):
         alpha : bool
             Alpha toggle.
         """
-        self.glir.command('FUNC', 'glColorMask', bool(red), bool(green),
-                          bool(blue), bool(alpha))
+        self._set_gl_state('glColorMask', bool(red), bool(green),
+                           bool(blue), bool(alpha))
 
     def set_sample_coverage(self, value=1.0, invert=False):
         """Specify multisample coverage parameters
@@ -424,8 +431,8 @@ class BaseGlooFunctions(object):
         invert : bool
             Specify if the coverage masks should be inverted.
         """
-        self.glir.command('FUNC', 'glSampleCoverage', float(value),
-                          bool(invert))
+        self._set_gl_state('glSampleCoverage', float(value),
+                           bool(invert))
 
     ##########################################################################
     # STATE
@@ -444,6 +451,25 @@ class BaseGlooFunctions(object):
         """
         return deepcopy(GL_PRESETS)
 
+    def _set_gl_state(self, funcname, *args):
+        """Queue a GL function that sets part of the fixed-function state,
+        unless the context is known to be in that state already.
+        """
+        glir = self.glir
+        if funcname in ('glEnable', 'glDisable'):
+            key = args[0]
+            value = funcname
+        else:
+            key = (funcname, args[0]) if funcname == 'glHint' else funcname
+            value = args
+        state = glir.gl_state
+        if state.get(key) == value:
+            glir.state_counts['skipped'] += 1
+            return
+        state[key] = value
+        glir.state_counts['emitted'] += 1
+        glir.command('FUNC', funcname, *args)
+
     def set_state(self, preset=None, **kwargs):
         """Set the OpenGL rendering state, optionally using a preset.
 
@@ -496,7 +522,8 @@ class BaseGlooFunctions(object):
         as ``set_clear_color``, with some more informative docstrings
         about those particular functions.
         """
-        kwargs = deepcopy(kwargs)
+        # only the dict is modified, the values can be shared
+        kwargs = dict(kwargs)
 
         # Load preset, if supplied
         if preset is not None:
@@ -511,20 +538,20 @@ class BaseGlooFunctions(object):
             cull_face = kwargs.pop('cull_face')
             if isinstance(cull_face, bool):
                 funcname = 'glEnable' if cull_face else 'glDisable'
-                self.glir.command('FUNC', funcname, 'cull_face')
+                self._set_gl_state(funcname, 'cull_face')
             else:
-                self.glir.command('FUNC', 'glEnable', 'cull_face')
+                self._set_gl_state('glEnable', 'cull_face')
                 self.set_cull_face(*_to_args(cull_face))
 
         # Line width needs some special care ...
         if 'line_width' in kwargs:
             line_width = kwargs.pop('line_width')
-            self.glir.command('FUNC', 'glLineWidth', line_width)
+            self._set_gl_state('glLineWidth', line_width)
         if 'line_smooth' in kwargs:
             line_smooth = kwargs.pop('line_smooth')
             funcname = 'glEnable' if line_smooth else 'glDisable'
             line_smooth_enum_value = 2848  # int(GL.GL_LINE_SMOOTH)
-            self.glir.command('FUNC', funcname, line_smooth_enum_value)
+            self._set_gl_state(funcname, line_smooth_enum_value)
 
         # Iterate over kwargs
         for key, val in kwargs.items():
@@ -539,7 +566,7 @@ class BaseGlooFunctions(object):
             else:
                 # Enable / disable
                 funcname = 'glEnable' if val else 'glDisable'
-                self.glir.command('FUNC', funcname, key)
+                self._set_gl_state(funcname, key)
 
     #
     # glFinish, glFlush, glReadPixels, glHint
@@ -585,7 +612,7 @@ class BaseGlooFunctions(object):
         """
         if not all(isinstance(tm, str) for tm in (target, mode)):
             raise TypeError('target and mode must both be strings')
-        self.glir.command('FUNC', 'glHint', target, mode)
+        self._set_gl_state('glHint', target, mode)
 
 
 class GlooFunctions(BaseGlooFunctions):
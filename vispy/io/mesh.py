@@ -26,7 +26,7 @@ def read_mesh(fname):
         Vertices.
     faces : array | None
         Triangle face definitions.
-    normals : array
+    normals : array | None
         Normals for the mesh.
     texcoords : array | None
         Texture coordinates.
@@ -39,8 +39,8 @@ def read_mesh(fname):
     if fmt in ('.obj'):
         return WavefrontReader.read(fname)
     elif fmt in ('.stl'):
-        file_obj = open(fname, mode='rb')
-        mesh = load_stl(file_obj)
+        with open(fname, mode='rb') as file_obj:
+            mesh = load_stl(file_obj)
         vertices = mesh['vertices']
         faces = mesh['faces']
         normals = mesh['face_normals']
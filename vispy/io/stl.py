@@ -6,6 +6,8 @@
 # See https://github.com/mikedh/trimesh/blob/master/LICENSE.md for
 # the license.
 
+import io
+
 import numpy as np
 
 
@@ -23,7 +25,16 @@ _stl_dtype_header = np.dtype([('header', np.void, 80),
                               ('face_count', np.int32)])
 
 
-def load_stl(file_obj, file_type=None):
+# file objects that can be memory-mapped (unlike e.g. GzipFile, which does
+# have a fileno)
+_mappable_files = (io.FileIO, io.BufferedReader, io.BufferedRandom)
+
+# constants to hash quantized vertex coordinates
+_hash_mult = np.uint64(0x9E3779B97F4A7C15)
+_hash_mix = np.uint64(0xBF58476D1CE4E5B9)
+
+
+def load_stl(file_obj, file_type=None, weld=False, tolerance=None):
     """
     Load an STL file from a file object.
 
@@ -31,6 +42,8 @@ def load_stl(file_obj, file_type=None):
     ----------
     file_obj: open file- like object
     file_type: not used
+    weld: bool, merge identical vertices (see weld_vertices)
+    tolerance: None or float, the tolerance used when welding vertices
 
     Returns
     -------
@@ -46,14 +59,73 @@ def load_stl(file_obj, file_type=None):
         # if that is true, it is almost certainly a binary STL file
         # if the header doesn't match the file length a HeaderError will be
         # raised
-        return load_stl_binary(file_obj)
+        result = load_stl_binary(file_obj)
     except HeaderError:
         # move the file back to where it was initially
         file_obj.seek(file_pos)
         # try to load the file as an ASCII STL
         # if the header doesn't match the file length a HeaderError will be
         # raised
-        return load_stl_ascii(file_obj)
+        result = load_stl_ascii(file_obj)
+    if weld:
+        result['vertices'], result['faces'] = weld_vertices(
+            result['vertices'], result['faces'], tolerance)
+    return result
+
+
+def weld_vertices(vertices, faces, tolerance=None):
+    """
+    Merge the vertices that share the same position.
+
+    STL files store three private vertices for each triangle. Welding them
+    makes the triangles share vertices, so that e.g. vertex normals can be
+    computed over neighbouring faces.
+
+    Parameters
+    ----------
+    vertices: (n,3) float, vertices
+    faces: (m,3) int, indexes of vertices
+    tolerance: None or float, if None only vertices with exactly the same
+               coordinates are merged, otherwise the coordinates are
+               quantized to multiples of tolerance first
+
+    Returns
+    -------
+    vertices: (p,3) float, unique vertices
+    faces: (m,3) int, indexes of the unique vertices
+    """
+    vertices = np.asarray(vertices)
+    if len(vertices) == 0:
+        return vertices, faces
+    if tolerance is None:
+        # compare the bits of the coordinates (adding 0 turns -0 into 0)
+        coords = np.ascontiguousarray(vertices + vertices.dtype.type(0))
+        keys = coords.view('u%d' % coords.dtype.itemsize)
+    else:
+        keys = np.floor(vertices / float(tolerance) + 0.5).astype(np.int64)
+    keys = keys.astype(np.uint64)
+
+    # group the vertices on a hash of the keys
+    hashes = keys[:, 0].copy()
+    for j in range(1, keys.shape[1]):
+        hashes *= _hash_mult
+        hashes += keys[:, j]
+    hashes ^= hashes >> np.uint64(29)
+    hashes *= _hash_mix
+    hashes ^= hashes >> np.uint64(32)
+    order = np.argsort(hashes)
+    hashes = hashes[order]
+    is_first = np.ones(len(keys), bool)
+    is_first[1:] = hashes[1:] != hashes[:-1]
+    inverse = np.empty(len(keys), np.int64)
+    inverse[order] = np.cumsum(is_first) - 1
+    if not (keys[order[is_first]][inverse] == keys).all():
+        # hash collision: also split the groups where the keys differ,
+        # which can only prevent some vertices from merging
+        sorted_keys = keys[order]
+        is_first[1:] |= (sorted_keys[1:] != sorted_keys[:-1]).any(axis=1)
+        inverse[order] = np.cumsum(is_first) - 1
+    return vertices[order[is_first]], inverse[faces]
 
 
 def load_stl_binary(file_obj):
@@ -78,7 +150,7 @@ def load_stl_binary(file_obj):
     if len(header_data) < header_length:
         raise HeaderError('Binary STL file not long enough to contain header!')
 
-    header = np.fromstring(header_data, dtype=_stl_dtype_header)
+    header = np.frombuffer(header_data, dtype=_stl_dtype_header)
 
     # now we check the length from the header versus the length of the file
     # data_start should always be position 84, but hard coding that felt ugly
@@ -106,12 +178,21 @@ def load_stl_binary(file_obj):
 
     # all of our vertices will be loaded in order due to the STL format,
     # so faces are just sequential indices reshaped.
-    faces = np.arange(header['face_count'] * 3).reshape((-1, 3))
-    blob = np.fromstring(file_obj.read(), dtype=_stl_dtype)
-
-    result = {'vertices': blob['vertices'].reshape((-1, 3)),
-              'face_normals': blob['normals'].reshape((-1, 3)),
+    face_count = int(header['face_count'][0])
+    faces = np.arange(face_count * 3).reshape((-1, 3))
+    if isinstance(file_obj, _mappable_files) and face_count > 0:
+        # map the data section of the file, rather than reading it
+        blob = np.memmap(file_obj, dtype=_stl_dtype, mode='r',
+                         offset=data_start, shape=(face_count,))
+    else:
+        # other file-like objects, e.g. BytesIO or GzipFile
+        blob = np.frombuffer(file_obj.read(), dtype=_stl_dtype)
+
+    # copy the fields out of the interleaved records
+    result = {'vertices': np.array(blob['vertices']).reshape((-1, 3)),
+              'face_normals': np.array(blob['normals']).reshape((-1, 3)),
               'faces': faces}
+    file_obj.seek(data_end)
     return result
 
 
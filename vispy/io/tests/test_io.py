@@ -1,12 +1,16 @@
 # -*- coding: utf-8 -*-
 # Copyright (c) Vispy Development Team. All Rights Reserved.
 # Distributed under the (new) BSD License. See LICENSE.txt for more info.
+import io
 import numpy as np
 from os import path as op
 from numpy.testing import assert_allclose, assert_array_equal
 
 from vispy.io import write_mesh, read_mesh, load_data_file
-from vispy.geometry import _fast_cross_3d
+from vispy.io.wavefront import WavefrontReader
+from vispy.io.stl import (load_stl, weld_vertices, _stl_dtype,
+                          _stl_dtype_header)
+from vispy.geometry import _fast_cross_3d, create_sphere
 from vispy.util import _TempDir
 from vispy.testing import (run_tests_if_main, assert_equal, assert_raises,
                            requires_ssl)
@@ -64,6 +68,86 @@ def test_wavefront_non_triangular():
     assert lines[-2].startswith('f 2 1 8 7 6 4')
 
 
+def test_wavefront_bulk():
+    """Test that the bulk wavefront reader matches the line reader"""
+    mesh = create_sphere(10, 10)
+    vertices, faces = mesh.get_vertices(), mesh.get_faces()
+    normals, texcoords = mesh.get_vertex_normals(), vertices[:, :2]
+    fname_out = op.join(temp_dir, 'temp.obj')
+    for nn, tc in ((None, None), (normals, None), (None, texcoords),
+                   (normals, texcoords)):
+        write_mesh(fname_out, vertices, faces, nn, tc, overwrite=True)
+        mesh1 = WavefrontReader.read(fname_out, bulk=False)
+        mesh2 = WavefrontReader.read_bulk(fname_out)
+        for m1, m2 in zip(mesh1, mesh2):
+            if m1 is None:
+                assert_equal(m2, None)
+            else:
+                assert_array_equal(m1, m2)
+                assert_equal(m1.dtype, m2.dtype)
+
+    # relative indices, quads, extra values and ignored lines
+    with open(fname_out, 'w') as fid:
+        fid.write('# comment\r\ng group\r\nv 0 0 0\r\nv 1 0 0\r\n'
+                  'v 1 1 0 1\r\nv 0 1 0\r\nf -4 -3 -2 -1\r\n'
+                  'v 2 2 2\r\nf 1 2 -1 4')
+    vertices, faces, normals, texcoords = read_mesh(fname_out)
+    assert_array_equal(vertices[faces], [[[0, 0, 0], [1, 0, 0], [1, 1, 0],
+                                          [0, 1, 0]],
+                                         [[0, 0, 0], [1, 0, 0], [2, 2, 2],
+                                          [0, 1, 0]]])
+    assert_equal(normals.shape, (5, 3))
+    assert_equal(texcoords, None)
+
+    # mixed face formats are left to the line reader
+    with open(fname_out, 'w') as fid:
+        fid.write('v 0 0 0\nv 1 0 0\nv 1 1 0\nvt 0 0\nf 1/1 2 3\n')
+    assert_equal(WavefrontReader.read_bulk(fname_out), None)
+    vertices, faces, normals, texcoords = read_mesh(fname_out)
+    assert_array_equal(faces, [[0, 1, 2]])
+    assert_equal(texcoords, None)
+
+
+def test_stl():
+    """Test binary STL reading and vertex welding"""
+    mesh = create_sphere(10, 10)
+    vertices, faces = mesh.get_vertices(), mesh.get_faces()
+    records = np.zeros(len(faces), _stl_dtype)
+    records['vertices'] = vertices[faces]
+    records['normals'] = mesh.get_face_normals()
+    header = np.zeros(1, _stl_dtype_header)
+    header['face_count'] = len(faces)
+    fname_out = op.join(temp_dir, 'temp.stl')
+    with open(fname_out, 'wb') as fid:
+        fid.write(header.tobytes() + records.tobytes())
+
+    # memory-mapped file and file-like object give the same result
+    with open(fname_out, 'rb') as fid:
+        mesh1 = load_stl(fid)
+    with open(fname_out, 'rb') as fid:
+        mesh2 = load_stl(io.BytesIO(fid.read()))
+    for key in ('vertices', 'faces', 'face_normals'):
+        assert_array_equal(mesh1[key], mesh2[key])
+    assert_array_equal(mesh1['vertices'], vertices[faces].reshape(-1, 3))
+    assert_array_equal(mesh1['face_normals'], mesh.get_face_normals())
+    rr, tris, nn, tc = read_mesh(fname_out)
+    assert_array_equal(rr, mesh1['vertices'])
+    assert_equal(tc, None)
+
+    # welding recovers the shared vertices
+    with open(fname_out, 'rb') as fid:
+        welded = load_stl(fid, weld=True)
+    assert_equal(len(welded['vertices']), len(vertices))
+    assert_array_equal(welded['vertices'][welded['faces']], vertices[faces])
+    jitter = np.random.RandomState(0).rand(*mesh1['vertices'].shape) * 1e-6
+    rr, tris = weld_vertices(mesh1['vertices'] + jitter, mesh1['faces'],
+                             tolerance=1e-3)
+    assert_equal(len(rr), len(vertices))
+    assert_allclose(rr[tris], vertices[faces], atol=1e-5)
+    rr, tris = weld_vertices(mesh1['vertices'] + jitter, mesh1['faces'])
+    assert_equal(len(rr), len(mesh1['vertices']))
+
+
 def test_meshio():
     """Test meshio i/o"""
     vertices = np.array([[0.0, 0.0, 0.0],
@@ -18,6 +18,7 @@ The classes are written with compatibility of Python3 in mind.
 
 import numpy as np
 import time
+import warnings
 from gzip import GzipFile
 from os import path as op
 
@@ -50,18 +51,30 @@ class WavefrontReader(object):
         self._facemap = {}
 
     @classmethod
-    def read(cls, fname):
+    def read(cls, fname, bulk=True):
         """Entry point for reading OBJ files.
 
         Parameters
         ----------
         fname : str
             The name of the file to read.
+        bulk : bool
+            If True (default), parse the whole file at once using numpy
+            (see :meth:`read_bulk`), and only read it line by line if it
+            uses features that the bulk parser does not handle.
 
         """
         # Open file
         fmt = op.splitext(fname)[1].lower()
         assert fmt in ('.obj', '.gz')
+        if bulk:
+            t0 = time.time()
+            mesh = cls.read_bulk(fname)
+            if mesh is not None:
+                logger.debug('reading mesh took ' +
+                             str(time.time() - t0) +
+                             ' seconds')
+                return mesh
         opener = open if fmt == '.obj' else GzipFile
         with opener(fname, 'rb') as f:
             try:
@@ -79,6 +92,40 @@ class WavefrontReader(object):
                      ' seconds')
         return mesh
 
+    @classmethod
+    def read_bulk(cls, fname):
+        """Read an OBJ file at once, using numpy to parse the data.
+
+        The file is memory-mapped (or decompressed, for '.gz' files), the
+        lines are classified and the ``v``, ``vt``, ``vn`` and ``f`` lines
+        are parsed in blocks. The vertex/texcoord/normal index sets of the
+        faces are de-duplicated with a vectorized sort.
+
+        Parameters
+        ----------
+        fname : str
+            The name of the file to read.
+
+        Returns
+        -------
+        mesh : tuple | None
+            The vertices, faces, normals and texcoords, as returned by
+            :func:`vispy.io.read_mesh`, or None if the file uses features
+            that are only supported when reading it line by line, such as
+            a different number of values per vertex or mixed face formats.
+        """
+        if op.splitext(fname)[1].lower() == '.gz':
+            with GzipFile(fname, 'rb') as f:
+                buf = np.frombuffer(f.read(), np.uint8)
+        elif op.getsize(fname) == 0:
+            buf = np.zeros(0, np.uint8)
+        else:
+            buf = np.memmap(fname, np.uint8, 'r')
+        try:
+            return _parse_obj(buf)
+        finally:
+            del buf
+
     def readLine(self):
         """The method that reads a line and processes it."""
         # Read line
@@ -211,6 +258,173 @@ class WavefrontReader(object):
         return self._vertices, self._faces, self._normals, self._texcords
 
 
+# Prefixes of lines that are ignored without notice
+_IGNORED_PREFIXES = (b'#', b'g ', b's ', b'o ', b'usemtl ')
+
+
+def _parse_obj(buf):
+    """Parse the bytes of an OBJ file, see WavefrontReader.read_bulk."""
+    n = len(buf)
+    newlines = np.flatnonzero(buf == ord('\n'))
+    starts = np.concatenate([[0], newlines + 1])
+    ends = np.concatenate([newlines + 1, [n]])
+    keep = starts < ends
+    starts, ends = starts[keep], ends[keep]
+
+    # Classify the lines by their first bytes
+    def byte(offset):
+        return buf[np.minimum(starts + offset, max(n - 1, 0))]
+    b0, b1, b2 = byte(0), byte(1), byte(2)
+    ws1 = (b1 == ord(' ')) | (b1 == ord('\t'))
+    ws2 = (b2 == ord(' ')) | (b2 == ord('\t'))
+    kinds = np.zeros(len(starts), np.int8)
+    is_v = b0 == ord('v')
+    kinds[is_v & ws1] = 1
+    kinds[is_v & (b1 == ord('t')) & ws2] = 2
+    kinds[is_v & (b1 == ord('n')) & ws2] = 3
+    kinds[(b0 == ord('f')) & ws1] = 4
+
+    # Handle the other lines like readLine does
+    for i in np.flatnonzero(kinds == 0):
+        line = bytes(buf[starts[i]:ends[i]]).strip()
+        if not line or line.startswith(_IGNORED_PREFIXES):
+            continue
+        if line.split()[0] in (b'v', b'vt', b'vn', b'f'):
+            return None  # e.g. indented lines
+        if line.startswith(b'mtllib '):
+            logger.warning('Notice reading .OBJ: material properties are '
+                           'ignored.')
+        else:
+            logger.warning('Notice reading .OBJ: ignoring %s command.'
+                           % line.decode('ascii', 'ignore'))
+
+    def block(kind):
+        """Get the bytes of all lines of a kind, and their line indices"""
+        lines = np.flatnonzero(kinds == kind)
+        if len(lines) == 0:
+            return b'', lines
+        # join runs of consecutive lines
+        breaks = np.flatnonzero(np.diff(lines) != 1) + 1
+        first = lines[np.concatenate([[0], breaks])]
+        last = lines[np.concatenate([breaks - 1, [len(lines) - 1]])]
+        text = b''.join(bytes(buf[starts[a]:ends[b]])
+                        for a, b in zip(first, last))
+        if not text.endswith(b'\n'):
+            text += b'\n'
+        return text, lines
+
+    def parse(text, prefix, dtype=np.float64, sep=None):
+        """Parse the values of a block, and count the values per line"""
+        # number of values per line, excluding the prefix
+        counts = _count_tokens(np.frombuffer(text, np.uint8)) - 1
+        text = text.replace(prefix, b' ' * len(prefix))
+        if sep is not None:
+            text = text.replace(sep, b' ')
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', DeprecationWarning)
+            try:
+                values = np.fromstring(text, dtype, sep=' ')
+            except (ValueError, DeprecationWarning):
+                return None, counts
+        return values, counts
+
+    result = []
+    for kind, prefix in ((1, b'v'), (2, b'vt'), (3, b'vn')):
+        text, lines = block(kind)
+        if len(lines) == 0:
+            result.append(None)
+            continue
+        values, counts = parse(text, prefix)
+        if values is None or len(values) != counts.sum():
+            return None
+        # like readTuple, use the first three values of each line
+        n_values = min(counts.min(), 3)
+        if n_values == 0 or (n_values < 3 and counts.max() > n_values):
+            return None  # ragged
+        offsets = np.cumsum(counts) - counts
+        result.append(values[offsets[:, None] + np.arange(n_values)])
+    v, vt, vn = result
+    if v is None:
+        v = np.zeros((0, 3))
+
+    # Parse the faces
+    text, lines = block(4)
+    if len(lines) == 0:
+        # a point cloud, without normals
+        return v.astype('float32'), None, None, None
+    n_slash, n_double = text.count(b'/'), text.count(b'//')
+    values, counts = parse(text, b'f', np.int64, b'/')
+    n_corners = counts[0]
+    if (counts != n_corners).any():
+        raise RuntimeError(
+            'Vispy requires that all faces are either triangles or quads.')
+    if values is None:
+        return None
+    n_total = len(lines) * n_corners
+    if n_slash == 0:
+        fields = ('v',)
+    elif n_slash == n_total and n_double == 0:
+        fields = ('v', 't')
+    elif n_slash == 2 * n_total and n_double == 0:
+        fields = ('v', 't', 'n')
+    elif n_slash == 2 * n_total and n_double == n_total:
+        fields = ('v', 'n')
+    else:
+        return None  # mixed face formats
+    if len(values) != n_total * len(fields):
+        return None
+    indices = values.reshape(n_total, len(fields))
+
+    # Resolve 1-based and relative indices, which refer to the number of
+    # elements defined before the face
+    face_lines = np.repeat(lines, n_corners)
+    for j, field in enumerate(fields):
+        kind = dict(v=1, t=2, n=3)[field]
+        col = indices[:, j]
+        neg = col < 0
+        if neg.any():
+            n_before = np.cumsum(kinds == kind)[face_lines[neg]]
+            col[neg] += n_before
+        col[~neg] -= 1
+        ref = dict(v=v, t=vt, n=vn)[field]
+        if ref is None or col.min() < 0 or col.max() >= len(ref):
+            raise IndexError('Face refers to a non-existing element.')
+
+    # De-duplicate the index sets, in order of first appearance
+    order = np.lexsort(indices.T[::-1])
+    sorted_ = indices[order]
+    is_first = np.ones(n_total, bool)
+    is_first[1:] = (sorted_[1:] != sorted_[:-1]).any(axis=1)
+    first = order[is_first]
+    rank = np.empty(len(first), np.int64)
+    rank[np.argsort(first)] = np.arange(len(first))
+    faces = np.empty(n_total, np.uint32)
+    faces[order] = rank[np.cumsum(is_first) - 1]
+    unique = indices[np.sort(first)]
+
+    vertices = v[unique[:, 0]].astype('float32')
+    faces = faces.reshape(len(lines), n_corners)
+    texcoords = normals = None
+    if 't' in fields:
+        texcoords = vt[unique[:, fields.index('t')]].astype('float32')
+    if 'n' in fields:
+        normals = vn[unique[:, fields.index('n')]].astype('float32')
+    else:
+        normals = _calculate_normals(vertices, faces)
+    return vertices, faces, normals, texcoords
+
+
+def _count_tokens(arr):
+    """Count the whitespace-separated tokens on each line of a byte array"""
+    nonspace = ((arr != ord(' ')) & (arr != ord('\t')) &
+                (arr != ord('\r')) & (arr != ord('\n')))
+    token_starts = np.flatnonzero(nonspace[1:] & ~nonspace[:-1]) + 1
+    if len(arr) and nonspace[0]:
+        token_starts = np.concatenate([[0], token_starts])
+    line_ends = np.flatnonzero(arr == ord('\n'))
+    return np.diff(np.searchsorted(token_starts, line_ends), prepend=0)
+
+
 class WavefrontWriter(object):
 
     def __init__(self, f):
@@ -35,6 +35,7 @@ from .cameras import *  # noqa
 from ..visuals.transforms import *  # noqa
 from .widgets import *  # noqa
 from .canvas import SceneCanvas  # noqa
+from .render_pool import RenderPool, build_scene  # noqa
 from . import visuals  # noqa
 from ..visuals import transforms  # noqa
 from ..visuals import filters  # noqa
@@ -450,6 +450,9 @@ class BaseCamera(Node):
                 self.set_default_state()
             # Do the actual update
             self._update_transform()
+            canvas = self._viewbox.canvas
+            if canvas is not None and hasattr(canvas, 'notify_interaction'):
+                canvas.notify_interaction()
 
     @property
     def pre_transform(self):
@@ -5,10 +5,13 @@
 from __future__ import division
 
 import weakref
+from time import perf_counter
+
 import numpy as np
 
 from .. import gloo
 from .. import app
+from ..app.canvas import _read_fbo
 from .visuals import VisualNode
 from ..visuals.transforms import TransformSystem
 from ..color import Color
@@ -16,7 +19,7 @@ from ..util import logger, Frozen
 from ..util.profiler import Profiler
 from .subscene import SubScene
 from .events import SceneMouseEvent
-from .widgets import Widget
+from .widgets import Widget, ViewBox
 
 
 class SceneCanvas(app.Canvas, Frozen):
@@ -126,6 +129,24 @@ class SceneCanvas(app.Canvas, Frozen):
         # A default widget that follows the shape of the canvas
         self._central_widget = None
         self._draw_order = weakref.WeakKeyDictionary()
+        self._sort_visuals = False
+        self._fuse_transforms = False
+        self._metrics = None
+        self._measure_gpu_time = False
+        self._gpu_timed_nodes = weakref.WeakValueDictionary()
+        self._target_frame_time = None
+        self._interaction_timeout = 0.25
+        self._interaction_timer = None
+        self._last_interaction = None
+        self._low_quality = False
+        self._frame_time = 0.
+        self._layers = weakref.WeakKeyDictionary()
+        self._layer_node = None
+        self._layer_program = None
+        self._partial_redraw = False
+        self._damage = None
+        self._redraw_fbo = None
+        self._redraw_region = None
         self._drawing = False
         self._update_pending = False
         self._fb_stack = []
@@ -189,17 +210,302 @@ class SceneCanvas(app.Canvas, Frozen):
         if hasattr(self, '_backend'):
             self.update()
 
+    @property
+    def sort_visuals(self):
+        """Whether visuals are sorted to reduce GL state changes when drawing
+
+        When False (default), visuals are drawn in the order of the scene
+        graph, with siblings sorted by their ``order``. When True, visuals
+        that are consecutive in that order and share the same ``order``
+        values along their path from the root are regarded as a bucket
+        that may be reordered: the opaque visuals of a bucket are sorted by
+        shader program, GL state and textures, and the translucent visuals
+        are drawn after them, from back to front. Visuals that must be
+        drawn in a particular order should be given different ``order``
+        values.
+        """
+        return self._sort_visuals
+
+    @sort_visuals.setter
+    def sort_visuals(self, sort):
+        self._sort_visuals = bool(sort)
+        self.update()
+
+    @property
+    def fuse_transforms(self):
+        """Whether visuals combine linear transforms in their shaders
+
+        When True, the runs of consecutive linear transforms
+        (``STTransform``, ``MatrixTransform``, ``NullTransform``) in the
+        transforms of each visual are computed on the CPU into a single
+        matrix, which is passed to the shaders as one uniform (see
+        ``ChainTransform.fuse_linear``). Moving the camera or changing
+        these transforms then updates a single uniform per visual, and the
+        shaders are only rebuilt when non-linear transforms are added or
+        removed. Default is False.
+        """
+        return self._fuse_transforms
+
+    @fuse_transforms.setter
+    def fuse_transforms(self, fuse):
+        self._fuse_transforms = fuse = bool(fuse)
+        nodes = [self.scene]
+        while nodes:
+            node = nodes.pop()
+            node.transforms.fuse_linear = fuse
+            nodes.extend(node.children)
+        self.update()
+
+    @property
+    def metrics(self):
+        """The :class:`~vispy.util.metrics.FrameMetrics` collector that
+        records the metrics of each frame, or None (default)
+
+        While a collector is set, the time spent preparing and drawing each
+        visual, the GLIR commands and uploads, the shader builds and the GL
+        state changes of each frame drawn by the canvas are recorded.
+        """
+        return self._metrics
+
+    @metrics.setter
+    def metrics(self, metrics):
+        self._metrics = metrics
+        self.context.glir.metrics = metrics
+        parser = self.context.shared.parser
+        if parser is not None and hasattr(parser, 'metrics'):
+            parser.metrics = metrics
+
+    @property
+    def measure_gpu_time(self):
+        """Whether to measure the GPU time of drawing each visual
+
+        When True, the draw commands of each visual are wrapped in GL timer
+        queries, if the GL implementation supports them (GL 3.3 or the
+        ARB_timer_query extension, and PyOpenGL). The results are collected
+        without stalling the GPU, and become available in `gpu_times` a few
+        frames later.
+        """
+        return self._measure_gpu_time
+
+    @measure_gpu_time.setter
+    def measure_gpu_time(self, measure):
+        self._measure_gpu_time = bool(measure)
+        self.update()
+
+    @property
+    def gpu_times(self):
+        """Dict with the most recently measured GPU time in milliseconds of
+        each visual (see `measure_gpu_time`)
+
+        The dict is empty if GPU times are not measured or if timer queries
+        are not supported.
+        """
+        results = getattr(self.context.shared.parser, 'timer_results', {})
+        gpu_times = {}
+        for key, ms in results.items():
+            node = self._gpu_timed_nodes.get(key)
+            if node is not None:
+                gpu_times[node] = ms
+        return gpu_times
+
+    @property
+    def target_frame_time(self):
+        """The frame time in seconds above which visuals are drawn at low
+        quality while the scene is interacted with, or None (default) to
+        always draw at full quality
+
+        When set, the canvas measures the time it takes to draw the scene
+        at full quality, waiting for the GPU to finish (with ``glFinish``).
+        While the scene is interacted with (see
+        `notify_interaction`) and that time exceeds the target, the
+        visuals are drawn with cheaper settings (see
+        `Visual.low_quality`). The scene is redrawn at full quality once
+        there has been no interaction for ``interaction_timeout`` seconds.
+        """
+        return self._target_frame_time
+
+    @target_frame_time.setter
+    def target_frame_time(self, target):
+        self._target_frame_time = None if target is None else float(target)
+        self.update()
+
+    @property
+    def interaction_timeout(self):
+        """The time in seconds after the last interaction at which the scene
+        is redrawn at full quality (see `target_frame_time`)
+        """
+        return self._interaction_timeout
+
+    @interaction_timeout.setter
+    def interaction_timeout(self, timeout):
+        self._interaction_timeout = float(timeout)
+        if self._interaction_timer is not None:
+            self._interaction_timer.interval = self._interaction_timeout
+
+    def notify_interaction(self):
+        """Notify the canvas that the scene is being interacted with
+
+        This is called by the cameras when their view changes. It has no
+        effect unless `target_frame_time` is set.
+        """
+        if self._target_frame_time is None:
+            return
+        self._last_interaction = perf_counter()
+        if self._interaction_timer is None:
+            self._interaction_timer = app.Timer(
+                self._interaction_timeout, connect=self._check_interaction,
+                app=self.app)
+        if not self._interaction_timer.running:
+            self._interaction_timer.start()
+
+    @property
+    def _interacting(self):
+        return (self._last_interaction is not None and
+                perf_counter() - self._last_interaction <
+                self._interaction_timeout)
+
+    def _check_interaction(self, event=None):
+        """Redraw at full quality once the interaction has stopped"""
+        if self._interacting:
+            return
+        self._interaction_timer.stop()
+        self._last_interaction = None
+        if self._low_quality:
+            self.update()
+
+    def _update_quality(self):
+        """Switch the visuals to low or full quality for the next frame"""
+        target = self._target_frame_time
+        low = (target is not None and self._interacting and
+               (self._low_quality or self._frame_time > target))
+        if low == self._low_quality:
+            return
+        self._low_quality = low
+        for node, start in self._generate_draw_order():
+            if start and isinstance(node, VisualNode):
+                node.low_quality = low
+
+    @property
+    def partial_redraw(self):
+        """Whether to redraw only the parts of the canvas that changed
+
+        When True, the scene is drawn into an offscreen framebuffer that is
+        copied to the canvas on each draw. When nodes inside the scene of
+        a `ViewBox` are updated (including by its camera), only the
+        rectangles of those view boxes are cleared and redrawn, using the
+        scissor test, and other view boxes are skipped. Any other update,
+        e.g. of a widget or by calling ``update()`` without a node, redraws
+        the whole canvas.
+        """
+        return self._partial_redraw
+
+    @partial_redraw.setter
+    def partial_redraw(self, partial):
+        self._partial_redraw = bool(partial)
+        self._damage = None
+        if not self._partial_redraw:
+            self._redraw_fbo = None
+        self.update()
+
+    def _add_damage(self, node):
+        """Record the region that needs to be redrawn after a node update"""
+        if self._damage is None:
+            return  # the whole canvas will be redrawn
+        viewbox = None if node is None else _scene_viewbox(node)
+        if viewbox is None:
+            self._damage = None
+        else:
+            self._damage[viewbox] = None
+
+    def _draw_partial(self):
+        """Draw the damaged regions into the offscreen framebuffer and copy
+        it to the canvas
+        """
+        size = tuple(self.physical_size)
+        damage, self._damage = self._damage, {}
+        if self._redraw_fbo is None or \
+                self._redraw_fbo.color_buffer.shape[1::-1] != size:
+            texture = gloo.Texture2D(shape=size[::-1] + (4,),
+                                     interpolation='nearest')
+            self._redraw_fbo = gloo.FrameBuffer(
+                color=texture, depth=gloo.RenderBuffer(size[::-1]))
+            damage = None
+        if damage is not None:
+            regions = [self._viewbox_region(vb) for vb in damage]
+            if None in regions:
+                damage = None
+
+        self.push_fbo(self._redraw_fbo, (0, 0), self.size)
+        try:
+            if damage is None:
+                self._draw_scene()
+            else:
+                for region in regions:
+                    self._draw_region(region)
+        finally:
+            self.pop_fbo()
+        self._composite_texture(self._redraw_fbo.color_buffer, size,
+                                blend=False)
+
+    def _draw_region(self, region):
+        """Redraw the scene within a (x, y, w, h) region of the framebuffer"""
+        self.context.set_scissor(*region)
+        self.context.set_state(scissor_test=True)
+        self._redraw_region = region
+        try:
+            self.context.clear(color=self._bgcolor, depth=True)
+            self.draw_visual(self.scene)
+        finally:
+            self._redraw_region = None
+            self.context.set_state(scissor_test=False)
+
+    def _viewbox_region(self, viewbox):
+        """The (x, y, w, h) region of the framebuffer covered by a view box,
+        or None if it cannot be determined
+        """
+        if viewbox.canvas is not self:
+            return None
+        rect = viewbox.rect
+        corners = np.array([[rect.left, rect.bottom, 0, 1],
+                            [rect.right, rect.top, 0, 1]], dtype=np.float64)
+        ndc = viewbox.get_transform('visual', 'render').map(corners)
+        ndc = ndc[:, :2] / ndc[:, 3:4]
+        if not np.isfinite(ndc).all():
+            return None
+        size = np.array(self.physical_size)
+        px = (ndc + 1) / 2 * size
+        # pad for antialiasing
+        lo = np.clip(np.floor(px.min(axis=0)) - 1, 0, size)
+        hi = np.clip(np.ceil(px.max(axis=0)) + 1, 0, size)
+        return (int(lo[0]), int(lo[1]), int(hi[0] - lo[0]), int(hi[1] - lo[1]))
+
+    def _outside_region(self, node):
+        """Whether a node is a view box outside of the region being redrawn"""
+        if not isinstance(node, ViewBox):
+            return False
+        region = self._viewbox_region(node)
+        if region is None:
+            return False
+        x, y, w, h = self._redraw_region
+        return (region[0] >= x + w or region[0] + region[2] <= x or
+                region[1] >= y + h or region[1] + region[3] <= y)
+
     def update(self, node=None):
         """Update the scene
 
         Parameters
         ----------
         node : instance of Node
-            Not used.
+            The node that was updated, if any. This is used to invalidate
+            cached layers and, with `partial_redraw`, to redraw only the
+            region of the canvas affected by the node.
         """
-        # TODO: use node bounds to keep track of minimum drawable area
         if self._drawing:
             return
+        if node is not None and len(self._layers) > 0:
+            self._invalidate_layers(node)
+        if self._partial_redraw:
+            self._add_damage(node)
 
         # Keep things civil in the node update system. Once an update
         # has been scheduled, there is no need to flood the event queue
@@ -222,8 +528,20 @@ class SceneCanvas(app.Canvas, Frozen):
 
         # Now that a draw event is going to be handled, open up the
         # scheduling of further updates
+        self._update_quality()
         self._update_pending = False
-        self._draw_scene()
+        if self._metrics is not None:
+            self._metrics.begin_frame()
+        t0 = perf_counter()
+        if self._partial_redraw:
+            self._draw_partial()
+        else:
+            self._draw_scene()
+        if self._target_frame_time is not None and not self._low_quality:
+            # wait for the GL commands to be executed, so that the frame
+            # time includes the GPU work that makes heavy scenes slow
+            self.context.finish()
+            self._frame_time = perf_counter() - t0
 
     def render(self, region=None, size=None, bgcolor=None, crop=None, alpha=True):
         """Render the scene to an offscreen buffer and return the image array.
@@ -278,6 +596,61 @@ class SceneCanvas(app.Canvas, Frozen):
             result = result[..., :3]
         return result
 
+    async def render_async(self, region=None, size=None, bgcolor=None,
+                           crop=None, alpha=True, interval=0.001):
+        """Render the scene to an offscreen buffer and return the image
+        array, yielding to the asyncio event loop while the GPU draws.
+
+        This allows a single process to serve many concurrent render
+        requests: the scene is drawn and a GPU fence is inserted (see
+        ``finish_async``), after which other tasks run until the GPU is done
+        and the pixels can be read back without stalling.
+
+        Parameters
+        ----------
+        region : tuple | None
+            Specifies the region of the canvas to render. Format is
+            (x, y, w, h). By default, the entire canvas is rendered.
+        size : tuple | None
+            Specifies the size of the image array to return. See `render`.
+        bgcolor : instance of Color | None
+            The background color to use.
+        crop : array-like | None
+            If specified it determines the pixels read from the framebuffer.
+            In the format (x, y, w, h), relative to the region being rendered.
+        alpha : bool
+            If True (default) produce an RGBA array (h, w, 4). If False,
+            return the RGB array (h, w, 3).
+        interval : float
+            The time in seconds between checks whether the GPU is done.
+
+        Returns
+        -------
+        image : array
+            Numpy array of type ubyte and shape (h, w, 4). Index [0, 0] is the
+            upper-left corner of the rendered region. If ``alpha`` is ``False``,
+            then only 3 channels will be returned (RGB).
+        """
+        self.set_current()
+        offset = (0, 0) if region is None else region[:2]
+        csize = self.size if region is None else region[2:]
+        s = self.pixel_scale
+        size = tuple([int(x * s) for x in csize]) if size is None else size
+        fbo = gloo.FrameBuffer(color=gloo.RenderBuffer(size[::-1]),
+                               depth=gloo.RenderBuffer(size[::-1]))
+
+        self.push_fbo(fbo, offset, csize)
+        try:
+            self._draw_scene(bgcolor=bgcolor)
+        finally:
+            self.pop_fbo()
+        await self.finish_async(interval)
+        result = _read_fbo(self, fbo, crop)
+
+        if not alpha:
+            result = result[..., :3]
+        return result
+
     def _draw_scene(self, bgcolor=None):
         if bgcolor is None:
             bgcolor = self._bgcolor
@@ -309,26 +682,101 @@ class SceneCanvas(app.Canvas, Frozen):
             order = self._draw_order[visual]
 
             # draw (while avoiding branches with visible=False)
-            stack = []
-            invisible_node = None
-            for node, start in order:
-                if start:
-                    stack.append(node)
-                    if invisible_node is None:
-                        if not node.visible:
-                            # disable drawing until we exit this node's subtree
-                            invisible_node = node
-                        else:
-                            if hasattr(node, 'draw'):
-                                node.draw()
-                                prof.mark(str(node))
+            metrics = self._metrics
+            timed = self._measure_gpu_time
+            glir = self.context.glir
+            for node in self._visible_nodes(order):
+                if timed:
+                    self._gpu_timed_nodes[id(node)] = node
+                    glir.command('TIMER', 0, 'begin', id(node))
+                if metrics is None:
+                    node.draw()
                 else:
-                    if node is invisible_node:
-                        invisible_node = None
-                    stack.pop()
+                    metrics.draw_node(node)
+                if timed:
+                    glir.command('TIMER', 0, 'end', id(node))
+                prof.mark(str(node))
         finally:
             self._drawing = False
 
+    def _visible_nodes(self, order):
+        """Yield the visible nodes that can be drawn, in drawing order."""
+        if self._sort_visuals:
+            for node in self._sorted_nodes(order):
+                yield node
+            return
+        invisible_node = None
+        for node, start in order:
+            if start:
+                if invisible_node is None:
+                    if not node.visible or (self._redraw_region is not None and
+                                            self._outside_region(node)):
+                        # disable drawing until we exit this node's subtree
+                        invisible_node = node
+                    elif self._draws_layer(node):
+                        # the subtree is drawn from its layer
+                        invisible_node = node
+                        yield self._get_layer(node)
+                    elif hasattr(node, 'draw'):
+                        yield node
+            elif node is invisible_node:
+                invisible_node = None
+
+    def _sorted_nodes(self, order):
+        """Return the visible nodes sorted by GL state within buckets of
+        nodes that have the same ``order`` values along their path.
+        """
+        nodes = []
+        buckets = []
+        orders = []
+        invisible_node = None
+        for node, start in order:
+            if start:
+                orders.append(node.order)
+                if invisible_node is None:
+                    if not node.visible or (self._redraw_region is not None and
+                                            self._outside_region(node)):
+                        invisible_node = node
+                    elif self._draws_layer(node):
+                        # layers are composited in place, in a bucket of
+                        # their own
+                        invisible_node = node
+                        nodes.append(self._get_layer(node))
+                        buckets.append(object())
+                    elif hasattr(node, 'draw'):
+                        nodes.append(node)
+                        buckets.append(tuple(orders))
+            else:
+                if node is invisible_node:
+                    invisible_node = None
+                orders.pop()
+
+        result = []
+        i = 0
+        while i < len(nodes):
+            j = i + 1
+            while j < len(nodes) and buckets[j] == buckets[i]:
+                j += 1
+            if j == i + 1:
+                result.append(nodes[i])
+                i = j
+                continue
+            opaque = []
+            translucent = []
+            for node in nodes[i:j]:
+                translucent_, key = _draw_sort_key(node)
+                if translucent_:
+                    translucent.append((-_render_depth(node), node))
+                else:
+                    opaque.append((key, node))
+            # sorts are stable, so ties keep the scene graph order
+            opaque.sort(key=lambda item: item[0])
+            translucent.sort(key=lambda item: item[0])
+            result.extend(node for _, node in opaque)
+            result.extend(node for _, node in translucent)
+            i = j
+        return result
+
     def _generate_draw_order(self, node=None):
         """Return a list giving the order to draw visuals.
 
@@ -348,8 +796,95 @@ class SceneCanvas(app.Canvas, Frozen):
     def _update_scenegraph(self, event):
         """Called when topology of scenegraph has changed."""
         self._draw_order.clear()
+        for layer in self._layers.values():
+            layer.valid = False
         self.update()
 
+    @property
+    def layer_memory(self):
+        """Dict with the number of bytes of GPU memory used by the layer of
+        each node that is cached as a layer (see `Node.cache_as_layer`)
+        """
+        return dict((node, layer.nbytes)
+                    for node, layer in list(self._layers.items()))
+
+    def _draws_layer(self, node):
+        """Whether the subtree of a node is drawn from its layer"""
+        # layers hold colors, so picking draws the visuals themselves
+        return (node._cache_as_layer and node is not self._layer_node and
+                not node.picking)
+
+    def _get_layer(self, node):
+        layer = self._layers.get(node)
+        if layer is None:
+            layer = self._layers[node] = _Layer(self, node)
+        return layer
+
+    def _invalidate_layers(self, node):
+        """Invalidate the layers that contain a node that was updated"""
+        for parent in node.parent_chain():
+            layer = self._layers.get(parent)
+            if layer is None:
+                continue
+            if parent._cache_as_layer:
+                layer.valid = False
+            else:
+                del self._layers[parent]
+
+    def _framebuffer_size(self):
+        """The (width, height) of the active framebuffer in pixels"""
+        if len(self._fb_stack) == 0:
+            return tuple(self.physical_size)
+        return tuple(self._fb_stack[-1][0].color_buffer.shape[1::-1])
+
+    def _render_layer(self, layer, node, size):
+        """Draw the subtree of a node into the framebuffer of its layer"""
+        layer.resize(size)
+        if len(self._fb_stack) == 0:
+            offset, csize = (0, 0), self.size
+        else:
+            offset, csize = self._fb_stack[-1][1:]
+        viewport = self._vp_stack[-1] if len(self._vp_stack) > 0 else None
+        prev_layer_node, self._layer_node = self._layer_node, node
+        # accumulate alpha as in the premultiplied colors, not its square
+        glir = self.context.glir
+        prev_blend_alpha = glir.blend_alpha
+        glir.blend_alpha = ('one', 'one_minus_src_alpha')
+        self.push_fbo(layer.fbo, offset, csize)
+        try:
+            if viewport is not None:
+                self.push_viewport(viewport)
+            try:
+                self.context.clear(color=(0, 0, 0, 0), depth=True)
+                order = self._generate_draw_order(node)
+                for child in self._visible_nodes(order):
+                    child.draw()
+            finally:
+                if viewport is not None:
+                    self.pop_viewport()
+        finally:
+            self.pop_fbo()
+            self._layer_node = prev_layer_node
+            glir.blend_alpha = prev_blend_alpha
+
+    def _composite_texture(self, texture, size, blend=True):
+        """Draw a texture with premultiplied alpha (or without blending)
+        over the whole framebuffer
+        """
+        if self._layer_program is None:
+            self._layer_program = gloo.Program(_LAYER_VERT, _LAYER_FRAG)
+            self._layer_program['a_position'] = np.array(
+                [[-1, -1], [1, -1], [-1, 1], [1, 1]], dtype=np.float32)
+        self._layer_program['u_texture'] = texture
+        self.push_viewport((0, 0) + size)
+        try:
+            gloo.set_state(blend=blend,
+                           blend_func=('one', 'one_minus_src_alpha'),
+                           depth_test=False, cull_face=False)
+            self._layer_program.draw('triangle_strip')
+        finally:
+            self.pop_viewport()
+
     def _process_mouse_event(self, event):
         prof = Profiler()  # noqa
         deliver_types = [
@@ -644,3 +1179,133 @@ class SceneCanvas(app.Canvas, Frozen):
 
         self.transforms.configure(viewport=viewport, fbo_size=fb_size,
                                   fbo_rect=fb_rect)
+
+
+_LAYER_VERT = """
+attribute vec2 a_position;
+varying vec2 v_texcoord;
+void main() {
+    v_texcoord = (a_position + 1.0) / 2.0;
+    gl_Position = vec4(a_position, 0.0, 1.0);
+}
+"""
+
+_LAYER_FRAG = """
+uniform sampler2D u_texture;
+varying vec2 v_texcoord;
+void main() {
+    gl_FragColor = texture2D(u_texture, v_texcoord);
+}
+"""
+
+# Points whose mapping to the framebuffer identifies the transform of a layer
+_LAYER_PROBE = np.array([[0, 0, 0, 1], [1, 0, 0, 1], [0, 1, 0, 1],
+                         [0, 0, 1, 1]], dtype=np.float64)
+
+
+class _Layer(object):
+    """Texture holding the rendering of a node subtree (see
+    `Node.cache_as_layer`), which takes the place of the subtree in the
+    list of nodes to draw.
+    """
+
+    def __init__(self, canvas, node):
+        self._canvas = weakref.ref(canvas)
+        self._node = weakref.ref(node)
+        self.valid = False
+        self.key = None
+        self.size = None
+        self.texture = None
+        self.fbo = None
+
+    @property
+    def nbytes(self):
+        """GPU memory used by the RGBA color and depth buffers"""
+        return 0 if self.size is None else 8 * self.size[0] * self.size[1]
+
+    def resize(self, size):
+        if size != self.size:
+            self.size = size
+            shape = size[::-1]
+            self.texture = gloo.Texture2D(shape=shape + (4,),
+                                          interpolation='nearest')
+            self.fbo = gloo.FrameBuffer(color=self.texture,
+                                        depth=gloo.RenderBuffer(shape))
+
+    def draw(self):
+        canvas = self._canvas()
+        node = self._node()
+        if canvas is None or node is None:
+            return
+        size = canvas._framebuffer_size()
+        key = (size, tuple(canvas._vp_stack[-1:]), _layer_transform_key(node))
+        if not self.valid or key != self.key:
+            canvas._render_layer(self, node, size)
+            self.valid = True
+            self.key = key
+        canvas._composite_texture(self.texture, size)
+
+
+def _scene_viewbox(node):
+    """The innermost view box whose scene contains the node, or None"""
+    chain = node.parent_chain()
+    for child, parent in zip(chain[:-1], chain[1:]):
+        if isinstance(parent, ViewBox):
+            return parent if child is parent.scene else None
+    return None
+
+
+def _layer_transform_key(node):
+    """Fingerprint of the transform from a node to the framebuffer"""
+    nodes = [node]
+    while nodes:
+        node = nodes.pop(0)
+        if isinstance(node, VisualNode):
+            tr = node.transforms.get_transform('visual', 'render')
+            return tr.map(_LAYER_PROBE).tobytes()
+        nodes.extend(node.children)
+    return None
+
+
+def _draw_sort_key(visual):
+    """Return whether a visual is translucent and a key that groups visuals
+    that use the same shader program, GL state and textures.
+    """
+    subvisuals = getattr(visual, '_subvisuals', None)
+    if subvisuals is not None:
+        # compound visual: sort on its first subvisual
+        keys = [_draw_sort_key(v) for v in subvisuals if v.visible]
+        if not keys:
+            return False, (0, '', ())
+        return any(k[0] for k in keys), keys[0][1]
+
+    program = getattr(visual._vshare, 'program', None)
+    if program is None:
+        return False, (0, '', ())
+    prog_key = hash((type(visual).__name__,
+                     getattr(program, '_vcode', None),
+                     getattr(program, '_fcode', None)))
+
+    state = dict(visual._vshare.gl_state)
+    preset = state.pop('preset', None)
+    full_state = dict(gloo.GL_PRESETS.get(preset, {}))
+    full_state.update(state)
+    state_key = repr(sorted(full_state.items()))
+
+    variables = getattr(visual._program, '_user_variables', {})
+    tex_key = tuple(sorted(v.id for v in variables.values()
+                           if isinstance(v, gloo.texture.BaseTexture)))
+    return bool(full_state.get('blend', False)), (prog_key, state_key, tex_key)
+
+
+def _render_depth(visual):
+    """Return the normalized device depth of the center of a visual's bounds,
+    or 0 if it cannot be determined.
+    """
+    center = []
+    for axis in range(3):
+        bounds = visual.bounds(axis)
+        center.append(0. if bounds is None else (bounds[0] + bounds[1]) / 2.)
+    pos = visual.get_transform('visual', 'render').map(center)
+    depth = pos[2] / pos[3] if pos[3] != 0 else 0.
+    return depth if np.isfinite(depth) else 0.
@@ -50,6 +50,7 @@ class Node(object):
         self._opacity = 1.0
         self._order = 0
         self._picking = False
+        self._cache_as_layer = False
 
         # clippers inherited from parents
         self._clippers = weakref.WeakKeyDictionary()  # {node: clipper}
@@ -157,6 +158,25 @@ class Node(object):
         self._order = o
         self.update()
 
+    @property
+    def cache_as_layer(self):
+        """Whether the node and its children are rendered into a texture that
+        is reused on later frames
+
+        Use this for subtrees that rarely change. The layer is rendered again
+        when a node in it is updated, when its transform to the framebuffer
+        changes (e.g. by a camera), or when the canvas is resized. It is
+        composited as a flat image, without depth, at the position of the
+        node in the drawing order. See `SceneCanvas.layer_memory` for the
+        memory used by the layers.
+        """
+        return self._cache_as_layer
+
+    @cache_as_layer.setter
+    def cache_as_layer(self, cache):
+        self._cache_as_layer = bool(cache)
+        self.update()
+
     @property
     def children(self):
         """A copy of the list of children of this node. Do not add
@@ -316,6 +336,7 @@ class Node(object):
             tr = c.transforms
             self.transforms.canvas_transform = tr.canvas_transform
             self.transforms.framebuffer_transform = tr.framebuffer_transform
+            self.transforms.fuse_linear = c.fuse_transforms
 
         # update all children
         for ch in self.children:
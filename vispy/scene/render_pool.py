@@ -0,0 +1,418 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) Vispy Development Team. All Rights Reserved.
+# Distributed under the (new) BSD License. See LICENSE.txt for more info.
+"""Batch offscreen rendering in a pool of worker processes.
+
+Each worker process owns a single offscreen :class:`SceneCanvas` (e.g. with
+the EGL or OSMesa backend) that is reused for all the scenes it renders, so
+its GL context, compiled shaders and font atlases stay warm. Rendered images
+are handed back to the main process through shared memory rather than
+being pickled.
+"""
+
+from __future__ import division
+
+import os
+import queue
+import traceback
+import multiprocessing
+from multiprocessing import resource_tracker, shared_memory
+from time import perf_counter
+
+import numpy as np
+
+from ..util import logger
+
+
+def build_scene(canvas, description):
+    """Populate a canvas from a scene description
+
+    Parameters
+    ----------
+    canvas : instance of SceneCanvas
+        The canvas to add the scene to.
+    description : dict
+        The description of the scene, with the following items (all
+        optional):
+
+        * ``'visuals'``: a list of dicts with the name of a class in
+          :mod:`vispy.scene.visuals` as ``'type'`` and the keyword arguments
+          to create it with as ``'kwargs'``.
+        * ``'camera'``: the camera of the view the visuals are added to,
+          e.g. ``'panzoom'`` or ``'turntable'``. The range of the camera is
+          set to fit the visuals.
+        * ``'bgcolor'``: the background color of the canvas.
+
+    Returns
+    -------
+    view : instance of ViewBox
+        The view that holds the visuals.
+
+    Examples
+    --------
+    A description of a scatter plot::
+
+        dict(camera='panzoom',
+             visuals=[dict(type='Markers',
+                           kwargs=dict(pos=pos, face_color='red'))])
+    """
+    from . import visuals as scene_visuals
+    unknown = set(description) - set(['visuals', 'camera', 'bgcolor'])
+    if unknown:
+        raise ValueError('Unknown items in scene description: %s'
+                         % sorted(unknown))
+    if 'bgcolor' in description:
+        canvas.bgcolor = description['bgcolor']
+    view = canvas.central_widget.add_view()
+    for item in description.get('visuals', []):
+        klass = getattr(scene_visuals, item['type'], None)
+        if not isinstance(klass, type):
+            raise ValueError('Unknown visual type %r' % (item['type'],))
+        klass(parent=view.scene, **item.get('kwargs', {}))
+    camera = description.get('camera')
+    if camera is not None:
+        view.camera = camera
+        view.camera.set_range()
+    return view
+
+
+def _reset_canvas(canvas, size, bgcolor):
+    """Remove the scene from a canvas so that it can render a new one"""
+    from .subscene import SubScene
+    canvas.scene = SubScene()
+    canvas._central_widget = None
+    canvas.bgcolor = bgcolor
+    if tuple(canvas.size) != tuple(size):
+        canvas.size = size
+
+
+def _render_worker(backend, size, bgcolor, warmup, jobs, results, current):
+    """Render the jobs of the queue with a persistent offscreen canvas
+
+    The batch and index of the job being rendered are kept in *current*,
+    so that the main process can tell which job was lost if the worker dies.
+    """
+    from .. import app
+    from .canvas import SceneCanvas
+    pid = os.getpid()
+    try:
+        canvas = SceneCanvas(size=size, bgcolor=bgcolor, show=False,
+                             app=app.Application(backend))
+        if warmup is not None:
+            _render_job(canvas, warmup, size, bgcolor, {})
+    except Exception:
+        results.put((None, None, pid, None, traceback.format_exc()))
+        return
+    results.put((None, None, pid, None, None))  # ready
+
+    while True:
+        job = jobs.get()
+        if job is None:
+            break
+        batch, index, scene, render_kwargs = job
+        current[:] = [batch, index]
+        t0 = perf_counter()
+        try:
+            image = _render_job(canvas, scene, size, bgcolor, render_kwargs)
+            t1 = perf_counter()
+            shm = shared_memory.SharedMemory(create=True,
+                                             size=max(image.nbytes, 1))
+            # the main process frees the memory once it has read the image
+            resource_tracker.unregister(shm._name, 'shared_memory')
+            try:
+                np.ndarray(image.shape, image.dtype, shm.buf)[...] = image
+                info = dict(shm=shm.name, shape=image.shape,
+                            dtype=image.dtype.str, render=t1 - t0,
+                            nbytes=image.nbytes)
+            finally:
+                shm.close()
+        except Exception:
+            results.put((batch, index, pid, None, traceback.format_exc()))
+        else:
+            results.put((batch, index, pid, info, None))
+        current[:] = [0, -1]
+    canvas.close()
+
+
+def _render_job(canvas, scene, size, bgcolor, render_kwargs):
+    """Build a scene on the canvas and render it"""
+    _reset_canvas(canvas, size, bgcolor)
+    if isinstance(scene, dict):
+        build_scene(canvas, scene)
+    else:
+        scene(canvas)
+    return canvas.render(**render_kwargs)
+
+
+def _read_shared(info):
+    """Copy an image out of the shared memory of a worker and free it"""
+    shm = shared_memory.SharedMemory(name=info['shm'])
+    try:
+        image = np.ndarray(info['shape'], np.dtype(info['dtype']),
+                           shm.buf).copy()
+    finally:
+        shm.close()
+        shm.unlink()
+    return image
+
+
+class RenderPool(object):
+    """Render scenes offscreen in a pool of worker processes
+
+    Each worker creates one offscreen :class:`SceneCanvas` with the given
+    app backend when the pool starts, and reuses it (and thereby its GL
+    context, shader and font caches) for all the scenes it renders. For
+    each scene, the canvas is cleared, the scene is built and
+    ``SceneCanvas.render`` is called. The image is copied into a shared
+    memory block that the main process copies out of and releases.
+
+    A scene is either a callable that is called with the canvas and adds
+    visuals to it, or a description of the scene as accepted by
+    :func:`build_scene`. Scenes are sent to the workers by pickling, so
+    callables must be defined at the top level of a module (use
+    ``functools.partial`` to pass arguments).
+
+    Parameters
+    ----------
+    n_workers : int | None
+        The number of worker processes. Defaults to the number of CPUs.
+    backend : str | None
+        The name of the app backend of the workers, e.g. ``'egl'`` or
+        ``'osmesa'``. If None, the default backend is used.
+    size : tuple
+        The size of the canvases.
+    bgcolor : Color
+        The default background color of the canvases.
+    warmup : callable | dict | None
+        A scene that each worker renders when it starts, e.g. to compile
+        the shaders and load the fonts that the real scenes use.
+    start_method : str
+        The multiprocessing start method. The default, ``'spawn'``, avoids
+        forking a process that may hold a GL context.
+
+    Examples
+    --------
+    Render thumbnails of a list of point clouds::
+
+        def scatter(pos, canvas):
+            view = canvas.central_widget.add_view(camera='panzoom')
+            scene.visuals.Markers(pos=pos, parent=view.scene)
+            view.camera.set_range()
+
+        with RenderPool(4, backend='egl', size=(128, 128)) as pool:
+            images = pool.render([partial(scatter, pos) for pos in data])
+            print(pool.metrics['images_per_second'])
+    """
+
+    def __init__(self, n_workers=None, backend=None, size=(800, 600),
+                 bgcolor='black', warmup=None, start_method='spawn'):
+        if n_workers is None:
+            n_workers = os.cpu_count() or 1
+        n_workers = int(n_workers)
+        if n_workers < 1:
+            raise ValueError('n_workers must be at least 1, not %d'
+                             % n_workers)
+        self._size = tuple(int(s) for s in size)
+        self._batch = 0
+        self._closed = False
+        ctx = multiprocessing.get_context(start_method)
+        self._jobs = ctx.Queue()
+        self._results = ctx.Queue()
+        self._workers = []
+        # the (batch, index) of the job of each worker, batch 0 if none
+        self._current = []
+        self.reset_metrics()
+
+        # the GL library must be set before the workers import vispy.gloo
+        gl_lib = os.environ.get('VISPY_GL_LIB')
+        if backend is not None and backend.lower() == 'osmesa':
+            from ..util.osmesa_gl import fix_osmesa_gl_lib
+            fix_osmesa_gl_lib()
+        try:
+            for _ in range(n_workers):
+                current = ctx.Array('q', [0, -1])
+                worker = ctx.Process(target=_render_worker,
+                                     args=(backend, self._size, bgcolor,
+                                           warmup, self._jobs,
+                                           self._results, current),
+                                     daemon=True)
+                worker.start()
+                self._workers.append(worker)
+                self._current.append(current)
+        finally:
+            if gl_lib is None:
+                os.environ.pop('VISPY_GL_LIB', None)
+            else:
+                os.environ['VISPY_GL_LIB'] = gl_lib
+
+        # wait until all workers have created their canvas
+        for _ in range(n_workers):
+            try:
+                _, _, pid, _, error = self._get_result()
+            except RuntimeError:
+                self.close()
+                raise
+            if error is not None:
+                self.close()
+                raise RuntimeError('Could not start render worker:\n%s'
+                                   % error)
+
+    @property
+    def n_workers(self):
+        """The number of worker processes"""
+        return len(self._workers)
+
+    @property
+    def size(self):
+        """The size of the canvases of the workers"""
+        return self._size
+
+    @property
+    def metrics(self):
+        """Throughput metrics of the renders since the last reset
+
+        A dict with the number of ``'images'`` rendered, the wall-clock
+        ``'seconds'`` spent in :meth:`render` and :meth:`imap`, the
+        resulting ``'images_per_second'``, the total ``'render_seconds'``
+        spent by the workers to build and render the scenes, the number of
+        ``'bytes'`` returned through shared memory and the number of images
+        rendered by each worker process id (``'per_worker'``).
+        """
+        metrics = dict(self._metrics)
+        metrics['per_worker'] = dict(self._metrics['per_worker'])
+        seconds = metrics['seconds']
+        metrics['images_per_second'] = (metrics['images'] / seconds
+                                        if seconds > 0 else 0.)
+        return metrics
+
+    def reset_metrics(self):
+        """Reset the throughput metrics."""
+        self._metrics = dict(images=0, seconds=0., render_seconds=0.,
+                             bytes=0, per_worker={})
+
+    def _get_result(self, timeout=0.1):
+        """Wait for the next result of the workers
+
+        Workers that die without posting a result (e.g. when the GL driver
+        crashes) would make this wait forever, so they are checked for
+        every *timeout* seconds.
+        """
+        while True:
+            try:
+                return self._results.get(timeout=timeout)
+            except queue.Empty:
+                pass
+            for worker, current in zip(self._workers, self._current):
+                if worker.is_alive():
+                    continue
+                msg = ('Render worker %d exited with code %s'
+                       % (worker.pid, worker.exitcode))
+                batch, index = current[:]
+                if batch != 0:
+                    msg += (' while rendering scene %d of batch %d'
+                            % (index, batch))
+                raise RuntimeError(msg)
+
+    def imap(self, scenes, **render_kwargs):
+        """Render scenes and yield the images in order
+
+        All scenes are queued at once; images are yielded as soon as they
+        and the images before them are available.
+
+        Parameters
+        ----------
+        scenes : iterable
+            The scenes to render, each a callable or a scene description.
+        **render_kwargs : dict
+            Keyword arguments for ``SceneCanvas.render`` (e.g. ``region``,
+            ``size``, ``crop`` or ``alpha``).
+
+        Yields
+        ------
+        image : array
+            The rendered image of each scene.
+        """
+        if self._closed:
+            raise RuntimeError('RenderPool is closed')
+        self._batch += 1
+        batch = self._batch
+        t0 = perf_counter()
+        n = 0
+        for scene in scenes:
+            self._jobs.put((batch, n, scene, render_kwargs))
+            n += 1
+        pending = {}
+        metrics = self._metrics
+        per_worker = metrics['per_worker']
+        try:
+            for index in range(n):
+                while index not in pending:
+                    job_batch, job_index, pid, info, error = \
+                        self._get_result()
+                    if job_batch != batch:
+                        # left over from an interrupted batch
+                        if info is not None:
+                            _read_shared(info)
+                        continue
+                    if error is not None:
+                        raise RuntimeError('Rendering scene %d failed:\n%s'
+                                           % (job_index, error))
+                    pending[job_index] = _read_shared(info)
+                    metrics['images'] += 1
+                    metrics['render_seconds'] += info['render']
+                    metrics['bytes'] += info['nbytes']
+                    per_worker[pid] = per_worker.get(pid, 0) + 1
+                yield pending.pop(index)
+        finally:
+            metrics['seconds'] += perf_counter() - t0
+
+    def render(self, scenes, **render_kwargs):
+        """Render scenes and return the images
+
+        Parameters
+        ----------
+        scenes : iterable
+            The scenes to render, each a callable or a scene description.
+        **render_kwargs : dict
+            Keyword arguments for ``SceneCanvas.render``.
+
+        Returns
+        -------
+        images : list of arrays
+            The rendered images, in the order of the scenes.
+        """
+        return list(self.imap(scenes, **render_kwargs))
+
+    def close(self):
+        """Stop the worker processes."""
+        if self._closed:
+            return
+        self._closed = True
+        for worker in self._workers:
+            if worker.is_alive():
+                self._jobs.put(None)
+        for worker in self._workers:
+            worker.join(5)
+            if worker.is_alive():
+                logger.warning('Terminating render worker %d' % worker.pid)
+                worker.terminate()
+        # free the images of jobs that were not collected
+        while True:
+            try:
+                _, _, _, info, _ = self._results.get_nowait()
+            except Exception:
+                break
+            if info is not None:
+                _read_shared(info)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
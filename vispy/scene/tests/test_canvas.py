@@ -2,8 +2,12 @@
 # Copyright (c) Vispy Development Team. All Rights Reserved.
 # Distributed under the (new) BSD License. See LICENSE.txt for more info.
 
+import asyncio
+import time
+
 from vispy import gloo, scene
 from vispy.testing import requires_application, TestingCanvas
+from vispy.util.metrics import FrameMetrics
 from vispy.visuals.transforms import STTransform
 
 import numpy as np
@@ -62,6 +66,25 @@ def test_canvas_render(blend_func):
             assert (rgba_result[..., 3] != 255).any()
 
 
+@requires_application()
+def test_canvas_render_async():
+    """Test rendering a canvas to an array without blocking the loop."""
+    with TestingCanvas(size=(60, 40), show=True, title='run') as c:
+        view = c.central_widget.add_view()
+        image = np.zeros((20, 20, 4), np.float32)
+        image[..., 0] = image[..., 3] = 1
+        scene.visuals.Image(image, parent=view.scene)
+        expected = c.render()
+
+        async def main():
+            return await asyncio.gather(
+                c.render_async(), c.render_async(crop=(0, 0, 10, 10),
+                                                 alpha=False))
+        result, cropped = asyncio.run(main())
+        np.testing.assert_array_equal(result, expected)
+        np.testing.assert_array_equal(cropped, expected[-10:, :10, :3])
+
+
 @requires_application()
 def test_picking_basic():
     """Test basic picking behavior.
@@ -117,3 +140,245 @@ def test_blend_presets(preset):
 
         rgba_result = c.render()
         assert not np.allclose(rgba_result[..., :3], 0)
+
+
+@requires_application()
+def test_sort_visuals():
+    """Test state-sorted drawing of opaque and translucent visuals."""
+    with TestingCanvas(size=(125, 125), show=True, title='run') as c:
+        view = c.central_widget.add_view()
+        data = np.random.RandomState(0).rand(2, 100, 100, 4)
+        data[..., 3] = 1
+        data = data.astype(np.float32)
+        im1 = scene.visuals.Image(data[0], parent=view.scene)
+        line1 = scene.visuals.Line(np.array([[0, 0], [50, 50]]),
+                                   parent=view.scene)
+        im2 = scene.visuals.Image(data[1], parent=view.scene)
+        im2.transform = STTransform(translate=(100, 0))
+        line2 = scene.visuals.Line(np.array([[0, 50], [50, 0]]),
+                                   parent=view.scene)
+        back = scene.visuals.Line(np.array([[0, 0], [50, 0]]),
+                                  parent=view.scene)
+        back.transform = STTransform(translate=(0, 0, 1000))
+        for v in (im1, im2):
+            v.set_gl_state('opaque')
+        for v in (line1, line2, back):
+            v.set_gl_state('translucent', depth_test=False)
+
+        expected = c.render()
+        c.sort_visuals = True
+        assert c.sort_visuals
+        order = [n for n in c._visible_nodes(c._generate_draw_order())
+                 if n in (im1, im2, line1, line2, back)]
+        # opaque images are grouped, translucent lines drawn back to front
+        assert order[:2] == [im1, im2]
+        assert order[2] is back
+        assert set(order[3:]) == set([line1, line2])
+        np.testing.assert_array_equal(c.render(), expected)
+
+
+@requires_application()
+def test_canvas_metrics():
+    """Test recording per-frame metrics of a canvas."""
+    with TestingCanvas(size=(125, 125), show=True, title='run') as c:
+        view = c.central_widget.add_view()
+        line = scene.visuals.Line(np.array([[0, 0], [50, 50]]),
+                                  parent=view.scene)
+        c.metrics = FrameMetrics(max_frames=2)
+        for _ in range(3):
+            c.events.draw(region=None)
+        assert [r['frame'] for r in c.metrics.frames] == [1, 2]
+        record = c.metrics.last
+        assert any(v['id'] == id(line) for v in record['visuals'])
+        assert record['commands']['DRAW'] >= 1
+        assert record['duration'] >= record['flush'] >= record['parse']
+        c.metrics = None
+        assert c.context.glir.metrics is None
+
+
+@requires_application()
+def test_measure_gpu_time():
+    """Test measuring the GPU time of visuals."""
+    with TestingCanvas(size=(125, 125), show=True, title='run') as c:
+        view = c.central_widget.add_view()
+        line = scene.visuals.Line(np.array([[0, 0], [50, 50]]),
+                                  parent=view.scene)
+        assert not c.measure_gpu_time
+        c.measure_gpu_time = True
+        for _ in range(5):
+            c.events.draw(region=None)
+        c.context.finish()
+        c.events.draw(region=None)
+        gpu_times = c.gpu_times
+        # empty if timer queries are not supported
+        if gpu_times:
+            assert gpu_times[line] >= 0
+
+
+@requires_application()
+def test_adaptive_quality():
+    """Test drawing at low quality while interacting."""
+    with TestingCanvas(size=(125, 125), show=True, title='run') as c:
+        view = c.central_widget.add_view()
+        markers = scene.visuals.Markers(pos=np.random.rand(10, 2),
+                                        parent=view.scene)
+        c.events.draw(region=None)
+        assert not markers.low_quality
+        c.target_frame_time = 0.
+        c.interaction_timeout = 10.
+        view.camera = 'panzoom'
+        view.camera.rect = (0, 0, 2, 2)
+        c.events.draw(region=None)
+        assert markers.low_quality
+        # full quality once the interaction stops
+        c._last_interaction -= 20.
+        c._check_interaction()
+        c.events.draw(region=None)
+        assert not markers.low_quality
+
+        # the frame time includes the execution of the GL commands
+        finish = c.context.finish
+
+        def slow_finish():
+            time.sleep(0.1)
+            finish()
+        c.context.finish = slow_finish
+        c.target_frame_time = 0.05
+        c.events.draw(region=None)
+        assert c._frame_time >= 0.1
+        view.camera.rect = (0, 0, 1, 1)
+        c.events.draw(region=None)
+        assert markers.low_quality
+
+
+@requires_application()
+def test_cache_as_layer():
+    """Test drawing a subtree from a cached layer."""
+    with TestingCanvas(size=(125, 125), show=True, title='run') as c:
+        view = c.central_widget.add_view()
+        view.camera = 'panzoom'
+        view.camera.rect = (0, 0, 100, 100)
+        static = scene.Node(parent=view.scene)
+        image = scene.visuals.Image(np.random.RandomState(0).rand(50, 50, 3),
+                                    parent=static)
+        line = scene.visuals.Line(np.array([[0, 0], [100, 100]]),
+                                  color='red', parent=view.scene)
+        expected = c.render()
+        static.cache_as_layer = True
+        np.testing.assert_array_equal(c.render(), expected)
+        layer = c._layers[static]
+        assert layer.valid
+        w, h = c.physical_size
+        assert c.layer_memory == {static: 8 * w * h}
+
+        # reused until a node in it is updated or the view changes
+        key = layer.key
+        line.set_data(color='blue')
+        assert layer.valid
+        image.set_data(np.zeros((50, 50, 3)))
+        assert not layer.valid
+        c.render()
+        assert layer.valid and layer.key == key
+        view.camera.rect = (0, 0, 50, 50)
+        c.render()
+        assert layer.key != key
+
+        static.cache_as_layer = False
+        assert c.layer_memory == {}
+
+        # picking draws the visuals of a layer, not its colors
+        static.cache_as_layer = True
+        c.render()
+        tr = image.transforms.get_transform('visual', 'canvas')
+        assert c.visual_at(tuple(tr.map([25, 10])[:2])) is image
+
+        # translucent visuals are composited with the right alpha
+        image.set_data(np.tile([1., 0., 0., 0.5], (50, 50, 1)))
+        image.clim = (0, 1)
+        image.set_gl_state('translucent', depth_test=False)
+        c.bgcolor = 'white'
+        static.cache_as_layer = False
+        expected = c.render(alpha=False)
+        static.cache_as_layer = True
+        np.testing.assert_allclose(c.render(alpha=False).astype(int), expected,
+                                   atol=2)
+
+
+@requires_application()
+def test_partial_redraw():
+    """Test redrawing only the view boxes that changed."""
+    with TestingCanvas(size=(200, 100), show=True, title='run') as c:
+        grid = c.central_widget.add_grid()
+        views = [grid.add_view(row=0, col=col) for col in range(2)]
+        lines = []
+        for view in views:
+            view.camera = 'panzoom'
+            view.camera.rect = (0, 0, 1, 1)
+            lines.append(scene.visuals.Line(np.array([[0, 0], [1, 1]]),
+                                            parent=view.scene))
+        c.partial_redraw = True
+        c.events.draw(region=None)
+        assert c._damage == {}
+
+        lines[0].set_data(color='red')
+        assert list(c._damage) == [views[0]]
+        region = c._viewbox_region(views[0])
+        assert region[0] == 0 and region[2] <= c.physical_size[0] // 2 + 2
+        c.events.draw(region=None)
+        partial = c._redraw_fbo.read()
+        np.testing.assert_array_equal(partial, c.render())
+
+        # a widget update redraws everything
+        grid.update()
+        assert c._damage is None
+
+
+@requires_application()
+def test_fuse_transforms():
+    """Test drawing with linear transforms combined in the shaders."""
+    with TestingCanvas(size=(100, 100), show=True, title='run') as c:
+        view = c.central_widget.add_view()
+        view.camera = 'panzoom'
+        view.camera.rect = (0, 0, 1, 1)
+        line = scene.visuals.Line(np.array([[0, 0], [1, 1]]),
+                                  parent=view.scene)
+        expected = c.render()
+        c.fuse_transforms = True
+        assert line.transforms.fuse_linear
+        assert line.transforms.get_transform().fuse_linear
+        np.testing.assert_array_equal(c.render(), expected)
+
+        # nodes added later follow the canvas setting
+        markers = scene.visuals.Markers(parent=view.scene)
+        assert markers.transforms.fuse_linear
+        c.fuse_transforms = False
+        assert not line.transforms.fuse_linear
+
+        # the fused matrices follow a moving perspective camera
+        view.camera = 'turntable'
+        line.set_data(np.array([[0, 0, 0], [1, 1, 1]]))
+        c.render()
+        view.camera.azimuth += 40
+        expected = c.render()
+        c.fuse_transforms = True
+        c.render()
+        view.camera.azimuth -= 40
+        c.render()
+        view.camera.azimuth += 40
+        np.testing.assert_array_equal(c.render(), expected)
+
+
+def test_fuse_transforms_camera():
+    """Test the fused shader matrix of a view with a moving camera."""
+    view = scene.widgets.ViewBox()
+    view.size = (100, 100)
+    view.camera = 'turntable'
+    transform = view.scene.transform
+    transform.fuse_linear = True
+    fn = transform.shader_map()
+    pos = np.array([0.3, 0.2, 0.1, 1.])
+    for azimuth in (40, 100):
+        view.camera.azimuth = azimuth
+        view.camera.elevation += 10
+        matrix = fn.functions[0]['matrix'].value
+        np.testing.assert_allclose(np.dot(pos, matrix), transform.map(pos))
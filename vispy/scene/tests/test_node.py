@@ -122,17 +122,20 @@ def test_transforms():
                   n1.transform.map(n2.transform.map(pts)))
     assert np.all(n1.node_transform(n3).map(pts) == 
                   n3.transform.inverse.map(n1.transform.map(pts)))
-    assert np.all(n2.node_transform(n3).map(pts) == 
-                  n3.transform.inverse.map(
-                      n1.transform.map(n2.transform.map(pts))))
-    assert np.all(n2.node_transform(n4).map(pts) == 
-                  n4.transform.inverse.map(n3.transform.inverse.map(
-                      n1.transform.map(n2.transform.map(pts)))))
+    # longer chains are mapped through a combined matrix, which rounds
+    # differently than mapping through each transform
+    assert np.allclose(n2.node_transform(n3).map(pts),
+                       n3.transform.inverse.map(
+                           n1.transform.map(n2.transform.map(pts))))
+    assert np.allclose(n2.node_transform(n4).map(pts),
+                       n4.transform.inverse.map(n3.transform.inverse.map(
+                           n1.transform.map(n2.transform.map(pts)))))
 
     # test transforms still work after reparenting
     n3.parent = n1
-    assert np.all(n2.node_transform(n4).map(pts) == n4.transform.inverse.map(
-        n3.transform.inverse.map(n2.transform.map(pts))))
+    assert np.allclose(n2.node_transform(n4).map(pts),
+                       n4.transform.inverse.map(
+                           n3.transform.inverse.map(n2.transform.map(pts))))
 
     # test transform simplification
     assert np.all(n2.node_transform(n4).map(pts) == 
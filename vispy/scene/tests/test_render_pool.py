@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) Vispy Development Team. All Rights Reserved.
+# Distributed under the (new) BSD License. See LICENSE.txt for more info.
+import os
+import multiprocessing
+from functools import partial
+
+import numpy as np
+import pytest
+
+from vispy import scene
+from vispy.scene import RenderPool, render_pool
+from vispy.testing import requires_application, run_tests_if_main
+
+
+def _add_image(color, canvas):
+    view = canvas.central_widget.add_view(camera='panzoom')
+    data = np.zeros((10, 10, 4), np.float32)
+    data[...] = color
+    scene.visuals.Image(data, parent=view.scene)
+    view.camera.set_range(margin=0)
+
+
+def _fail(canvas):
+    raise ValueError('no scene')
+
+
+def _exit_worker(*args):
+    os._exit(3)
+
+
+def _exit_in_job_worker(backend, size, bgcolor, warmup, jobs, results,
+                        current):
+    results.put((None, None, os.getpid(), None, None))
+    batch, index, _, _ = jobs.get()
+    current[:] = [batch, index]
+    results.close()
+    results.join_thread()
+    os._exit(3)
+
+
+@requires_application()
+def test_render_pool():
+    """Test rendering scenes in worker processes"""
+    with RenderPool(2, size=(20, 20), warmup=partial(_add_image, 0)) as pool:
+        assert pool.n_workers == 2
+        scenes = [partial(_add_image, (1, 0, 0, 1)),
+                  dict(bgcolor='blue'),
+                  partial(_add_image, (0, 1, 0, 1))]
+        images = pool.render(scenes)
+        assert [im.shape for im in images] == [(20, 20, 4)] * 3
+        np.testing.assert_array_equal(images[0][10, 10], (255, 0, 0, 255))
+        np.testing.assert_array_equal(images[1][10, 10], (0, 0, 255, 255))
+        np.testing.assert_array_equal(images[2][10, 10], (0, 255, 0, 255))
+        # the canvas is cleared between scenes
+        image, = pool.render([dict()], alpha=False)
+        np.testing.assert_array_equal(image, 0)
+
+        metrics = pool.metrics
+        assert metrics['images'] == 4
+        assert metrics['bytes'] == 3 * 20 * 20 * 4 + 20 * 20 * 3
+        assert sum(metrics['per_worker'].values()) == 4
+        assert metrics['images_per_second'] > 0
+        pool.reset_metrics()
+        assert pool.metrics['images'] == 0
+
+        # errors are reported, and the pool can still be used
+        with pytest.raises(RuntimeError, match='no scene'):
+            pool.render([_fail, dict()])
+        with pytest.raises(RuntimeError, match='Unknown visual type'):
+            pool.render([dict(visuals=[dict(type='Nothing')])])
+        assert len(pool.render([dict(), dict()])) == 2
+    with pytest.raises(RuntimeError):
+        pool.render([dict()])
+
+
+@pytest.mark.skipif('fork' not in multiprocessing.get_all_start_methods(),
+                    reason='the fake workers are passed by forking')
+def test_render_pool_dead_worker(monkeypatch):
+    """Test that workers dying without a result are reported"""
+    monkeypatch.setattr(render_pool, '_render_worker', _exit_worker)
+    with pytest.raises(RuntimeError, match='exited with code 3$'):
+        RenderPool(1, start_method='fork')
+
+    monkeypatch.setattr(render_pool, '_render_worker', _exit_in_job_worker)
+    with RenderPool(1, start_method='fork') as pool:
+        with pytest.raises(RuntimeError, match='exited with code 3 while '
+                           'rendering scene 0 of batch 1'):
+            pool.render([dict()])
+
+
+run_tests_if_main()
@@ -43,6 +43,20 @@ class Grid(Widget):
         self._default_class = ViewBox  # what to add when __getitem__ is used
         self._solver = Solver()
         self._need_solver_recreate = True
+        # (grid size, spacing) that the variables and the structural
+        # constraints of the solver were created for
+        self._solver_key = None
+        # Constraints of each widget by its key in _grid_widgets, and the
+        # stretch constraints, so that they can be replaced without
+        # recreating the solver. Edits are collected and applied to the
+        # solver at once when the grid is drawn.
+        self._widget_constraints = {}
+        self._stretch_constraints = {}
+        self._changed_widgets = set()
+        self._removed_widgets = set()
+        self._need_stretch_update = False
+        # the rect and padding for which the children were last positioned
+        self._layout_key = None
 
         # width and height of the Rect used to place child widgets
         self._var_w = Variable("w_rect")
@@ -131,6 +145,8 @@ class Grid(Widget):
         _row[col] = widget
         self._grid_widgets[self._n_added] = (row, col, row_span, col_span,
                                              widget)
+        self._changed_widgets.add(self._n_added)
+        self._need_stretch_update = True
         self._n_added += 1
         widget.parent = self
 
@@ -149,8 +165,6 @@ class Grid(Widget):
         stretch[1] = row_span if stretch[1] is None else stretch[1]
         widget.stretch = stretch
 
-        self._need_solver_recreate = True
-
         return widget
 
     def remove_widget(self, widget):
@@ -161,11 +175,13 @@ class Grid(Widget):
         widget : Widget
             The Widget to remove
         """
-        self._grid_widgets = dict((key, val)
-                                  for (key, val) in self._grid_widgets.items()
-                                  if val[-1] != widget)
-
-        self._need_solver_recreate = True
+        removed = [key for (key, val) in self._grid_widgets.items()
+                   if val[-1] == widget]
+        for key in removed:
+            del self._grid_widgets[key]
+        self._removed_widgets.update(removed)
+        self._changed_widgets.difference_update(removed)
+        self._need_stretch_update = True
 
     def resize_widget(self, widget, row_span, col_span):
         """Resize a widget in the grid to new dimensions.
@@ -194,7 +210,14 @@ class Grid(Widget):
 
         self.remove_widget(widget)
         self.add_widget(widget, row, col, row_span, col_span)
-        self._need_solver_recreate = True
+
+    def _update_child_layout(self, widget):
+        # The size limits or stretch of a child changed
+        for (key, val) in self._grid_widgets.items():
+            if val[-1] == widget:
+                self._changed_widgets.add(key)
+                self._need_stretch_update = True
+        self.update()
 
     def _prepare_draw(self, view):
         self._update_child_widget_dim()
@@ -343,7 +366,7 @@ class Grid(Widget):
     @staticmethod
     def _add_stretch_constraints(solver: Solver, width_grid: NDArray[Variable] , height_grid: NDArray[Variable],
                                  grid_widgets: Dict[int, Tuple[int, int, int, int, ViewBox]],
-                                 widget_grid: NDArray[ViewBox]):
+                                 widget_grid: NDArray[ViewBox], existing: Union[Dict, None] = None):
         """
         Add proportional stretch constraints to the linear system solver of the grid.
 
@@ -365,6 +388,10 @@ class Grid(Widget):
             (start_y, start_x, span_y, span_x, ViewBox).
         widget_grid : NDArray[ViewBox]
             Array of viewboxes in shape n_columns x n_rows.
+        existing : dict | None
+            The stretch constraints in the solver, as returned by a previous call. Constraints that are still
+            needed are kept and the others are removed from the solver, so that only the constraints of the
+            widgets that changed are replaced.
 
         Notes
         -----
@@ -372,50 +399,66 @@ class Grid(Widget):
           be overridden by stronger constraints such as fixed sizes or min/max bounds.
         - The constraint `total_size / stretch_factor` is used to maintain
           proportional relationships among rows and columns.
+
+        Returns
+        -------
+        constraints : dict
+            The stretch constraints in the solver, by a key that identifies the terms they relate.
         """
         xmax = len(height_grid)
         ymax = len(width_grid)
 
+        # the terms of each row and column, with a key that identifies them
         stretch_widths = [[] for _ in range(ymax)]
         stretch_heights = [[] for _ in range(xmax)]
 
-        for (y, x, ys, xs, widget) in grid_widgets.values():
-            for ws in width_grid[y:y+ys]:
+        for (key, (y, x, ys, xs, widget)) in grid_widgets.items():
+            for (row, ws) in enumerate(width_grid[y:y+ys], y):
                 total_w = np.sum(ws[x:x+xs])
                 for sw in stretch_widths[y:y+ys]:
-                    sw.append((total_w, widget.stretch[0]))
+                    sw.append(((key, y, x, ys, xs, row), total_w,
+                               widget.stretch[0]))
 
-            for hs in height_grid[x:x+xs]:
+            for (col, hs) in enumerate(height_grid[x:x+xs], x):
                 total_h = np.sum(hs[y:y+ys])
 
                 for sh in stretch_heights[x:x+xs]:
-                    sh.append((total_h, widget.stretch[1]))
+                    sh.append(((key, y, x, ys, xs, col), total_h,
+                               widget.stretch[1]))
 
         for (x, xs) in enumerate(widget_grid):
             for(y, widget) in enumerate(xs):
                 if widget is None:
-                    stretch_widths[y].append((width_grid[y][x], 1))
-                    stretch_heights[x].append((height_grid[x][y], 1))
-
-        for sws in stretch_widths:
-            if len(sws) <= 1:
-                continue
-
-            comparator = sws[0][0] / sws[0][1]
-
-            for (stretch_term, stretch_val) in sws[1:]:
-                solver.addConstraint((comparator == stretch_term/stretch_val) |
-                                     'weak')
-
-        for sws in stretch_heights:
-            if len(sws) <= 1:
+                    stretch_widths[y].append((('cell', x, y), width_grid[y][x], 1))
+                    stretch_heights[x].append((('cell', x, y), height_grid[x][y], 1))
+
+        # each term is constrained relative to the first one of its row or column
+        needed = []
+        for (dim, stretch_terms) in (('w', stretch_widths), ('h', stretch_heights)):
+            for (index, sws) in enumerate(stretch_terms):
+                if len(sws) <= 1:
+                    continue
+                (first, first_term, first_val) = sws[0]
+                for (ident, stretch_term, stretch_val) in sws[1:]:
+                    needed.append(((dim, index, first, first_val, ident, stretch_val),
+                                   first_term, first_val, stretch_term, stretch_val))
+
+        existing = {} if existing is None else dict(existing)
+        constraints = {}
+        for item in needed:
+            if item[0] in existing:
+                constraints[item[0]] = existing.pop(item[0])
+        for constraint in existing.values():
+            solver.removeConstraint(constraint)
+
+        for (key, first_term, first_val, stretch_term, stretch_val) in needed:
+            if key in constraints:
                 continue
-
-            comparator = sws[0][0] / sws[0][1]
-
-            for (stretch_term, stretch_val) in sws[1:]:
-                solver.addConstraint((comparator == stretch_term/stretch_val) |
-                                     'weak')
+            constraint = ((first_term / first_val == stretch_term/stretch_val) |
+                          'weak')
+            solver.addConstraint(constraint)
+            constraints[key] = constraint
+        return constraints
 
     @staticmethod
     def _add_widget_dim_constraints(solver: Solver, width_grid: NDArray[Variable], height_grid: NDArray[Variable],
@@ -441,39 +484,42 @@ class Grid(Widget):
         grid_widgets : dict[int, tuple[int, int, int, int, ViewBox]]
             Dictionary mapping order of viewboxes added as int to their grid layout description:
             (start_y, start_x, span_y, span_x, ViewBox).
-                """
+
+        Returns
+        -------
+        constraints : dict[int, list]
+            The constraints that were added for each key of `grid_widgets`.
+        """
         assert(total_var_w is not None)
         assert(total_var_h is not None)
 
-        for ws in width_grid:
-            for w in ws:
-                solver.addConstraint(w >= 0)
-
-        for hs in height_grid:
-            for h in hs:
-                solver.addConstraint(h >= 0)
-
-        for (_, val) in grid_widgets.items():
+        constraints = {}
+        for (key, val) in grid_widgets.items():
             (y, x, ys, xs, widget) = val
+            added = constraints[key] = []
 
             for ws in width_grid[y:y+ys]:
                 total_w = np.sum(ws[x:x+xs])
                 # assert(total_w is not None)
-                solver.addConstraint(total_w >= widget.width_min)
+                added.append(total_w >= widget.width_min)
 
                 if widget.width_max is not None:
-                    solver.addConstraint(total_w <= widget.width_max)
+                    added.append(total_w <= widget.width_max)
                 else:
-                    solver.addConstraint(total_w <= total_var_w)
+                    added.append(total_w <= total_var_w)
 
             for hs in height_grid[x:x+xs]:
                 total_h = np.sum(hs[y:y+ys])
-                solver.addConstraint(total_h >= widget.height_min)
+                added.append(total_h >= widget.height_min)
 
                 if widget.height_max is not None:
-                    solver.addConstraint(total_h <= widget.height_max)
+                    added.append(total_h <= widget.height_max)
                 else:
-                    solver.addConstraint(total_h <= total_var_h)
+                    added.append(total_h <= total_var_h)
+
+            for constraint in added:
+                solver.addConstraint(constraint)
+        return constraints
 
     def _recreate_solver(self):
         """Recreate the linear system solver with all constraints."""
@@ -491,6 +537,11 @@ class Grid(Widget):
 
         self._solver.addConstraint(self._var_w >= 0)
         self._solver.addConstraint(self._var_h >= 0)
+        self._widget_constraints = {}
+        self._stretch_constraints = {}
+        self._changed_widgets.clear()
+        self._removed_widgets.clear()
+        self._need_stretch_update = False
 
         # add widths
         self._width_grid = np.array(
@@ -531,23 +582,65 @@ class Grid(Widget):
 
         # these are WEAK constraints, so these constraints will never fail
         # with a RequiredFailure.
-        Grid._add_stretch_constraints(self._solver,
-                                      self._width_grid,
-                                      self._height_grid,
-                                      self._grid_widgets,
-                                      self._widget_grid,
-                                      )
-
-        Grid._add_widget_dim_constraints(self._solver,
-                                         self._width_grid,
-                                         self._height_grid,
-                                         self._var_w,
-                                         self._var_h,
-                                         self._grid_widgets
-                                         )
+        self._stretch_constraints = Grid._add_stretch_constraints(
+            self._solver, self._width_grid, self._height_grid,
+            self._grid_widgets, self._widget_grid)
+
+        for dim_grid in (self._width_grid, self._height_grid):
+            for ds in dim_grid:
+                for d in ds:
+                    self._solver.addConstraint(d >= 0)
+
+        self._widget_constraints = Grid._add_widget_dim_constraints(
+            self._solver, self._width_grid, self._height_grid,
+            self._var_w, self._var_h, self._grid_widgets)
 
         self._solver.updateVariables()
 
+    def _update_solver(self):
+        """Apply the grid edits since the last update to the solver.
+
+        The solver is only recreated if the size or the spacing of the grid
+        changed. Otherwise, the constraints of the widgets that were added,
+        removed or changed are replaced, as well as the stretch
+        constraints, which relate all widgets in a row or column.
+
+        Returns
+        -------
+        changed : bool
+            Whether the constraints changed, in which case the variables
+            need to be updated.
+        """
+        key = (self.grid_size, self.spacing, self._n_added > 1)
+        if self._need_solver_recreate or key != self._solver_key:
+            self._need_solver_recreate = False
+            self._solver_key = key
+            self._recreate_solver()
+            return True
+        if not (self._changed_widgets or self._removed_widgets or
+                self._need_stretch_update):
+            return False
+
+        solver = self._solver
+        for key in self._removed_widgets | self._changed_widgets:
+            for constraint in self._widget_constraints.pop(key, ()):
+                solver.removeConstraint(constraint)
+        changed = dict((key, self._grid_widgets[key])
+                       for key in self._changed_widgets)
+        self._changed_widgets.clear()
+        self._removed_widgets.clear()
+        self._widget_constraints.update(Grid._add_widget_dim_constraints(
+            solver, self._width_grid, self._height_grid, self._var_w,
+            self._var_h, changed))
+
+        if self._need_stretch_update:
+            self._need_stretch_update = False
+            self._stretch_constraints = Grid._add_stretch_constraints(
+                solver, self._width_grid, self._height_grid,
+                self._grid_widgets, self._widget_grid,
+                self._stretch_constraints)
+        return True
+
     def _update_child_widget_dim(self):
         """Solve the linear system of equations in order to assign Viewbox parameters such as position."""
         # think in terms of (x, y). (row, col) makes code harder to read
@@ -558,12 +651,10 @@ class Grid(Widget):
         rect = self.rect.padded(self.padding + self.margin)
         if rect.width <= 0 or rect.height <= 0:
             return
-        if self._need_solver_recreate:
-            self._need_solver_recreate = False
-            self._recreate_solver()
+        changed = self._update_solver()
 
-        # we only need to remove and add the height and width constraints of
-        # the solver if they are not the same as the current value
+        # on resize, only the suggested values of the edit variables need
+        # to be updated
         h_changed = abs(rect.height - self._var_h.value()) > 1e-4
         w_changed = abs(rect.width - self._var_w.value()) > 1e-4
         if h_changed:
@@ -571,10 +662,23 @@ class Grid(Widget):
 
         if w_changed:
             self._solver.suggestValue(self._var_w, rect.width)
-        if h_changed or w_changed:
+        # solve once for all the edits since the last draw
+        if changed or h_changed or w_changed:
             self._solver.updateVariables()
 
-        value_vectorized = np.vectorize(lambda x: x.value())
+        layout_key = (tuple(rect.pos), tuple(rect.size), self.padding)
+        if not (changed or h_changed or w_changed or
+                layout_key != self._layout_key):
+            return  # the children are already in place
+        self._layout_key = layout_key
+
+        # offsets of the grid lines along each row and column
+        x_offsets = np.zeros((ymax, xmax + 1))
+        x_offsets[:, 1:] = np.cumsum([[w.value() for w in ws]
+                                      for ws in self._width_grid], axis=1)
+        y_offsets = np.zeros((xmax, ymax + 1))
+        y_offsets[:, 1:] = np.cumsum([[h.value() for h in hs]
+                                      for hs in self._height_grid], axis=1)
 
         if isinstance(self.spacing, tuple):
             width_spacing, height_spacing = self.spacing
@@ -593,20 +697,13 @@ class Grid(Widget):
             width_increase_spacing = width_spacing * (cspan - 1)
             height_increase_spacing = height_spacing * (rspan - 1)
 
-            width = np.sum(value_vectorized(
-                           self._width_grid[row][col:col+cspan])) + width_increase_spacing
-            height = np.sum(value_vectorized(
-                            self._height_grid[col][row:row+rspan])) + height_increase_spacing
-
-            if col == 0:
-                x = 0
-            else:
-                x = np.sum(value_vectorized(self._width_grid[row][:col])) + spacing_width_offset
+            width = (x_offsets[row, col + cspan] - x_offsets[row, col] +
+                     width_increase_spacing)
+            height = (y_offsets[col, row + rspan] - y_offsets[col, row] +
+                      height_increase_spacing)
 
-            if row == 0:
-                y = 0
-            else:
-                y = np.sum(value_vectorized(self._height_grid[col][:row])) + spacing_height_offset
+            x = x_offsets[row, col] + spacing_width_offset
+            y = y_offsets[col, row] + spacing_height_offset
 
             x += self.padding
             y += self.padding
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) Vispy Development Team. All Rights Reserved.
+# Distributed under the (new) BSD License. See LICENSE.txt for more info.
+"""Tests for the layout of Grid widgets."""
+
+import numpy as np
+
+from vispy.scene.widgets import Grid
+from vispy.testing import run_tests_if_main, assert_equal
+
+
+def _layout(grid, rebuild=False):
+    """Lay out the grid and return the rect of each child widget"""
+    if rebuild:
+        Grid._recreate_solver(grid)
+        grid._layout_key = None
+    grid._update_child_widget_dim()
+    return [(tuple(np.round(w.pos, 3)), tuple(np.round(w.size, 3)))
+            for _, (_, _, _, _, w) in sorted(grid._grid_widgets.items())]
+
+
+def test_grid_layout():
+    """Test the positions and sizes of the widgets of a grid"""
+    grid = Grid(spacing=(4, 2))
+    grid.size = (204, 102)
+    a = grid.add_widget(row=0, col=0)
+    b = grid.add_widget(row=0, col=1)
+    c = grid.add_widget(row=1, col=0, col_span=2)
+    grid._update_child_widget_dim()
+    assert_equal(tuple(a.pos), (0, 0))
+    assert_equal(tuple(a.size), (100, 50))
+    assert_equal(tuple(b.pos), (104, 0))
+    assert_equal(tuple(b.size), (100, 50))
+    assert_equal(tuple(c.pos), (0, 52))
+    assert_equal(tuple(c.size), (204, 50))
+
+
+def test_grid_incremental_layout():
+    """Test that the solver of a grid is reused when the layout changes"""
+    grid = Grid(spacing=(3, 2))
+    grid.size = (400, 300)
+    a = grid.add_widget(row=0, col=0)
+    b = grid.add_widget(row=0, col=1, col_span=2)
+    grid.add_widget(row=1, col=0, row_span=2)
+    d = grid.add_widget(row=1, col=2)
+    _layout(grid)
+    recreated = []
+    recreate = grid._recreate_solver
+    grid._recreate_solver = lambda: (recreated.append(1), recreate())
+
+    # resizing the grid only suggests new values for its size
+    grid.size = (500, 250)
+    layout = _layout(grid)
+    assert_equal(recreated, [])
+    assert_equal(layout, _layout(grid, rebuild=True))
+
+    # changes of the stretch and size limits of widgets are applied
+    d.stretch = (3, 1)
+    layout = _layout(grid)
+    assert_equal(recreated, [])
+    assert_equal(layout, _layout(grid, rebuild=True))
+
+    # so are widgets that are removed and added within the grid
+    grid.remove_widget(d)
+    layout = _layout(grid)
+    assert_equal(recreated, [])
+    assert_equal(layout, _layout(grid, rebuild=True))
+    grid.add_widget(row=1, col=2)
+    layout = _layout(grid)
+    assert_equal(recreated, [])
+    assert_equal(layout, _layout(grid, rebuild=True))
+
+    updates = []
+    grid.events.update.connect(updates.append)
+    b.width_max = 50
+    assert len(updates) > 0  # a redraw is requested
+    _layout(grid)
+    assert_equal(recreated, [])
+    assert_equal(b.size[0], 50 + 3)  # the columns plus the spacing
+
+    # growing the grid recreates the solver
+    grid.add_widget(row=3, col=0)
+    _layout(grid)
+    assert_equal(recreated, [1])
+
+    # nothing is laid out again if nothing changed
+    a.pos = (7, 7)
+    _layout(grid)
+    assert_equal(tuple(a.pos), (7, 7))
+
+
+run_tests_if_main()
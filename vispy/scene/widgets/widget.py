@@ -286,7 +286,11 @@ class Widget(Compound):
 
     def _update_layout(self):
         if isinstance(self.parent, Widget):
-            self.parent._update_child_widgets()
+            self.parent._update_child_layout(self)
+
+    def _update_child_layout(self, widget):
+        # Called when the size limits or stretch of a child widget changed
+        self._update_child_widgets()
 
     def _update_clipper(self):
         """Called whenever the clipper for this widget may need to be updated."""
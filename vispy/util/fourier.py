@@ -51,8 +51,17 @@ def stft(x, n_fft=1024, step=512, fs=2*np.pi, window='hann'):
     n_freqs = n_fft // 2 + 1
     n_estimates = (len(x) - n_fft) // step + 1
     result = np.empty((n_freqs, n_estimates), np.complex128)
-    for ii in range(n_estimates):
-        result[:, ii] = np.fft.rfft(w * x[ii * step:ii * step + n_fft]) / n_fft
+    # a strided view with one window per row, transformed in batches of
+    # windows to bound the memory used by the windowed copy
+    x = np.ascontiguousarray(x)
+    windows = np.lib.stride_tricks.as_strided(
+        x, (n_estimates, n_fft), (step * x.strides[0], x.strides[0]),
+        writeable=False)
+    batch = max(2 ** 22 // n_fft, 1)
+    for start in range(0, n_estimates, batch):
+        stop = min(start + batch, n_estimates)
+        spectra = np.fft.rfft(windows[start:stop] * w, axis=1)
+        result[:, start:stop] = spectra.T / n_fft
     return result
 
 
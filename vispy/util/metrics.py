@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+# -----------------------------------------------------------------------------
+# Copyright (c) Vispy Development Team. All Rights Reserved.
+# Distributed under the (new) BSD License. See LICENSE.txt for more info.
+# -----------------------------------------------------------------------------
+"""Collection of per-frame rendering metrics.
+
+A :class:`FrameMetrics` collector is enabled by assigning it to
+``SceneCanvas.metrics``. While enabled, the canvas, the GLIR queue of its
+context and the GLIR parser report to it what was drawn and sent to the GPU
+during each frame. When disabled (the default), the hooks reduce to a check
+for ``None``.
+"""
+
+from __future__ import division
+
+import json
+from collections import deque
+from time import perf_counter, time
+
+import numpy as np
+
+from .event import EmitterGroup, Event
+
+
+# The collector of the canvas that is currently drawing its visuals, so that
+# visuals can report the time spent in _prepare_draw
+_active = None
+
+
+def _upload_kind(class_name):
+    """Classify a GLIR object type for the upload statistics."""
+    if class_name is None:
+        return 'other'
+    if class_name.endswith('Buffer') and class_name not in ('RenderBuffer',
+                                                            'FrameBuffer'):
+        return 'buffer'
+    if class_name.startswith('Texture'):
+        return 'texture'
+    return 'other'
+
+
+class FrameMetrics(object):
+    """Collect rendering metrics for each frame in a ring buffer
+
+    Each frame is recorded as a dict with the following items (all times
+    are in seconds):
+
+    * ``'frame'``: the number of the frame since the collector was created.
+    * ``'time'``: the wall-clock time at which the frame started.
+    * ``'duration'``: the time from the start of the frame until its
+      commands were flushed.
+    * ``'visuals'``: a list with, for each visual that was drawn, its
+      ``'type'``, ``'name'`` and ``'id'``, and the time spent in its
+      ``'prepare'`` step (``_prepare_draw``) and in the rest of its
+      ``'draw'``.
+    * ``'commands'``: the number of GLIR commands by command type (e.g.
+      ``'DRAW'``, ``'UNIFORM'``, ``'DATA'``).
+    * ``'uploads'``: the number of bytes uploaded by ``'buffer'``,
+      ``'texture'`` and ``'other'`` objects.
+    * ``'objects'``: the number of bytes uploaded per GLIR object id.
+    * ``'shader_builds'``: the number of shader programs that were linked.
+    * ``'flush'``: the time spent flushing the GLIR queue, and ``'parse'``
+      the part of it spent executing the commands.
+    * ``'state_changes'``: the GL state counts of the context (see
+      ``GLContext.get_state_counts``).
+
+    Commands that are flushed outside of a draw event (e.g. uploads done
+    while handling an input event) are accounted to the next frame.
+
+    Parameters
+    ----------
+    max_frames : int
+        The number of most recent frames that are kept.
+
+    Examples
+    --------
+    Print the number of draw calls of each frame::
+
+        metrics = FrameMetrics()
+        metrics.events.frame.connect(
+            lambda event: print(event.record['commands'].get('DRAW', 0)))
+        canvas.metrics = metrics
+    """
+
+    def __init__(self, max_frames=120):
+        self._frames = deque(maxlen=int(max_frames))
+        self._record = None
+        self._count = 0
+        self._start = 0.
+        self._prepare = 0.
+        # GLIR object types by id, from the CREATE commands
+        self._object_types = {}
+        self.events = EmitterGroup(source=self, frame=Event)
+
+    @property
+    def max_frames(self):
+        """The number of most recent frames that are kept"""
+        return self._frames.maxlen
+
+    @property
+    def frames(self):
+        """List of the records of the most recent frames, oldest first"""
+        return list(self._frames)
+
+    @property
+    def last(self):
+        """The record of the last completed frame, or None"""
+        return self._frames[-1] if self._frames else None
+
+    def clear(self):
+        """Discard the recorded frames."""
+        self._frames.clear()
+
+    def _current(self):
+        """Get the record of the current frame, starting one if needed."""
+        if self._record is None:
+            self._record = dict(frame=self._count, time=time(),
+                                duration=0., visuals=[], commands={},
+                                uploads=dict(buffer=0, texture=0, other=0),
+                                objects={}, shader_builds=0, flush=0.,
+                                parse=0., state_changes={})
+            self._start = perf_counter()
+        return self._record
+
+    def begin_frame(self):
+        """Start a frame, unless one has been started already."""
+        self._current()
+
+    def end_frame(self, state_counts=None):
+        """Complete the current frame and add its record to the ring buffer
+
+        Parameters
+        ----------
+        state_counts : dict | None
+            The number of GL state changes during the frame.
+        """
+        record = self._current()
+        record['duration'] = perf_counter() - self._start
+        if state_counts:
+            record['state_changes'] = dict(state_counts)
+        self._record = None
+        self._count += 1
+        self._frames.append(record)
+        self.events.frame(record=record)
+
+    def draw_node(self, node):
+        """Draw a node and record the time it took
+
+        Parameters
+        ----------
+        node : instance of Node
+            The node to draw.
+        """
+        global _active
+        record = self._current()
+        previous, _active = _active, self
+        self._prepare = 0.
+        t0 = perf_counter()
+        try:
+            node.draw()
+        finally:
+            _active = previous
+        total = perf_counter() - t0
+        record['visuals'].append(dict(type=type(node).__name__,
+                                      name=getattr(node, 'name', None),
+                                      id=id(node), prepare=self._prepare,
+                                      draw=total - self._prepare))
+
+    def add_prepare(self, seconds):
+        """Add time spent in ``_prepare_draw`` to the node being drawn."""
+        self._prepare += seconds
+
+    def add_commands(self, commands):
+        """Count a list of GLIR commands that is sent to the parser
+
+        Parameters
+        ----------
+        commands : list
+            The GLIR commands.
+        """
+        record = self._current()
+        counts = record['commands']
+        uploads = record['uploads']
+        objects = record['objects']
+        types = self._object_types
+        for command in commands:
+            cmd = command[0]
+            counts[cmd] = counts.get(cmd, 0) + 1
+            if cmd == 'DATA':
+                data = command[3]
+                if isinstance(data, np.ndarray):
+                    id_ = command[1]
+                    kind = _upload_kind(types.get(id_))
+                    uploads[kind] += data.nbytes
+                    objects[id_] = objects.get(id_, 0) + data.nbytes
+            elif cmd == 'LINK':
+                record['shader_builds'] += 1
+            elif cmd == 'CREATE':
+                types[command[1]] = command[2]
+            elif cmd == 'DELETE':
+                types.pop(command[1], None)
+
+    def add_flush(self, seconds):
+        """Add time spent flushing the GLIR queue."""
+        self._current()['flush'] += seconds
+
+    def add_parse(self, seconds):
+        """Add time spent executing GLIR commands."""
+        self._current()['parse'] += seconds
+
+    def to_dict(self):
+        """Export the recorded frames
+
+        Returns
+        -------
+        metrics : dict
+            A dict with the ``'max_frames'`` setting and the list of
+            ``'frames'`` records, oldest first.
+        """
+        return dict(max_frames=self.max_frames, frames=self.frames)
+
+    def to_json(self, **kwargs):
+        """Export the recorded frames as a JSON string
+
+        Parameters
+        ----------
+        **kwargs : dict
+            Keyword arguments passed to ``json.dumps``.
+
+        Returns
+        -------
+        metrics : str
+            The JSON representation of ``to_dict()``.
+        """
+        return json.dumps(self.to_dict(), **kwargs)
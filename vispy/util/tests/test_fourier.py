@@ -27,6 +27,13 @@ def test_stft():
         for res in result.T:
             assert np.allclose(expected, np.abs(res))
             assert np.allclose(expected, np.abs(res))
+    # compare to a window by window computation
+    x = np.random.RandomState(0).randn(1000)
+    result = stft(x, n_fft=64, step=24)
+    assert result.shape == (33, 40)
+    for ii in (0, 17, 39):
+        expected = np.fft.rfft(np.hanning(64) * x[ii * 24:ii * 24 + 64]) / 64
+        assert np.allclose(result[:, ii], expected)
     for n_pts, last_freq in zip((256, 255), (500., 498.)):
         freqs = fft_freqs(n_pts, 1000)
         assert freqs[0] == 0
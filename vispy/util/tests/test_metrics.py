@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) Vispy Development Team. All Rights Reserved.
+# Distributed under the (new) BSD License. See LICENSE.txt for more info.
+import json
+
+import numpy as np
+
+from vispy.gloo.glir import GlirQueue, GlirParser
+from vispy.util import metrics as _metrics
+from vispy.util.metrics import FrameMetrics
+from vispy.testing import run_tests_if_main, assert_equal
+
+
+class _DummyParser(object):
+
+    def __init__(self):
+        self.commands = []
+
+    def parse(self, commands):
+        self.commands.extend(commands)
+
+
+class _DummyNode(object):
+    name = 'dummy'
+
+    def draw(self):
+        _metrics._active.add_prepare(0.25)
+
+
+def test_frame_metrics():
+    """Test recording GLIR commands and visuals per frame"""
+    metrics = FrameMetrics(max_frames=3)
+    records = []
+    metrics.events.frame.connect(lambda event: records.append(event.record))
+
+    queue = GlirQueue()
+    queue.metrics = metrics
+    parser = _DummyParser()
+    data = np.zeros(10, np.float32)
+    queue.command('CREATE', 1, 'VertexBuffer')
+    queue.command('CREATE', 2, 'Texture2D')
+    queue.command('DATA', 1, 0, data)
+    queue.command('DATA', 2, (0, 0), data)
+    queue.command('DATA', 2, (0, 0), data)
+    queue.command('LINK', 3)
+    queue.command('DRAW', 3, 'triangles', (0, 3), 1)
+    queue.flush(parser)
+    assert_equal(len(parser.commands), 7)
+    metrics.draw_node(_DummyNode())
+    assert _metrics._active is None
+    assert metrics.last is None
+    metrics.end_frame(dict(emitted=2, skipped=1))
+
+    record = metrics.last
+    assert records == [record]
+    assert_equal(record['frame'], 0)
+    assert_equal(record['commands'],
+                 dict(CREATE=2, DATA=3, LINK=1, DRAW=1))
+    assert_equal(record['uploads'], dict(buffer=40, texture=80, other=0))
+    assert_equal(record['objects'], {1: 40, 2: 80})
+    assert_equal(record['shader_builds'], 1)
+    assert_equal(record['state_changes'], dict(emitted=2, skipped=1))
+    assert record['flush'] >= 0
+    visual, = record['visuals']
+    assert_equal(visual['type'], '_DummyNode')
+    assert_equal(visual['name'], 'dummy')
+    assert_equal(visual['prepare'], 0.25)
+
+    # object types are remembered across frames, only the last frames kept
+    for _ in range(4):
+        queue.command('DATA', 2, (0, 0), data)
+        queue.flush(parser)
+        metrics.end_frame()
+    assert_equal([r['frame'] for r in metrics.frames], [2, 3, 4])
+    assert_equal(metrics.last['uploads']['texture'], 40)
+    assert_equal(metrics.last['visuals'], [])
+
+    exported = json.loads(metrics.to_json())
+    assert_equal(exported['max_frames'], 3)
+    assert_equal(len(exported['frames']), 3)
+    assert_equal(exported['frames'][-1]['commands'], dict(DATA=1))
+    metrics.clear()
+    assert_equal(metrics.frames, [])
+
+    # the parser reports the time spent executing commands
+    parser = GlirParser()
+    parser.metrics = metrics
+    parser.parse([])
+    metrics.end_frame()
+    assert metrics.last['parse'] >= 0
+
+    # nothing is recorded when disabled
+    queue.metrics = None
+    queue.command('DRAW', 3, 'triangles', (0, 3), 1)
+    queue.flush(_DummyParser())
+    assert_equal(metrics._record, None)
+
+
+run_tests_if_main()
@@ -43,6 +43,8 @@ def use(app=None, gl=None):
         Additional backends:
             * 'jupyter_rfb': show vispy canvases in Jupyter lab/notebook
               (depends on the jupyter_rfb library).
+            * 'asyncio': render canvases offscreen, driving draw events and
+              timers from an asyncio event loop.
 
     gl : str
         The gl backend to use (case insensitive). Options are:
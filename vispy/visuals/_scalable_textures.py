@@ -321,6 +321,12 @@ class CPUScaledTextureMixin(_ScaledTextureMixin):
 
         clim = self._clim
         is_auto = isinstance(clim, str) and clim == 'auto'
+        if offset is not None and self._data_limits is not None:
+            # partial update: scale like the data already in the texture
+            if data.ndim == self._ndim or data.shape[self._ndim] == 1:
+                data = self._scale_data_on_cpu(data, self._data_limits,
+                                               copy=False)
+            return super().scale_and_set_data(data, offset=offset, copy=False)
         if data.ndim == self._ndim or data.shape[self._ndim] == 1:
             if is_auto:
                 clim = get_default_clim_from_data(data)
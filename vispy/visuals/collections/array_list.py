@@ -270,8 +270,8 @@ class ArrayList(object):
 
         # Update other items
         size = dstop - dstart
-        self._items[istart:istop + size + 1] -= size, size
         self._count -= istop - istart
+        self._items[istart:self._count] -= size, size
 
     def insert(self, index, data, itemsize=None):
         """Insert data before index
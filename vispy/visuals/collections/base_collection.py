@@ -45,7 +45,7 @@ class Item(object):
             Collection this item belongs to
 
         key : int
-            Collection index of this item
+            Slot of this item in the collection
 
         vertices: array-like
             Vertices of the item
@@ -69,6 +69,7 @@ class Item(object):
     @vertices.setter
     def vertices(self, data):
         self._vertices[...] = np.array(data)
+        self._parent._item_changed(self._key, vertices=True)
 
     @property
     def indices(self):
@@ -78,8 +79,9 @@ class Item(object):
     def indices(self, data):
         if self._indices is None:
             raise ValueError("Item has no indices")
-        start = self._parent.vertices._items[self._key][0]
+        start = self._parent._vertices_list._items[self._key][0]
         self._indices[...] = np.array(data) + start
+        self._parent._item_changed(self._key, indices=True)
 
     @property
     def uniforms(self):
@@ -90,6 +92,7 @@ class Item(object):
         if self._uniforms is None:
             raise ValueError("Item has no associated uniform")
         self._uniforms[...] = data
+        self._parent._item_changed(self._key, uniforms=True)
 
     def __getitem__(self, key):
         """Get a specific uniforms value"""
@@ -104,8 +107,10 @@ class Item(object):
         """Set a specific uniforms value"""
         if key in self._vertices.dtype.names:
             self._vertices[key] = value
+            self._parent._item_changed(self._key, vertices=True)
         elif key in self._uniforms.dtype.names:
             self._uniforms[key] = value
+            self._parent._item_changed(self._key, uniforms=True)
         else:
             raise IndexError("Unknown key")
 
@@ -116,6 +121,24 @@ class Item(object):
 
 
 class BaseCollection(object):
+    """
+    Base class of collections
+
+    Items are stored in slots of the vertex, index and uniform lists. The
+    GPU buffers and texture are kept from one update to the next, and only
+    the ranges of the lists that changed since the last update are
+    uploaded.
+
+    In indexed collections, deleting an item leaves a tombstone: its
+    indices are made degenerate and its slot is put on a free list, to be
+    reused by the next appended item that fits in it. The tombstones are
+    compacted when they hold more than ``compact_threshold`` of the
+    vertices. Other collections move the following items when an item is
+    deleted.
+    """
+
+    # Fraction of the vertices in tombstones above which they are compacted
+    compact_threshold = 0.5
 
     def __init__(self, vtype, utype=None, itype=None):
 
@@ -131,6 +154,16 @@ class BaseCollection(object):
         self._uniforms_list = None
         self._uniforms_texture = None
 
+        # Slots of the items (in order), sizes of the items in each slot,
+        # free slots and number of vertices they hold
+        self._slots = []
+        self._slot_sizes = []
+        self._free_slots = []
+        self._free_vertices = 0
+
+        # Ranges of the lists to upload at the next update
+        self._dirty = {}
+
         # Make sure types are np.dtype (or None)
         vtype = np.dtype(vtype) if vtype is not None else None
         itype = np.dtype(itype) if itype is not None else None
@@ -200,7 +233,7 @@ class BaseCollection(object):
 
     def __len__(self):
         """x.__len__() <==> len(x)"""
-        return len(self._vertices_list)
+        return len(self._slots)
 
     @property
     def vtype(self):
@@ -217,6 +250,29 @@ class BaseCollection(object):
         """Uniforms dtype"""
         return self._utype
 
+    def reserve(self, vertices=None, indices=None, items=None):
+        """
+        Reserve capacity such that items can be appended without growing
+        the lists and GPU buffers. Capacity grows to the next power of two.
+
+        Parameters
+        ----------
+        vertices : int | None
+            Total number of vertices
+
+        indices : int | None
+            Total number of indices
+
+        items : int | None
+            Total number of items
+        """
+        if vertices is not None:
+            self._vertices_list.reserve(vertices)
+        if indices is not None and self._indices_list is not None:
+            self._indices_list.reserve(indices)
+        if items is not None and self._uniforms_list is not None:
+            self._uniforms_list.reserve(items)
+
     def append(self, vertices, uniforms=None, indices=None, itemsize=None):
         """
         Parameters
@@ -245,61 +301,107 @@ class BaseCollection(object):
         # -----------------------------
         vertices = np.array(vertices).astype(self.vtype).ravel()
         vsize = self._vertices_list.size
+        slot = len(self._vertices_list)
 
         # No itemsize given
         # -----------------
         if itemsize is None:
             index = 0
             count = 1
+            sizes = [len(vertices)]
 
         # Uniform itemsize (int)
         # ----------------------
         elif isinstance(itemsize, int):
-            count = len(vertices) / itemsize
+            count = len(vertices) // itemsize
             index = np.repeat(np.arange(count), itemsize)
+            sizes = [itemsize] * count
 
         # Individual itemsize (array)
         # ---------------------------
         elif isinstance(itemsize, (np.ndarray, list)):
             count = len(itemsize)
             index = np.repeat(np.arange(count), itemsize)
+            sizes = list(itemsize)
         else:
             raise ValueError("Itemsize not understood")
 
+        # Uniforms
+        # -----------------------------
         if self.utype:
-            vertices["collection_index"] = index + len(self)
-        self._vertices_list.append(vertices, itemsize)
+            if uniforms is None:
+                uniforms = np.zeros(count, dtype=self.utype)
+            else:
+                uniforms = np.array(uniforms).astype(self.utype).ravel()
 
         # Indices
         # -----------------------------
         if self.itype is not None:
             # No indices given (-> automatic generation)
             if indices is None:
-                indices = vsize + np.arange(len(vertices))
-                self._indices_list.append(indices, itemsize)
+                idxs = np.arange(len(vertices))
+                isizes = sizes
 
             # Indices given
             # FIXME: variables indices (list of list or ArrayList)
             else:
                 if itemsize is None:
-                    idxs = np.array(indices) + vsize
+                    idxs = np.array(indices)
+                    isizes = [len(idxs)]
                 elif isinstance(itemsize, int):
-                    idxs = vsize + (np.tile(indices, count) +
-                                    itemsize * np.repeat(np.arange(count), len(indices)))  # noqa
+                    idxs = (np.tile(indices, count) +
+                            itemsize * np.repeat(np.arange(count), len(indices)))  # noqa
+                    isizes = [len(indices)] * count
                 else:
                     raise ValueError("Indices not compatible with items")
-                self._indices_list.append(idxs, len(indices))
 
-        # Uniforms
-        # -----------------------------
+            # Reuse a free slot for a single item
+            if count == 1 and self._reuse_slot(vertices, uniforms, idxs):
+                return
+
+            self._indices_list.append(idxs + vsize, isizes)
+            self._mark_dirty('indices', self._indices_list.size - len(idxs),
+                             self._indices_list.size)
+        else:
+            isizes = [0] * count
+
         if self.utype:
-            if uniforms is None:
-                uniforms = np.zeros(count, dtype=self.utype)
-            else:
-                uniforms = np.array(uniforms).astype(self.utype).ravel()
+            vertices["collection_index"] = index + slot
             self._uniforms_list.append(uniforms, itemsize=1)
+            self._mark_dirty('uniforms', slot, slot + count)
+        self._vertices_list.append(vertices, itemsize)
+        self._mark_dirty('vertices', vsize, self._vertices_list.size)
+
+        self._slots.extend(range(slot, slot + count))
+        self._slot_sizes.extend(zip(sizes, isizes))
+
+    def _reuse_slot(self, vertices, uniforms, indices):
+        """Store a single item in the first free slot large enough to hold
+        it, and return whether one was found."""
+        nv, ni = len(vertices), len(indices)
+        for slot in self._free_slots:
+            vstart, vstop = self._vertices_list._items[slot]
+            istart, istop = self._indices_list._items[slot]
+            if vstop - vstart >= nv and istop - istart >= ni:
+                break
+        else:
+            return False
 
-        self._need_update = True
+        self._free_slots.remove(slot)
+        self._free_vertices -= vstop - vstart
+        if self.utype:
+            vertices["collection_index"] = slot
+            self._uniforms_list._data[slot:slot + 1] = uniforms
+            self._mark_dirty('uniforms', slot, slot + 1)
+        self._vertices_list._data[vstart:vstart + nv] = vertices
+        self._mark_dirty('vertices', vstart, vstart + nv)
+        # Unused indices of the slot stay degenerate
+        self._indices_list._data[istart:istart + ni] = indices + vstart
+        self._mark_dirty('indices', istart, istart + ni)
+
+        self._slots.append(slot)
+        self._slot_sizes[slot] = (nv, ni)
+        return True
 
     def __delitem__(self, index):
         """x.__delitem__(y) <==> del x[y]"""
@@ -307,7 +409,7 @@ class BaseCollection(object):
         if isinstance(index, int):
             if index < 0:
                 index += len(self)
-            if index < 0 or index > len(self):
+            if index < 0 or index >= len(self):
                 raise IndexError("Collection deletion index out of range")
             istart, istop = index, index + 1
         # Deleting several items
@@ -324,64 +426,169 @@ class BaseCollection(object):
         else:
             raise TypeError("Collection deletion indices must be integers")
 
-        vsize = len(self._vertices_list[index])
+        # Indexed collections leave tombstones
         if self.itype is not None:
-            del self._indices_list[index]
-            self._indices_list[index:] -= vsize
-
+            for slot in self._slots[istart:istop]:
+                vstart, vstop = self._vertices_list._items[slot]
+                start, stop = self._indices_list._items[slot]
+                self._indices_list._data[start:stop] = vstart
+                self._mark_dirty('indices', start, stop)
+                self._free_slots.append(slot)
+                self._free_vertices += vstop - vstart
+            del self._slots[istart:istop]
+            if (self._free_vertices >
+                    self.compact_threshold * self._vertices_list.size):
+                self.compact()
+            return
+
+        # Other collections move the following items
+        vstart = self._vertices_list._items[istart][0]
         if self.utype:
-            self._vertices_list[index:]["collection_index"] -= istop - istart
-        del self._vertices_list[index]
+            self._vertices_list[istop:]["collection_index"] -= istop - istart
+        del self._vertices_list[istart:istop]
+        self._mark_dirty('vertices', vstart, self._vertices_list.size)
 
         if self.utype is not None:
-            del self._uniforms_list[index]
+            del self._uniforms_list[istart:istop]
+            self._mark_dirty('uniforms', istart, len(self._uniforms_list))
+
+        del self._slots[len(self._slots) - (istop - istart):]
+        del self._slot_sizes[istart:istop]
+
+    def compact(self):
+        """Remove the tombstones left by deleted items."""
+        if not self._free_slots:
+            return
+        V, I, U = (self._vertices_list, self._indices_list,
+                   self._uniforms_list)
+        if not self._slots:
+            self._vertices_list = self._new_list(V._data[:0], None, V)
+            self._indices_list = self._new_list(I._data[:0], None, I)
+            if self.utype:
+                self._uniforms_list = self._new_list(U._data[:0], None, U)
+            self._slot_sizes = []
+            self._free_slots = []
+            self._free_vertices = 0
+            self._dirty = {'vertices': None, 'indices': None,
+                           'uniforms': None}
+            self._need_update = True
+            return
+        vranges = [V._items[slot] for slot in self._slots]
+        iranges = [I._items[slot] for slot in self._slots]
+        sizes = [self._slot_sizes[slot] for slot in self._slots]
+        vsizes = [nv for nv, ni in sizes]
+        isizes = [ni for nv, ni in sizes]
+        vertices = np.concatenate(
+            [V._data[start:start + nv]
+             for (start, _), nv in zip(vranges, vsizes)] +
+            [V._data[:0]])
+        # Offset of the vertices of each item, from its old to its new slot
+        offsets = np.cumsum([0] + vsizes[:-1]) - [start for start, _ in
+                                                  vranges]
+        indices = np.concatenate(
+            [I._data[start:start + ni].astype(np.int64) + offset
+             for (start, _), ni, offset in zip(iranges, isizes, offsets)] +
+            [np.zeros(0, np.int64)])
+        if self.utype:
+            vertices["collection_index"] = np.repeat(
+                np.arange(len(self._slots)), vsizes)
+            uniforms = U._data[self._slots]
+            self._uniforms_list = self._new_list(uniforms, 1, U)
+        self._vertices_list = self._new_list(vertices, vsizes, V)
+        self._indices_list = self._new_list(indices, isizes, I)
+
+        self._slots = list(range(len(self._slots)))
+        self._slot_sizes = sizes
+        self._free_slots = []
+        self._free_vertices = 0
+        self._dirty = {'vertices': None, 'indices': None, 'uniforms': None}
+        self._need_update = True
 
+    @staticmethod
+    def _new_list(data, itemsize, old):
+        """Create a list with the given items and the capacity of *old*"""
+        new = ArrayList(dtype=old.dtype)
+        new.reserve(len(old._data))
+        if len(data):
+            new.append(data.astype(old.dtype), itemsize)
+        return new
+
+    def _mark_dirty(self, name, start=None, stop=None):
+        """Mark a range of the vertex, index or uniform list for upload
+        (all of it if start is None)"""
         self._need_update = True
+        if name in self._dirty:
+            dirty = self._dirty[name]
+            if dirty is None:
+                return
+            if start is None:
+                self._dirty[name] = None
+            else:
+                self._dirty[name] = (min(dirty[0], start), max(dirty[1], stop))
+        else:
+            self._dirty[name] = None if start is None else (start, stop)
+
+    def _item_changed(self, slot, vertices=False, indices=False,
+                      uniforms=False):
+        """Mark the data of the item in a slot for upload"""
+        if vertices:
+            self._mark_dirty('vertices', *self._vertices_list._items[slot])
+        if indices:
+            self._mark_dirty('indices', *self._indices_list._items[slot])
+        if uniforms:
+            self._mark_dirty('uniforms', slot, slot + 1)
+
+    def _field_rows(self, uniforms=False):
+        """Rows of the vertex (or uniform) list that hold the items, in the
+        order of the items, or None if these are all the rows in order"""
+        if uniforms:
+            rows = np.array(self._slots, dtype=np.intp)
+            total = len(self._uniforms_list)
+        else:
+            V = self._vertices_list
+            rows = [np.arange(V._items[slot][0],
+                              V._items[slot][0] + self._slot_sizes[slot][0])
+                    for slot in self._slots]
+            rows = np.concatenate(rows + [np.zeros(0, np.intp)])
+            total = V.size
+        if len(rows) == total and np.array_equal(rows, np.arange(total)):
+            return None
+        return rows
 
     def __getitem__(self, key):
         """ """
-        # WARNING
-        # Here we want to make sure to use buffers and texture (instead of
-        # lists) since only them are aware of any external modification.
-        if self._need_update:
-            self._update()
-
-        V = self._vertices_buffer
-        idxs = None
-        U = None
-        if self._indices_list is not None:
-            idxs = self._indices_buffer
-        if self._uniforms_list is not None:
-            U = self._uniforms_texture.data.ravel().view(self.utype)
-
-        # Getting a whole field
+        V = self._vertices_list
+        U = self._uniforms_list
+
+        # Getting a whole field (a copy if items were deleted or reused)
         if isinstance(key, str):
             # Getting a named field from vertices
             if key in V.dtype.names:
-                return V[key]
+                rows = self._field_rows()
+                return V.data[key] if rows is None else V._data[key][rows]
             # Getting a named field from uniforms
             elif U is not None and key in U.dtype.names:
-                # Careful, U is the whole texture that can be bigger than list
-                # return U[key]
-                return U[key][:len(self._uniforms_list)]
+                rows = self._field_rows(uniforms=True)
+                return U.data[key] if rows is None else U._data[key][rows]
             else:
                 raise IndexError("Unknown field name ('%s')" % key)
 
         # Getting individual item
         elif isinstance(key, int):
-            vstart, vend = self._vertices_list._items[key]
-            vertices = V[vstart:vend]
+            slot = self._slots[key]
+            nv, ni = self._slot_sizes[slot]
+            vstart = V._items[slot][0]
+            vertices = V._data[vstart:vstart + nv]
             indices = None
             uniforms = None
-            if idxs is not None:
-                istart, iend = self._indices_list._items[key]
-                indices = idxs[istart:iend]
+            if self._indices_list is not None:
+                istart = self._indices_list._items[slot][0]
+                indices = self._indices_list._data[istart:istart + ni]
 
             if U is not None:
-                ustart, uend = self._uniforms_list._items[key]
-                uniforms = U[ustart:uend]
+                uniforms = U._data[slot:slot + 1]
 
-            return Item(self, key, vertices, indices, uniforms)
+            return Item(self, slot, vertices, indices, uniforms)
 
         # Error
         else:
@@ -397,30 +604,24 @@ class BaseCollection(object):
         #         found = True
         # if found: return
 
-        # WARNING
-        # Here we want to make sure to use buffers and texture (instead of
-        # lists) since only them are aware of any external modification.
-        if self._need_update:
-            self._update()
-
-        V = self._vertices_buffer
-        # I = None
-        U = None
-        # if self._indices_list is not None:
-        #     I = self._indices_buffer  # noqa
-        if self._uniforms_list is not None:
-            U = self._uniforms_texture.data.ravel().view(self.utype)
-
         # Setting a whole field
         if isinstance(key, str):
             # Setting a named field in vertices
             if key in self.vtype.names:
-                V[key] = data
+                rows = self._field_rows()
+                if rows is None:
+                    self._vertices_list[key] = data
+                else:
+                    self._vertices_list._data[key][rows] = data
+                self._mark_dirty('vertices')
             # Setting a named field in uniforms
             elif self.utype and key in self.utype.names:
-                # Careful, U is the whole texture that can be bigger than list
-                # U[key] = data
-                U[key][:len(self._uniforms_list)] = data
+                rows = self._field_rows(uniforms=True)
+                if rows is None:
+                    self._uniforms_list[key] = data
+                else:
+                    self._uniforms_list._data[key][rows] = data
+                self._mark_dirty('uniforms')
             else:
                 raise IndexError("Unknown field name ('%s')" % key)
 
@@ -448,21 +649,43 @@ class BaseCollection(object):
         self._ushape = shape
         return shape
 
+    def _upload(self, buffer, data, name):
+        """Upload the dirty range of a list to a buffer, or all of its
+        data if the size of the buffer changes. Return whether the buffer
+        was resized."""
+        dirty = self._dirty.pop(name, False)
+        if buffer.size != len(data) or buffer.dtype != data.dtype:
+            buffer.set_data(data)
+            return True
+        if dirty is None:
+            buffer.set_subdata(data)
+        elif dirty:
+            start, stop = dirty
+            if stop > start:
+                buffer.set_subdata(data[start:stop], offset=start)
+        return False
+
     def _update(self):
         """Update vertex buffers & texture"""
-        if self._vertices_buffer is not None:
-            self._vertices_buffer.delete()
-        self._vertices_buffer = VertexBuffer(self._vertices_list.data)
+        rebind = False
+        if self._vertices_buffer is None:
+            self._vertices_buffer = VertexBuffer()
+            rebind = True
+        # Indexed collections only draw the vertices they refer to, so the
+        # buffer can have the capacity of the list
+        if self.itype is not None:
+            vertices = self._vertices_list._data
+        else:
+            vertices = self._vertices_list.data
+        rebind |= self._upload(self._vertices_buffer, vertices, 'vertices')
 
         if self.itype is not None:
-            if self._indices_buffer is not None:
-                self._indices_buffer.delete()
-            self._indices_buffer = IndexBuffer(self._indices_list.data)
+            if self._indices_buffer is None:
+                self._indices_buffer = IndexBuffer()
+            self._upload(self._indices_buffer, self._indices_list.data,
+                         'indices')
 
         if self.utype is not None:
-            if self._uniforms_texture is not None:
-                self._uniforms_texture.delete()
-
             # We take the whole array (_data), not the data one
             texture = self._uniforms_list._data.view(np.float32)
             size = len(texture) / self._uniforms_float_count
@@ -470,11 +693,30 @@ class BaseCollection(object):
 
             # shape[2] = float count is only used in vertex shader code
             texture = texture.reshape(shape[0], shape[1], 4)
-            self._uniforms_texture = Texture2D(texture)
+            dirty = self._dirty.pop('uniforms', False)
+            if self._uniforms_texture is None:
+                self._uniforms_texture = Texture2D(texture)
+                self._uniforms_texture.interpolation = 'nearest'
+                rebind = True
+            elif self._uniforms_texture.shape != texture.shape:
+                self._uniforms_texture.set_data(texture)
+                rebind = True
+            elif dirty is None:
+                self._uniforms_texture.set_data(texture)
+            elif dirty:
+                # Upload the rows of texels holding the dirty uniforms
+                count = self._uniforms_float_count
+                cols = shape[1]
+                start = dirty[0] * count // 4 // cols
+                stop = -(-dirty[1] * count // 4 // cols)
+                self._uniforms_texture.set_data(texture[start:stop],
+                                                offset=(start, 0))
             self._uniforms_texture.data = texture
-            self._uniforms_texture.interpolation = 'nearest'
 
-        if len(self._programs):
+        self._dirty.clear()
+        self._need_update = False
+
+        if rebind and len(self._programs):
             for program in self._programs:
                 program.bind(self._vertices_buffer)
                 if self._uniforms_list is not None:
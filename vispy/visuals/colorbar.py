@@ -149,8 +149,6 @@ class _CoreColorBarVisual(Visual):
 
         self.shared_program['a_position'] = vertices
 
-        self.shared_program['texture2D_LUT'] = self._cmap.texture_lut()
-
     @staticmethod
     @lru_cache(maxsize=4)
     def _get_texcoord_func(orientation):
@@ -213,6 +211,7 @@ class _CoreColorBarVisual(Visual):
 
     def _prepare_draw(self, view):
         self._draw_mode = "triangles"
+        self._set_lut_texture(self.shared_program, self._cmap)
         return True
 
 
@@ -8,10 +8,15 @@ Graph Visual
 This visual can be used to visualise graphs or networks.
 """
 
+import numpy as np
+
+from ...color import ColorArray
 from ..visual import CompoundVisual
 from ..line import ArrowVisual
 from ..markers import MarkersVisual
 from . import layouts
+from .layouts.force_directed import _relax_nodes
+from .util import issparse
 
 
 class GraphVisual(CompoundVisual):
@@ -48,6 +53,19 @@ class GraphVisual(CompoundVisual):
         The face color for nodes.
     border_width : number
         The border size for nodes.
+    relax_iterations : int
+        The number of force-directed iterations used to adapt the layout
+        around the nodes affected by :meth:`add_nodes`, :meth:`remove_nodes`,
+        :meth:`add_edges` and :meth:`remove_edges`.
+
+    Notes
+    -----
+    The incremental methods keep the current node positions and only move
+    the affected nodes and their neighbors, after which only the changed
+    ranges of the GPU buffers are uploaded. This makes them suitable for
+    dynamic graphs where a few nodes or edges change at a time. The edges
+    are then drawn as straight lines between the nodes, independently of
+    the layout.
 
     See Also
     --------
@@ -69,7 +87,7 @@ class GraphVisual(CompoundVisual):
                  animate=False, line_color=None, line_width=None,
                  arrow_type=None, arrow_size=None, node_symbol=None,
                  node_size=None, border_color=None, face_color=None,
-                 border_width=None):
+                 border_width=None, relax_iterations=10):
 
         self._edges = ArrowVisual(method='gl', connect='segments')
         self._nodes = MarkersVisual()
@@ -79,6 +97,16 @@ class GraphVisual(CompoundVisual):
         self._node_properties = {}
 
         self._adjacency_mat = None
+        self._adjacency_stale = False
+
+        # State for incremental updates. The edges are drawn by indexing the
+        # node positions; unused edge slots are (0, 0) and draw nothing.
+        self._node_pos = None
+        self._node_placed = None
+        self._edge_slots = None
+        self._edge_weights = None
+        self._edge_used = None
+        self.relax_iterations = relax_iterations
 
         self._layout = None
         self._layout_iter = None
@@ -100,6 +128,9 @@ class GraphVisual(CompoundVisual):
 
     @property
     def adjacency_matrix(self):
+        if self._adjacency_stale:
+            self._adjacency_mat = self._edges_to_adjacency()
+            self._adjacency_stale = False
         return self._adjacency_mat
 
     @property
@@ -138,7 +169,7 @@ class GraphVisual(CompoundVisual):
                 raise ValueError("No adjacency matrix set yet. An adjacency "
                                  "matrix is required to calculate the layout.")
 
-            self._layout_iter = iter(self._layout(self._adjacency_mat,
+            self._layout_iter = iter(self._layout(self.adjacency_matrix,
                                                   self._directed))
 
         try:
@@ -146,12 +177,7 @@ class GraphVisual(CompoundVisual):
         except StopIteration:
             return True
 
-        self._nodes.set_data(pos=node_vertices, **self._node_data)
-        for k, v in self._node_properties.items():
-            setattr(self._nodes, k, v)
-
-        self._edges.set_data(pos=line_vertices, arrows=arrows,
-                             **self._arrow_data)
+        self._set_layout_data(node_vertices, line_vertices, arrows)
 
         return False
 
@@ -161,7 +187,7 @@ class GraphVisual(CompoundVisual):
                 raise ValueError("No adjacency matrix set yet. An adjacency "
                                  "matrix is required to calculate the layout.")
 
-            self._layout_iter = iter(self._layout(self._adjacency_mat,
+            self._layout_iter = iter(self._layout(self.adjacency_matrix,
                                                   self._directed))
 
         # Calculate the final position of the nodes and lines
@@ -171,12 +197,22 @@ class GraphVisual(CompoundVisual):
         for node_vertices, line_vertices, arrows in self._layout_iter:
             pass
 
+        self._set_layout_data(node_vertices, line_vertices, arrows)
+
+    def _set_layout_data(self, node_vertices, line_vertices, arrows):
+        # the layout takes over from any incremental updates
+        self._edge_slots = None
+        if node_vertices is not None:
+            # layouts may update their positions in place
+            self._node_pos = np.array(node_vertices, dtype=np.float32)
+            self._node_placed = np.ones(len(node_vertices), bool)
+
         self._nodes.set_data(pos=node_vertices, **self._node_data)
         for k, v in self._node_properties.items():
             setattr(self._nodes, k, v)
 
         self._edges.set_data(pos=line_vertices, arrows=arrows,
-                             **self._arrow_data)
+                             connect='segments', **self._arrow_data)
 
     def reset_layout(self):
         self._layout_iter = None
@@ -196,6 +232,8 @@ class GraphVisual(CompoundVisual):
                 raise ValueError("Adjacency matrix should be square.")
 
             self._adjacency_mat = adjacency_mat
+            self._adjacency_stale = False
+            self._edge_slots = None
 
         for k in self._arrow_attributes:
             if k in kwargs:
@@ -236,5 +274,313 @@ class GraphVisual(CompoundVisual):
         self._node_data = node_kwargs
         self._node_properties = node_properties
 
-        if not self._animate:
+        if self._edge_slots is not None:
+            self._upload_incremental()
+        elif not self._animate:
             self.set_final_layout()
+
+    def add_nodes(self, n=1, pos=None):
+        """Add nodes to the graph, keeping the current layout.
+
+        Parameters
+        ----------
+        n : int
+            The number of nodes to add. Ignored if *pos* is given.
+        pos : array | None
+            The (n, 2) positions of the new nodes. By default, a new node is
+            placed next to its neighbors once edges to it are added.
+
+        Returns
+        -------
+        indices : ndarray
+            The indices of the new nodes.
+        """
+        self._start_incremental()
+        placed = pos is not None
+        if pos is None:
+            pos = np.random.random((n, 2))
+        pos = np.asarray(pos, dtype=np.float32).reshape(-1, 2)
+
+        n_nodes = len(self._node_pos)
+        # the new nodes are drawn like the last node
+        self._update_node_data(
+            lambda values: np.concatenate(
+                (values, np.repeat(values[-1:], len(pos), axis=0))))
+        self._node_pos = np.concatenate((self._node_pos, pos))
+        self._node_placed = np.concatenate(
+            (self._node_placed, np.full(len(pos), placed)))
+        self._adjacency_stale = True
+        # the buffers change size, so everything is uploaded
+        self._upload_incremental()
+        return np.arange(n_nodes, n_nodes + len(pos))
+
+    def remove_nodes(self, nodes):
+        """Remove nodes and their edges from the graph.
+
+        The remaining nodes are renumbered to keep the indices contiguous,
+        like removing rows and columns from the adjacency matrix.
+
+        Parameters
+        ----------
+        nodes : array-like
+            The indices of the nodes to remove.
+        """
+        self._start_incremental()
+        n_nodes = len(self._node_pos)
+        nodes = self._check_nodes(nodes)
+        keep = np.ones(n_nodes, bool)
+        keep[nodes] = False
+
+        slots = self._edge_slots.astype(np.intp)
+        used = self._edge_used
+        kept = used & keep[slots[:, 0]] & keep[slots[:, 1]]
+        # the nodes that lose an edge are relaxed afterwards
+        neighbors = slots[used & ~kept].ravel()
+        neighbors = neighbors[keep[neighbors]]
+
+        new_index = np.cumsum(keep) - 1
+        self._update_node_data(lambda values: values[keep])
+        self._node_pos = self._node_pos[keep]
+        self._node_placed = self._node_placed[keep]
+        self._set_edges(new_index[slots[kept]], self._edge_weights[kept])
+        self._adjacency_stale = True
+        self._upload_incremental()
+        self._relax(new_index[neighbors])
+
+    def add_edges(self, edges, weights=1.):
+        """Add edges to the graph and relax the layout around them.
+
+        Parameters
+        ----------
+        edges : array-like
+            The (n, 2) indices of the nodes to connect. For undirected graphs
+            the reversed edges are added as well, so that the adjacency matrix
+            stays symmetric. Edges that exist already get the new weight.
+        weights : float | array-like
+            The weights of the edges in the adjacency matrix.
+        """
+        self._start_incremental()
+        edges = self._check_nodes(edges, unique=False).reshape(-1, 2)
+        weights = np.broadcast_to(np.asarray(weights, float), (len(edges),))
+        if not self._directed:
+            edges = np.concatenate((edges, edges[:, ::-1]))
+            weights = np.concatenate((weights, weights))
+        keys, first = np.unique(self._edge_keys(edges), return_index=True)
+        edges, weights = edges[first], weights[first]
+
+        # existing edges only get their weight updated
+        used = np.flatnonzero(self._edge_used)
+        used_keys = self._edge_keys(self._edge_slots[used])
+        existing = np.isin(used_keys, keys)
+        self._edge_weights[used[existing]] = weights[
+            np.searchsorted(keys, used_keys[existing])]
+        new = ~np.isin(keys, used_keys)
+        edges, weights = edges[new], weights[new]
+
+        self._place_nodes(edges)
+
+        free = np.flatnonzero(~self._edge_used)
+        if len(free) < len(edges):
+            # grow geometrically and upload all edges again
+            capacity = max(2 * len(self._edge_slots),
+                           len(used) + len(edges))
+            self._set_edges(np.concatenate((self._edge_slots[used], edges)),
+                            np.concatenate((self._edge_weights[used],
+                                            weights)), capacity)
+            self._edges.set_data(connect=self._edge_slots)
+        else:
+            slots = free[:len(edges)]
+            self._edge_slots[slots] = edges
+            self._edge_weights[slots] = weights
+            self._edge_used[slots] = True
+            self._update_edge_slots(slots)
+        self._adjacency_stale = True
+        self._relax(edges.ravel())
+
+    def remove_edges(self, edges):
+        """Remove edges from the graph and relax the layout around them.
+
+        Parameters
+        ----------
+        edges : array-like
+            The (n, 2) indices of the connected nodes. For undirected graphs
+            the reversed edges are removed as well.
+        """
+        self._start_incremental()
+        edges = self._check_nodes(edges, unique=False).reshape(-1, 2)
+        if not self._directed:
+            edges = np.concatenate((edges, edges[:, ::-1]))
+        used = np.flatnonzero(self._edge_used)
+        slots = used[np.isin(self._edge_keys(self._edge_slots[used]),
+                             self._edge_keys(edges))]
+        nodes = self._edge_slots[slots].ravel()
+        self._edge_slots[slots] = 0
+        self._edge_weights[slots] = 0
+        self._edge_used[slots] = False
+        self._update_edge_slots(slots)
+        self._adjacency_stale = True
+        self._relax(nodes)
+
+    def _check_nodes(self, nodes, unique=True):
+        nodes = np.asarray(nodes, dtype=np.intp)
+        if nodes.size and (nodes.min() < 0 or
+                           nodes.max() >= len(self._node_pos)):
+            raise IndexError("Node indices must be between 0 and %d"
+                             % (len(self._node_pos) - 1))
+        return np.unique(nodes) if unique else nodes
+
+    def _edge_keys(self, edges):
+        edges = np.asarray(edges, dtype=np.int64)
+        return edges[:, 0] * len(self._node_pos) + edges[:, 1]
+
+    def _start_incremental(self):
+        """Switch to edges drawn by indexing the node positions"""
+        if self._edge_slots is not None:
+            return
+        if self._node_pos is None:
+            if self._adjacency_mat is None:
+                raise ValueError("No adjacency matrix set yet. An adjacency "
+                                 "matrix is required to calculate the layout.")
+            self.reset_layout()
+            self.set_final_layout()
+
+        adjacency = self.adjacency_matrix
+        if issparse(adjacency):
+            adjacency = adjacency.tocoo()
+            edges = np.stack((adjacency.row, adjacency.col), axis=1)
+            weights = adjacency.data
+        else:
+            adjacency = np.asarray(adjacency)
+            edges = np.stack(np.nonzero(adjacency), axis=1)
+            weights = adjacency[edges[:, 0], edges[:, 1]]
+        self._set_edges(edges, weights)
+        self._upload_incremental()
+
+    def _set_edges(self, edges, weights, capacity=None):
+        n = len(edges)
+        capacity = max(n, capacity or 0, 1)
+        self._edge_slots = np.zeros((capacity, 2), np.uint32)
+        self._edge_slots[:n] = edges
+        self._edge_weights = np.zeros(capacity)
+        self._edge_weights[:n] = weights
+        self._edge_used = np.zeros(capacity, bool)
+        self._edge_used[:n] = True
+
+    def _edges_to_adjacency(self):
+        n = len(self._node_pos)
+        used = self._edge_used
+        rows, cols = self._edge_slots[used].T.astype(np.intp)
+        weights = self._edge_weights[used]
+        if issparse(self._adjacency_mat):
+            from scipy import sparse
+            adjacency = sparse.coo_matrix((weights, (rows, cols)),
+                                          shape=(n, n))
+            return adjacency.asformat(self._adjacency_mat.format)
+        adjacency = np.zeros((n, n), np.asarray(self._adjacency_mat).dtype)
+        adjacency[rows, cols] = weights
+        return adjacency
+
+    def _update_node_data(self, func):
+        """Apply *func* to the marker attributes that are given per node"""
+        n_nodes = len(self._node_pos)
+        for key, value in list(self._node_data.items()):
+            values = _per_node_values(key, value, n_nodes)
+            if values is not None:
+                self._node_data[key] = func(values)
+
+    def _arrow_vertices(self):
+        if not self._directed:
+            return np.array([])
+        edges = self._edge_slots[self._edge_used]
+        return np.concatenate((self._node_pos[edges[:, 0]],
+                               self._node_pos[edges[:, 1]]), axis=1)
+
+    def _upload_incremental(self):
+        self._nodes.set_data(pos=self._node_pos, **self._node_data)
+        for k, v in self._node_properties.items():
+            setattr(self._nodes, k, v)
+        self._edges.set_data(pos=self._node_pos, connect=self._edge_slots,
+                             arrows=self._arrow_vertices(), **self._arrow_data)
+
+    def _update_edge_slots(self, slots):
+        for start, stop in _index_runs(slots):
+            self._edges.set_subdata(connect=self._edge_slots[start:stop],
+                                    offset=start)
+        if self._directed:
+            self._edges.set_data(arrows=self._arrow_vertices())
+
+    def _place_nodes(self, edges):
+        """Move unplaced nodes to the center of their placed neighbors"""
+        placed = self._node_placed
+        new = ~placed[edges[:, 0]] & placed[edges[:, 1]]
+        nodes, neighbors = edges[new, 0], edges[new, 1]
+        if len(nodes) == 0:
+            return
+        n = len(self._node_pos)
+        count = np.bincount(nodes, minlength=n)
+        moved = count > 0
+        center = np.empty((moved.sum(), 2))
+        for ii in range(2):
+            total = np.bincount(nodes, self._node_pos[neighbors, ii],
+                                minlength=n)
+            center[:, ii] = total[moved] / count[moved]
+        jitter = 0.1 / np.sqrt(n)
+        self._node_pos[moved] = center + np.random.uniform(
+            -jitter, jitter, center.shape)
+        self._node_placed[moved] = True
+
+    def _relax(self, nodes):
+        """Relax the layout around the given nodes and upload their positions
+        """
+        nodes = np.unique(nodes)
+        if len(nodes) == 0:
+            return
+        used = self._edge_used
+        rows, cols = self._edge_slots[used].T.astype(np.intp)
+        if self.relax_iterations > 0:
+            # the neighbors of the nodes are moved as well
+            touching = np.isin(rows, nodes) | np.isin(cols, nodes)
+            nodes = np.unique(np.concatenate((nodes, rows[touching],
+                                              cols[touching])))
+            optimal = (getattr(self._layout, 'optimal', None) or
+                       1 / np.sqrt(len(self._node_pos)))
+            _relax_nodes(self._node_pos, nodes,
+                         (rows, cols, self._edge_weights[used]), optimal,
+                         self.relax_iterations, optimal)
+
+        for start, stop in _index_runs(nodes):
+            pos = self._node_pos[start:stop]
+            self._nodes.set_subdata(pos, offset=start)
+            self._edges.set_subdata(pos=pos, offset=start)
+        if self._directed:
+            self._edges.set_data(arrows=self._arrow_vertices())
+
+
+def _per_node_values(key, value, n_nodes):
+    """Return a marker attribute as an array with a row per node, or None
+    if the attribute is shared by all nodes
+    """
+    if value is None or isinstance(value, str) or n_nodes < 2:
+        return None
+    if key in ('face_color', 'edge_color'):
+        values = ColorArray(value).rgba
+    else:
+        values = np.asarray(value)
+    if values.ndim == 0 or len(values) != n_nodes:
+        return None
+    return values
+
+
+def _index_runs(indices, gap=32):
+    """Split sorted indices into (start, stop) ranges to upload
+
+    Indices less than *gap* apart are merged into the same range, which
+    then includes the unchanged elements in between.
+    """
+    indices = np.unique(indices)
+    if len(indices) == 0:
+        return []
+    breaks = np.flatnonzero(np.diff(indices) > gap) + 1
+    starts = indices[np.r_[0, breaks]]
+    stops = indices[np.r_[breaks - 1, len(indices) - 1]] + 1
+    return list(zip(starts.tolist(), stops.tolist()))
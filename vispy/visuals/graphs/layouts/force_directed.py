@@ -32,22 +32,34 @@ class fruchterman_reingold(object):
         Number of iterations to perform for layout calculation.
     pos : array
         Initial positions of the nodes
+    theta : float | None
+        Opening angle of the Barnes-Hut approximation of the repulsive
+        forces. Groups of nodes that appear smaller than ``theta`` (cell size
+        divided by distance) from a node are replaced by their center of
+        mass, which brings the cost of an iteration down from O(N^2) to
+        O(N log N). Use 0 to always compute the exact forces. If None
+        (default), the exact forces are used for graphs with up to 1000
+        nodes and ``theta=0.8`` for larger graphs.
 
     Notes
     -----
     The algorithm is explained in more detail in the original paper [1]_.
+    The Barnes-Hut approximation is described in [2]_.
 
     .. [1] Fruchterman, Thomas MJ, and Edward M. Reingold. "Graph drawing by
        force-directed placement." Softw., Pract. Exper. 21.11 (1991),
        1129-1164.
+    .. [2] Barnes, Josh, and Piet Hut. "A hierarchical O(N log N)
+       force-calculation algorithm." Nature 324 (1986), 446-449.
     """
 
-    def __init__(self, optimal=None, iterations=50, pos=None):
+    def __init__(self, optimal=None, iterations=50, pos=None, theta=None):
         self.dim = 2
         self.optimal = optimal
         self.iterations = iterations
         self.num_nodes = None
         self.pos = pos
+        self.theta = theta
 
     def __call__(self, adjacency_mat, directed=False):
         """
@@ -89,18 +101,31 @@ class fruchterman_reingold(object):
         for result in solver(adjacency_mat, directed):
             yield result
 
-    def _fruchterman_reingold(self, adjacency_mat, directed=False):
-        if self.optimal is None:
-            self.optimal = 1 / np.sqrt(self.num_nodes)
+    def _get_theta(self):
+        if self.theta is None:
+            return 0. if self.num_nodes <= _EXACT_MAX_NODES else 0.8
+        return float(self.theta)
 
+    def _initial_pos(self):
         if self.pos is None:
             # Random initial positions
-            pos = np.asarray(
+            return np.asarray(
                 np.random.random((self.num_nodes, self.dim)),
                 dtype=np.float32
             )
-        else:
-            pos = self.pos.astype(np.float32)
+        return self.pos.astype(np.float32)
+
+    def _fruchterman_reingold(self, adjacency_mat, directed=False):
+        if self.optimal is None:
+            self.optimal = 1 / np.sqrt(self.num_nodes)
+
+        theta = self._get_theta()
+        if theta > 0:
+            # Only the edges are needed for the attractive forces
+            rows, cols = np.nonzero(adjacency_mat)
+            edges = (rows, cols, np.asarray(adjacency_mat)[rows, cols])
+
+        pos = self._initial_pos()
 
         # Yield initial positions
         line_vertices, arrows = _straight_line_vertices(adjacency_mat, pos,
@@ -116,11 +141,14 @@ class fruchterman_reingold(object):
         # size dt.
         dt = t / float(self.iterations+1)
         # The inscrutable (but fast) version
-        # This is still O(V^2)
-        # Could use multilevel methods to speed this up significantly
+        # This is still O(V^2), unless the Barnes-Hut approximation is used
         for iteration in range(self.iterations):
-            delta_pos = _calculate_delta_pos(adjacency_mat, pos, t,
-                                             self.optimal)
+            if theta > 0:
+                delta_pos = _calculate_delta_pos_approx(edges, pos, t,
+                                                        self.optimal, theta)
+            else:
+                delta_pos = _calculate_delta_pos(adjacency_mat, pos, t,
+                                                 self.optimal)
             pos += delta_pos
             _rescale_layout(pos)
 
@@ -138,19 +166,17 @@ class fruchterman_reingold(object):
         if self.optimal is None:
             self.optimal = 1 / np.sqrt(self.num_nodes)
 
-        # Change to list of list format
-        # Also construct the matrix in COO format for easy edge construction
-        adjacency_arr = adjacency_mat.toarray()
+        # Construct the matrix in COO format for easy edge construction
         adjacency_coo = adjacency_mat.tocoo()
-
-        if self.pos is None:
-            # Random initial positions
-            pos = np.asarray(
-                np.random.random((self.num_nodes, self.dim)),
-                dtype=np.float32
-            )
+        theta = self._get_theta()
+        if theta > 0:
+            edges = (adjacency_coo.row, adjacency_coo.col,
+                     adjacency_coo.data)
         else:
-            pos = self.pos.astype(np.float32)
+            # The exact solver works on the dense matrix
+            adjacency_arr = adjacency_mat.toarray()
+
+        pos = self._initial_pos()
 
         # Yield initial positions
         line_vertices, arrows = _straight_line_vertices(adjacency_coo, pos,
@@ -165,8 +191,12 @@ class fruchterman_reingold(object):
         # size dt.
         dt = t / float(self.iterations+1)
         for iteration in range(self.iterations):
-            delta_pos = _calculate_delta_pos(adjacency_arr, pos, t,
-                                             self.optimal)
+            if theta > 0:
+                delta_pos = _calculate_delta_pos_approx(edges, pos, t,
+                                                        self.optimal, theta)
+            else:
+                delta_pos = _calculate_delta_pos(adjacency_arr, pos, t,
+                                                 self.optimal)
             pos += delta_pos
             _rescale_layout(pos)
 
@@ -180,6 +210,10 @@ class fruchterman_reingold(object):
             yield pos, line_vertices, arrows
 
 
+# Largest graph for which the exact forces are computed by default
+_EXACT_MAX_NODES = 1000
+
+
 def _calculate_delta_pos(adjacency_arr, pos, t, optimal):
     """Helper to calculate the delta position"""
     # XXX eventually this should be refactored for the sparse case to only
@@ -199,7 +233,254 @@ def _calculate_delta_pos(adjacency_arr, pos, t, optimal):
             ((optimal * optimal) / (distance*distance) -
              (adjacency_arr * distance) / optimal)).sum(axis=1)
 
+    return _limit_displacement(displacement, t)
+
+
+def _calculate_delta_pos_approx(edges, pos, t, optimal, theta):
+    """Helper to calculate the delta position with Barnes-Hut repulsion
+
+    *edges* is a tuple of (rows, cols, weights) arrays.
+    """
+    displacement = _barnes_hut_repulsion(pos, optimal * optimal, theta)
+
+    # Attraction only acts along the edges
+    rows, cols, weights = edges
+    delta = pos[rows] - pos[cols]
+    distance2 = (delta*delta).sum(axis=-1)
+    distance = np.sqrt(np.maximum(distance2, 0.0001))
+    factor = weights * distance / optimal
+    for ii in range(2):
+        displacement[:, ii] -= np.bincount(rows, delta[:, ii] * factor,
+                                           minlength=len(pos))
+
+    return _limit_displacement(displacement, t)
+
+
+def _relax_nodes(pos, nodes, edges, optimal, iterations, t):
+    """Move only *nodes* under the forces of the whole graph, in place
+
+    This is used to warm-start the layout after a local change in the graph:
+    the repulsion from all nodes is computed exactly, which is O(k N) for
+    k moving nodes, and the attraction along the *edges*, given as a tuple
+    of (rows, cols, weights) arrays, that start at the moving nodes. The
+    temperature *t* is decreased linearly to zero.
+    """
+    nodes = np.unique(nodes)
+    if len(nodes) == 0 or iterations < 1:
+        return pos
+    rows, cols, weights = edges
+    pulling = np.isin(rows, nodes)
+    rows, cols, weights = rows[pulling], cols[pulling], weights[pulling]
+    local = np.searchsorted(nodes, rows)
+    # bound the size of the k x N temporaries
+    chunk = max(1, 2 ** 22 // max(len(pos), 1))
+
+    dt = t / float(iterations + 1)
+    for iteration in range(iterations):
+        displacement = np.zeros((len(nodes), 2))
+        for start in range(0, len(nodes), chunk):
+            sub = nodes[start:start + chunk]
+            delta = pos[sub, np.newaxis, :] - pos
+            distance2 = np.maximum((delta*delta).sum(axis=-1), 0.0001)
+            displacement[start:start + chunk] = (
+                delta * (optimal * optimal / distance2)[..., np.newaxis]
+            ).sum(axis=1)
+
+        delta = pos[rows] - pos[cols]
+        distance = np.sqrt(np.maximum((delta*delta).sum(axis=-1), 0.0001))
+        factor = weights * distance / optimal
+        for ii in range(2):
+            displacement[:, ii] -= np.bincount(local, delta[:, ii] * factor,
+                                               minlength=len(nodes))
+
+        pos[nodes] += _limit_displacement(displacement, t)
+        t -= dt
+    return pos
+
+
+def _limit_displacement(displacement, t):
     length = np.sqrt((displacement**2).sum(axis=1))
     length = np.where(length < 0.01, 0.1, length)
     delta_pos = displacement * t / length[:, np.newaxis]
     return delta_pos
+
+
+def _barnes_hut_repulsion(pos, k2, theta, leaf_size=8, chunk_size=4096):
+    """Approximate the repulsive displacement ``sum_j k2 * d_ij / |d_ij|^2``
+
+    The nodes are sorted along a Z-order curve, which turns every quadtree
+    cell into a contiguous range of nodes, and are split into groups: the
+    largest cells with at most *leaf_size* nodes. The tree is then traversed
+    for all groups at once, level by level. Every (group, cell) pair either
+    uses the center of mass of the cell, if the cell is far enough away from
+    the whole group, is evaluated exactly, if the cell is small, or is
+    replaced by the pairs of the group with the children of the cell. The
+    far forces are accumulated at the center of each group and extrapolated
+    linearly to its nodes.
+    """
+    n = len(pos)
+    pos = pos.astype(np.float64)
+    lo = pos.min(axis=0)
+    size = (pos.max(axis=0) - lo).max()
+    size = size if size > 0 else 1.
+    depth = 16
+    grid = np.floor((pos - lo) * ((1 << depth) / size)).astype(np.int64)
+    np.clip(grid, 0, (1 << depth) - 1, out=grid)
+    codes = (_spread_bits(grid[:, 0]) << 1) | _spread_bits(grid[:, 1])
+    order = np.argsort(codes, kind='stable')
+    codes = codes[order]
+    sorted_pos = pos[order]
+    sorted_xy = (sorted_pos[:, 0].copy(), sorted_pos[:, 1].copy())
+
+    # For each level: the start of each cell in the sorted nodes, the
+    # number of nodes and center of mass of the cells, and the range of
+    # their children in the next level
+    levels = []
+    node_cells = np.empty((depth + 1, n), np.int64)
+    group_level = np.zeros(n, np.int64)
+    for level in range(depth + 1):
+        keys = codes >> (2 * (depth - level))
+        new_cell = np.r_[True, keys[1:] != keys[:-1]]
+        starts = np.flatnonzero(new_cell)
+        mass = np.diff(np.r_[starts, n])
+        com = np.add.reduceat(sorted_pos, starts) / mass[:, np.newaxis]
+        levels.append([keys[starts], starts, mass, com])
+        node_cells[level] = np.cumsum(new_cell) - 1
+        group_level += mass[node_cells[level]] > leaf_size
+    for level in range(depth):
+        parents = levels[level][0]
+        children = levels[level + 1][0] >> 2
+        levels[level].append(np.searchsorted(children, parents, 'left'))
+        levels[level].append(np.searchsorted(children, parents, 'right'))
+
+    # The groups of nodes that are handled together
+    np.minimum(group_level, depth, out=group_level)
+    group_cell = node_cells[group_level, np.arange(n)]
+    group_start = np.flatnonzero(np.r_[True, (group_cell[1:] != group_cell[:-1]) |
+                                       (group_level[1:] != group_level[:-1])])
+    group_mass = np.diff(np.r_[group_start, n])
+    group_com = (np.add.reduceat(sorted_pos, group_start) /
+                 group_mass[:, np.newaxis])
+    offset = sorted_pos - np.repeat(group_com, group_mass, axis=0)
+    group_radius = np.maximum.reduceat(np.sqrt(offset[:, 0] ** 2 +
+                                               offset[:, 1] ** 2),
+                                       group_start)
+
+    # Far field per group: force and its jacobian at the group center
+    far_force = np.zeros((len(group_start), 2))
+    far_jac = np.zeros((len(group_start), 3))
+    displacement = np.zeros((n, 2))
+    for chunk in range(0, len(group_start), chunk_size):
+        groups = np.arange(chunk, min(chunk + chunk_size, len(group_start)))
+        cells = np.zeros(len(groups), np.int64)
+        for level in range(depth + 1):
+            if len(groups) == 0:
+                break
+            _, starts, mass, com = levels[level][:4]
+            cell_mass = mass[cells]
+            delta = group_com[groups] - com[cells]
+            distance = np.sqrt(delta[:, 0] ** 2 + delta[:, 1] ** 2)
+
+            # Cells that are far away from all nodes of the group act as a
+            # single body. Closer than the minimum distance of 0.01 the
+            # forces are capped, so those are always evaluated exactly.
+            cell_size = size / (1 << level)
+            gap = distance - group_radius[groups]
+            far = ((cell_size + group_radius[groups] < theta * gap) &
+                   (gap > 0.01))
+            _accumulate_far(far_force, far_jac, groups[far], delta[far],
+                            cell_mass[far])
+
+            # Within the minimum distance the force is linear in the offset,
+            # so cells that are that close to all nodes of the group also
+            # act as a single body, without approximation
+            close = (distance + group_radius[groups] +
+                     cell_size * np.sqrt(2)) < 0.01
+            _accumulate_close(far_force, far_jac, groups[close],
+                              delta[close], cell_mass[close])
+
+            # Small cells are evaluated exactly
+            far |= close
+            leaf = ~far & ((cell_mass <= leaf_size) | (level == depth))
+            _accumulate_exact(displacement, sorted_xy,
+                              group_start[groups[leaf]],
+                              group_mass[groups[leaf]],
+                              starts[cells[leaf]], cell_mass[leaf])
+
+            # The others are opened up into their children
+            if level == depth:
+                break
+            split = ~(far | leaf)
+            child_start, child_stop = levels[level][4:]
+            counts = (child_stop - child_start)[cells[split]]
+            groups = np.repeat(groups[split], counts)
+            cells = _expand_ranges(child_start[cells[split]], counts)
+
+    # Extrapolate the far field linearly from the group centers
+    group_of = np.repeat(np.arange(len(group_start)), group_mass)
+    jac = far_jac[group_of]
+    displacement[:, 0] += (far_force[group_of, 0] + jac[:, 0] * offset[:, 0] +
+                           jac[:, 1] * offset[:, 1])
+    displacement[:, 1] += (far_force[group_of, 1] + jac[:, 1] * offset[:, 0] +
+                           jac[:, 2] * offset[:, 1])
+    displacement *= k2
+
+    # Back to the original node order
+    result = np.empty_like(displacement)
+    result[order] = displacement
+    return result
+
+
+def _expand_ranges(starts, counts):
+    """Concatenate ``arange(start, start + count)`` for all ranges"""
+    first = np.repeat(starts - np.cumsum(counts) + counts, counts)
+    return first + np.arange(len(first))
+
+
+def _accumulate_far(force, jac, groups, delta, mass):
+    """Add the field ``mass * delta / |delta|^2`` and its jacobian"""
+    inv2 = mass / (delta[:, 0] ** 2 + delta[:, 1] ** 2)
+    x = delta[:, 0] * inv2
+    y = delta[:, 1] * inv2
+    n = len(force)
+    force[:, 0] += np.bincount(groups, x, minlength=n)
+    force[:, 1] += np.bincount(groups, y, minlength=n)
+    # d/dx (x / r^2) = (r^2 - 2x^2) / r^4, d/dy (x / r^2) = -2xy / r^4
+    jac[:, 0] += np.bincount(groups, inv2 - 2 * x * x / mass, minlength=n)
+    jac[:, 1] += np.bincount(groups, -2 * x * y / mass, minlength=n)
+    jac[:, 2] += np.bincount(groups, inv2 - 2 * y * y / mass, minlength=n)
+
+
+def _accumulate_close(force, jac, groups, delta, mass):
+    """Add the field ``mass * delta / 0.01^2`` and its jacobian"""
+    n = len(force)
+    force[:, 0] += np.bincount(groups, delta[:, 0] * mass * 1e4, minlength=n)
+    force[:, 1] += np.bincount(groups, delta[:, 1] * mass * 1e4, minlength=n)
+    jac[:, 0] += np.bincount(groups, mass * 1e4, minlength=n)
+    jac[:, 2] += np.bincount(groups, mass * 1e4, minlength=n)
+
+
+def _accumulate_exact(displacement, pos, starts_a, counts_a, starts_b,
+                      counts_b):
+    """Add ``delta / |delta|^2`` for all pairs of nodes of two ranges"""
+    # one row per node of the first range, holding the whole second range
+    rows_b = np.repeat(counts_b, counts_a)
+    nodes_a = np.repeat(_expand_ranges(starts_a, counts_a), rows_b)
+    nodes_b = _expand_ranges(np.repeat(starts_b, counts_a), rows_b)
+    delta = [None, None]
+    for ii in range(2):
+        delta[ii] = pos[ii][nodes_a] - pos[ii][nodes_b]
+    factor = 1. / np.maximum(delta[0] * delta[0] + delta[1] * delta[1],
+                             0.0001)
+    for ii in range(2):
+        displacement[:, ii] += np.bincount(nodes_a, delta[ii] * factor,
+                                           minlength=len(displacement))
+
+
+def _spread_bits(x):
+    """Interleave the lower 16 bits of x with zeros"""
+    x = (x | (x << 8)) & 0x00FF00FF
+    x = (x | (x << 4)) & 0x0F0F0F0F
+    x = (x | (x << 2)) & 0x33333333
+    x = (x | (x << 1)) & 0x55555555
+    return x
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+# Copyright (c) Vispy Development Team. All Rights Reserved.
+# Distributed under the (new) BSD License. See LICENSE.txt for more info.
+"""
+Tests for the incremental updates of the GraphVisual
+"""
+
+import numpy as np
+from numpy.testing import assert_array_equal
+
+from vispy.visuals import GraphVisual
+from vispy.visuals.graphs.graph import _index_runs
+from vispy.visuals.graphs.layouts.force_directed import _relax_nodes
+from vispy.visuals.graphs.util import _straight_line_vertices
+from vispy.testing import run_tests_if_main, assert_raises
+
+adjacency_mat = np.array([
+    [0, 1, 1, 0, 0],
+    [1, 0, 1, 0, 0],
+    [1, 1, 0, 1, 0],
+    [0, 0, 1, 0, 1],
+    [0, 0, 0, 1, 0],
+])
+
+
+def _make_graph(adjacency, **kwargs):
+    return GraphVisual(adjacency, layout='force_directed', arrow_type='stealth',
+                       arrow_size=10, node_symbol='disc', node_size=10,
+                       **kwargs)
+
+
+def _visible_edges(graph):
+    edges = graph._edges._connect
+    return set(map(tuple, edges[edges[:, 0] != edges[:, 1]].tolist()))
+
+
+def test_index_runs():
+    assert _index_runs([]) == []
+    assert _index_runs([5, 3, 4]) == [(3, 6)]
+    assert _index_runs([0, 10, 100], gap=20) == [(0, 11), (100, 101)]
+
+
+def test_relax_nodes():
+    np.random.seed(0)
+    pos = np.random.random((20, 2))
+    edges = np.nonzero(np.ones((20, 20)) - np.eye(20))
+    edges = edges + (np.ones(len(edges[0])),)
+    relaxed = _relax_nodes(pos.copy(), [3, 7], edges, 0.1, 10, 0.1)
+    moved = np.flatnonzero((relaxed != pos).any(axis=1))
+    assert_array_equal(moved, [3, 7])
+
+
+def test_graph_add_remove_edges():
+    np.random.seed(0)
+    graph = _make_graph(adjacency_mat, relax_iterations=5)
+    pos = graph._node_pos.copy()
+
+    graph.add_edges([[0, 4]], weights=2)
+    adjacency = graph.adjacency_matrix
+    assert adjacency[0, 4] == 2 and adjacency[4, 0] == 2
+    assert (0, 4) in _visible_edges(graph)
+    # only the endpoints and their neighbors move
+    moved = np.flatnonzero((graph._node_pos != pos).any(axis=1))
+    assert set(moved) <= {0, 1, 2, 3, 4}
+    # the line visual draws from the same positions as the markers
+    assert graph._edges._pos is graph._node_pos
+
+    graph.remove_edges([[2, 3]])
+    adjacency = graph.adjacency_matrix
+    assert adjacency[2, 3] == 0 and adjacency[3, 2] == 0
+    assert (2, 3) not in _visible_edges(graph)
+    assert adjacency.sum() == adjacency_mat.sum() - 2 + 4
+
+    # re-adding reuses the free slots instead of growing the buffers
+    n_slots = len(graph._edge_slots)
+    graph.add_edges([[2, 3]])
+    assert len(graph._edge_slots) == n_slots
+    assert_raises(IndexError, graph.add_edges, [[0, 5]])
+
+
+def test_graph_add_remove_nodes():
+    np.random.seed(0)
+    graph = _make_graph(adjacency_mat)
+    new = graph.add_nodes(2)
+    assert_array_equal(new, [5, 6])
+    assert graph.adjacency_matrix.shape == (7, 7)
+
+    graph.add_edges([[5, 4], [6, 5]])
+    # the new node is placed next to its neighbor
+    distance = np.linalg.norm(graph._node_pos[5] - graph._node_pos[4])
+    assert distance < 0.5
+
+    graph.remove_nodes([0, 5])
+    adjacency = graph.adjacency_matrix
+    assert adjacency.shape == (5, 5)
+    expected = np.delete(np.delete(adjacency_mat, 0, 0), 0, 1)
+    assert_array_equal(adjacency[:4, :4], expected)
+    assert adjacency[4].sum() == 0
+    assert len(graph._nodes._data) == 5
+
+    # the attributes given per node are resized along with the nodes
+    graph = _make_graph(adjacency_mat)
+    colors = np.random.random((5, 4)).astype(np.float32)
+    graph.set_data(face_color=colors, node_size=np.arange(5) + 10)
+    graph.add_nodes(2)
+    graph.add_edges([[5, 0], [6, 5]])
+    assert_array_equal(graph._node_data['face_color'][5:], colors[[4, 4]])
+    assert_array_equal(graph._node_data['size'], [10, 11, 12, 13, 14, 14, 14])
+    assert len(graph._nodes._data) == 7
+    graph.remove_nodes([1])
+    assert_array_equal(graph._node_data['size'], [10, 12, 13, 14, 14, 14])
+    assert len(graph._nodes._data) == 6
+
+    # a directed graph draws an arrow per edge
+    graph = _make_graph(adjacency_mat, directed=True)
+    graph.add_edges([[4, 0]])
+    arrows = graph._edges.arrows
+    assert len(arrows) == adjacency_mat.sum() + 1
+    line_vertices, _ = _straight_line_vertices(graph.adjacency_matrix,
+                                               graph._node_pos, True)
+    assert len(line_vertices) == 2 * len(arrows)
+
+
+run_tests_if_main()
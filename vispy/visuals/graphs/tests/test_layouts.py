@@ -136,4 +136,52 @@ def test_circular_layout():
     assert_allclose(line_vertices, expected_vertices, atol=1e-4)
 
 
+def test_force_directed_layout():
+    pos0 = np.random.RandomState(0).rand(len(adjacency_mat), 2)
+
+    def final_pos(adjacency, theta):
+        layout = get_layout('force_directed', iterations=10, pos=pos0,
+                            theta=theta)
+        for pos, line_vertices, arrows in layout(adjacency):
+            pass
+        return pos, line_vertices
+
+    # The Barnes-Hut approximation with a tiny opening angle is exact
+    pos, line_vertices = final_pos(adjacency_mat, 0)
+    assert pos.shape == (len(adjacency_mat), 2)
+    assert_allclose(pos.min(axis=0).min(), 0, atol=1e-6)
+    assert_allclose(pos.max(), 1, atol=1e-6)
+    approx_pos, approx_vertices = final_pos(adjacency_mat, 1e-6)
+    assert_allclose(approx_pos, pos, atol=1e-5)
+    assert_allclose(approx_vertices, line_vertices, atol=1e-5)
+
+    try:
+        from scipy import sparse
+    except ImportError:
+        return
+    sparse_pos, _ = final_pos(sparse.csr_matrix(adjacency_mat), 1e-6)
+    assert_allclose(sparse_pos, pos, atol=1e-5)
+
+
+def test_barnes_hut_repulsion():
+    from vispy.visuals.graphs.layouts.force_directed import \
+        _barnes_hut_repulsion
+
+    rng = np.random.RandomState(0)
+    # a dense cluster and a sparse background
+    pos = np.concatenate((rng.rand(300, 2) * 0.05, rng.rand(700, 2)))
+    delta = pos[:, np.newaxis] - pos
+    distance2 = np.maximum((delta * delta).sum(axis=-1), 0.0001)
+    k2 = 1. / len(pos)
+    expected = (delta * (k2 / distance2)[..., np.newaxis]).sum(axis=1)
+
+    assert_allclose(_barnes_hut_repulsion(pos, k2, 0.), expected,
+                    rtol=1e-8, atol=1e-8)
+    approx = _barnes_hut_repulsion(pos, k2, 0.5)
+    error = np.sqrt(((approx - expected) ** 2).sum(axis=1))
+    norm = np.sqrt((expected ** 2).sum(axis=1))
+    assert np.median(error / norm) < 0.01
+    assert error.max() < 0.05 * norm.max()
+
+
 run_tests_if_main()
@@ -691,10 +691,9 @@ class ImageVisual(Visual):
             self._build_texture()
 
         if self._need_colortransform_update:
-            prg = view.view_program
             self.shared_program.frag['color_transform'] = self._build_color_transform()
             self._need_colortransform_update = False
-            prg['texture2D_LUT'] = self.cmap.texture_lut()
+        self._set_lut_texture(view.view_program, self.cmap)
 
         if self._need_vertex_update:
             self._build_vertex_data()
@@ -46,7 +46,9 @@ class LineVisual(CompoundVisual):
     color : Color, tuple, or array
         The color to use when drawing the line. If an array is given, it
         must be of shape (..., 4) and provide one rgba color per vertex.
-        Can also be a colormap name, or appropriate `Function`.
+        Can also be a colormap name, or appropriate `Function`, or a tuple
+        ``(codes, palette)`` of an integer array with one code per vertex
+        and a list of colors (see ``ColorArray``).
     width:
         The width of the line in px. Line widths > 1px are only
         guaranteed to work when using 'agg' method.
@@ -84,6 +86,8 @@ class LineVisual(CompoundVisual):
         self._line_visual = None
 
         self._changed = {'pos': False, 'color': False, 'connect': False}
+        # ranges of pos and connect updated with set_subdata
+        self._subdata = {'pos': [], 'connect': []}
 
         self._pos = None
         self._color = None
@@ -204,6 +208,44 @@ class LineVisual(CompoundVisual):
 
         self.update()
 
+    def set_subdata(self, pos=None, connect=None, offset=0):
+        """Update part of the vertex positions or connections in place.
+
+        With the 'gl' method only the modified range is uploaded to the GPU.
+        The arrays previously given to ``set_data`` are modified.
+
+        Parameters
+        ----------
+        pos : array | None
+            Array of shape (N, 2) or (N, 3) replacing the coordinates of the
+            vertices ``offset`` to ``offset + N``.
+        connect : array | None
+            Integer array of shape (N, 2) replacing the segments ``offset``
+            to ``offset + N`` of the connect array.
+        offset : int
+            Index of the first vertex or segment to replace.
+        """
+        for name, value in (('pos', pos), ('connect', connect)):
+            if value is None:
+                continue
+            current = getattr(self, '_' + name)
+            if not isinstance(current, np.ndarray) or current.ndim != 2:
+                raise ValueError('set_subdata requires %s to be set as a 2D '
+                                 'array first' % name)
+            value = np.asarray(value)
+            stop = offset + len(value)
+            if offset < 0 or stop > len(current):
+                raise ValueError('%s range %d:%d out of bounds for length %d'
+                                 % (name, offset, stop, len(current)))
+            current[offset:stop] = value
+            if self._method == 'gl':
+                self._subdata[name].append((offset, stop))
+            else:
+                self._changed[name] = True
+        if pos is not None:
+            self._bounds = None
+        self.update()
+
     @property
     def color(self):
         return self._color
@@ -348,6 +390,13 @@ class _GLLineVisual(Visual):
             self._program.vert['position'] = self._pos_vbo
             self._program.vert['to_vec4'] = self._ensure_vec4_func(pos.shape[-1])
             self._parent._changed['pos'] = False
+            self._parent._subdata['pos'] = []
+
+        for start, stop in self._parent._subdata['pos']:
+            pos = np.ascontiguousarray(self._parent._pos[start:stop],
+                                       dtype=np.float32)
+            self._pos_vbo.set_subdata(pos, offset=start)
+        self._parent._subdata['pos'] = []
 
         if self._parent._changed['color']:
             color, cmap = self._parent._interpret_color()
@@ -378,6 +427,14 @@ class _GLLineVisual(Visual):
             if isinstance(self._connect, np.ndarray):
                 self._connect_ibo.set_data(self._connect)
             self._parent._changed['connect'] = False
+            self._parent._subdata['connect'] = []
+
+        for start, stop in self._parent._subdata['connect']:
+            self._connect[start:stop] = self._parent._connect[start:stop]
+            # offsets in the index buffer are counted in indices
+            self._connect_ibo.set_subdata(self._connect[start:stop],
+                                          offset=2 * start)
+        self._parent._subdata['connect'] = []
         if self._connect is None:
             return False
 
@@ -7,7 +7,7 @@
 import numpy as np
 
 from ..color import ColorArray
-from ..gloo import VertexBuffer
+from ..gloo import VertexBuffer, IndexBuffer
 from .shaders import Function, Variable
 from .visual import Visual
 from ..util.event import Event
@@ -570,7 +570,9 @@ class MarkersVisual(Visual):
     edge_color : Color | ColorArray
         The color used to draw each symbol outline.
     face_color : Color | ColorArray
-        The color used to draw each symbol interior.
+        The color used to draw each symbol interior. Categorical colors can
+        be given as a tuple ``(codes, palette)`` of an integer array with
+        one code per marker and a list of colors (see ``ColorArray``).
     symbol : str or array
         The style of symbol used to draw each marker (see Notes).
     scaling : str | bool
@@ -612,8 +614,17 @@ class MarkersVisual(Visual):
     Allowed style strings are: disc, arrow, ring, clobber, square, diamond,
     vbar, hbar, cross, tailed_arrow, x, triangle_up, triangle_down,
     and star.
+
+    At low quality (see `low_quality`), markers are drawn without
+    antialiasing and, with the 'points' method, only a uniform subset of
+    at most ``low_quality_max_markers`` markers is drawn.
     """
 
+    low_quality_max_markers = 1000000
+
+    # Number of markers and subsampling step of the current index buffer
+    _subsample = None
+
     _shaders = {
         'vertex': _VERTEX_SHADER,
         'fragment': _FRAGMENT_SHADER,
@@ -877,6 +888,31 @@ class MarkersVisual(Visual):
         self.events.data_updated()
         self.update()
 
+    def set_subdata(self, pos, offset=0):
+        """Update the positions of part of the markers in place.
+
+        Only the modified range is uploaded to the GPU.
+
+        Parameters
+        ----------
+        pos : array
+            Array of shape (N, 2) or (N, 3) with the new locations of the
+            markers ``offset`` to ``offset + N``.
+        offset : int
+            Index of the first marker to move.
+        """
+        if self._data is None:
+            raise ValueError('set_subdata requires data to be set first')
+        pos = np.asarray(pos)
+        stop = offset + len(pos)
+        if offset < 0 or stop > len(self._data):
+            raise ValueError('markers %d:%d out of bounds for %d markers'
+                             % (offset, stop, len(self._data)))
+        self._data['a_position'][offset:stop, :pos.shape[1]] = pos
+        self._vbo.set_subdata(self._data[offset:stop], offset=offset)
+        self.events.data_updated()
+        self.update()
+
     @property
     def symbols(self):
         return list(self._symbol_shader_values)
@@ -1057,9 +1093,27 @@ class MarkersVisual(Visual):
         view.view_program.vert['framebuffer_to_scene_or_visual'] = view.get_transform('framebuffer', scaling)
         view.view_program.vert['scene_or_visual_to_framebuffer'] = view.get_transform(scaling, 'framebuffer')
 
+    def _set_low_quality(self, low):
+        self.shared_program['u_antialias'] = 0. if low else self._antialias
+        self._update_subsample()
+
+    def _update_subsample(self):
+        """Set an index buffer that selects every n-th marker at low quality"""
+        n = 0 if self._data is None else len(self._data)
+        step = 1
+        if self._low_quality and self._method == 'points':
+            step = max(1, -(-n // int(self.low_quality_max_markers)))
+        subsample = (n, step) if step > 1 else None
+        if subsample != self._subsample:
+            self._subsample = subsample
+            self._index_buffer = None if subsample is None else \
+                IndexBuffer(np.arange(0, n, step, dtype=np.uint32))
+
     def _prepare_draw(self, view):
         if self._data is None:
             return False
+        if self._low_quality or self._subsample is not None:
+            self._update_subsample()
         view.view_program['u_px_scale'] = view.transforms.pixel_scale
 
     def _compute_bounds(self, axis, view):
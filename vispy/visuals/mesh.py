@@ -333,8 +333,6 @@ class MeshVisual(Visual):
 
         self.shared_program.vert['position'] = self._vertices
 
-        self.shared_program['texture2D_LUT'] = self._cmap.texture_lut()
-
         # Position input handling
         ensure_vec4 = self._ensure_vec4_func(v.shape[-1])
         self.shared_program.vert['to_vec4'] = ensure_vec4
@@ -358,6 +356,7 @@ class MeshVisual(Visual):
             if self._update_data() is False:
                 return False
             self._data_changed = False
+        self._set_lut_texture(self.shared_program, self._cmap)
 
     @staticmethod
     def _prepare_transforms(view):
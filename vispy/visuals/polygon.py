@@ -44,13 +44,16 @@ class PolygonVisual(CompoundVisual):
 
     triangulate : boolean
         Triangulate the set of vertices
+    incremental : boolean
+        Update the triangulation locally when only a few vertices move,
+        using an `IncrementalTriangulation`.
     **kwargs : dict
         Keyword arguments to pass to `CompoundVisual`.
     """
 
     def __init__(self, pos=None, color='black',
                  border_color=None, border_width=1, border_method='gl',
-                 triangulate=True, **kwargs):
+                 triangulate=True, incremental=False, **kwargs):
         self._mesh = MeshVisual()
         self._border = LineVisual(method=border_method)
         self._pos = pos
@@ -58,6 +61,10 @@ class PolygonVisual(CompoundVisual):
         self._border_width = border_width
         self._border_color = Color(border_color)
         self._triangulate = triangulate
+        self._incremental = incremental
+        # kept to update the triangulation when a few vertices move
+        self._data = None
+        self._triangulation = None
 
         self._update()
         CompoundVisual.__init__(self, [self._mesh, self._border], **kwargs)
@@ -69,8 +76,8 @@ class PolygonVisual(CompoundVisual):
         if self._pos is None:
             return
         if not self._color.is_blank and self._triangulate:
-            data = PolygonData(vertices=np.array(self._pos, dtype=np.float32))
-            pts, tris = data.triangulate()
+            pos = np.array(self._pos, dtype=np.float32)
+            pts, tris = self._triangulate_pos(pos)
             set_state(polygon_offset_fill=False)
             self._mesh.set_data(vertices=pts, faces=tris.astype(np.uint32),
                                 color=self._color.rgba)
@@ -90,6 +97,21 @@ class PolygonVisual(CompoundVisual):
 
             self._border.update()
 
+    def _triangulate_pos(self, pos):
+        if not self._incremental:
+            return PolygonData(vertices=pos).triangulate()
+        data = self._data
+        if data is not None and data.vertices.shape == pos.shape:
+            changed = np.flatnonzero((data.vertices != pos).any(axis=1))
+            # moving a few vertices is cheaper than triangulating again
+            if len(changed) <= max(1, len(pos) // 16):
+                for i in changed:
+                    self._triangulation = data.move_vertex(i, pos[i])
+                return self._triangulation
+        self._data = PolygonData(vertices=pos)
+        self._triangulation = self._data.triangulate(incremental=True)
+        return self._triangulation
+
     @property
     def pos(self):
         """The vertex position of the polygon."""
@@ -10,6 +10,17 @@ from .image import ImageVisual
 from ..util.fourier import stft, fft_freqs
 
 
+_SCROLL = """        if ($scroll != 0.0) {
+            texcoord.x = fract(texcoord.x + $scroll);
+        }
+        return """
+
+
+def _scrolled(template):
+    """Add a horizontal scroll offset to a texture lookup template"""
+    return template.replace('        return ', _SCROLL, 1)
+
+
 class SpectrogramVisual(ImageVisual):
     """Calculate and show a spectrogram
 
@@ -38,12 +49,33 @@ class SpectrogramVisual(ImageVisual):
     clim : str | tuple
         Colormap limits. Should be ``'auto'`` or a two-element tuple of
         min and max values.
+    n_steps : int | None
+        Number of steps (image columns) to show. If None, the spectrogram
+        of the whole signal is shown. Otherwise, only the last ``n_steps``
+        steps are shown, and they are stored in a circular texture so that
+        samples can be streamed efficiently with :meth:`append`.
+
+    Notes
+    -----
+    With ``clim='auto'``, the color limits are determined when the whole
+    spectrogram is calculated, and they are not updated when samples are
+    appended to a circular spectrogram.
     """
 
+    _func_templates = dict(ImageVisual._func_templates)
+    _func_templates['texture_lookup'] = _scrolled(
+        _func_templates['texture_lookup'])
+    _func_templates['texture_lookup_interpolated'] = _scrolled(
+        _func_templates['texture_lookup_interpolated'])
+
     def __init__(self, x=None, n_fft=256, step=None, fs=1., window='hann',
                  normalize=False, color_scale='log', cmap='cubehelix',
-                 clim='auto'):
-        self._x = np.asarray(x)
+                 clim='auto', n_steps=None):
+        self._x = None if x is None else np.asarray(x)
+        self._n_steps = None if n_steps is None else int(n_steps)
+        self._next = 0  # start of the next window in x
+        self._head = 0  # next column of the circular image
+        self._scroll = 0.
         self._n_fft = int(n_fft)
         self._step = step
         self._fs = float(fs)
@@ -144,6 +176,90 @@ class SpectrogramVisual(ImageVisual):
         self._normalize = normalize
         self._update_image()
 
+    @property
+    def n_steps(self):
+        """The number of steps shown, or None if all steps are shown"""
+        return self._n_steps
+
+    def append(self, samples):
+        """Append samples to the signal.
+
+        Only the steps that are completed by the new samples are calculated.
+        If ``n_steps`` is set, they are written into the circular texture,
+        which is scrolled so that the latest step is shown on the right.
+
+        Parameters
+        ----------
+        samples : array-like
+            1D array of samples to append.
+
+        Notes
+        -----
+        With ``normalize=True``, or while the signal is shorter than
+        ``n_fft``, the whole spectrogram is recalculated.
+        """
+        samples = np.array(samples, float)
+        if samples.ndim != 1:
+            raise ValueError('samples must be 1D')
+        if samples.size == 0:
+            return
+        idx = np.isnan(samples)
+        if idx.any():
+            samples[idx] = np.nanmean(samples)
+        incremental = self._x is not None and self._next > 0
+        self._x = (samples if self._x is None else
+                   np.concatenate((self._x, samples)))
+        if not incremental or self._normalize:
+            self._update_image()
+            return
+
+        n_fft, step = self._n_fft, self.step
+        n_new = (len(self._x) - self._next - n_fft) // step + 1
+        if n_new <= 0:
+            return
+        stop = self._next + (n_new - 1) * step + n_fft
+        data = self._scale(stft(self._x[self._next:stop], n_fft, step,
+                                self._fs, self._window))
+        self._next += n_new * step
+        if self._n_steps is None:
+            self.set_data(np.concatenate((self._data, data), axis=1))
+            if self._clim_auto:
+                self.clim = 'auto'
+            return
+
+        # write the new steps into the circular texture, in up to two parts
+        data = data[:, -self._n_steps:]
+        first = min(self._n_steps - self._head, data.shape[1])
+        for offset, part in ((self._head, data[:, :first]),
+                             (0, data[:, first:])):
+            if part.shape[1] == 0:
+                continue
+            self._data[:, offset:offset + part.shape[1]] = part
+            if not self._need_texture_upload:
+                self._texture.scale_and_set_data(np.ascontiguousarray(part),
+                                                 offset=(0, offset))
+        self._set_head((self._head + data.shape[1]) % self._n_steps)
+        self._trim()
+        self.update()
+
+    def _set_head(self, head):
+        self._head = head
+        self._scroll = head / float(self._n_steps) if self._n_steps else 0.
+        lookup = getattr(self, '_data_lookup_fn', None)
+        if lookup is not None and 'scroll' in lookup:
+            lookup['scroll'] = self._scroll
+
+    def _trim(self):
+        """Drop the samples of steps that are no longer shown"""
+        cut = max(self._next - self._n_steps * self.step, 0)
+        self._x = self._x[cut:]
+        self._next -= cut
+
+    def _scale(self, data):
+        data = np.abs(data)
+        data = 20 * np.log10(data) if self._color_scale == 'log' else data
+        return data.astype(np.float32)  # ImageVisual will warn if 64-bit
+
     def _calculate_spectrogram(self):
         if self._x is not None:
             x = self._x
@@ -151,18 +267,36 @@ class SpectrogramVisual(ImageVisual):
             idx = np.isnan(x)
             x[idx] = nan_mean
             data = stft(x, self._n_fft, self._step, self._fs, self._window)
-            data = np.abs(data)
-            data = 20 * np.log10(data) if self._color_scale == 'log' else data
+            self._next = data.shape[1] * self.step if len(x) >= self._n_fft \
+                else 0
+            data = self._scale(data)
             if self._normalize:
                 for i in range(data.shape[0]):
                     data[i, :] -= np.mean(data[i, :])
                     data[i, :] /= np.std(data[i, :])
-            return data.astype(np.float32)  # ImageVisual will warn if 64-bit
+        elif self._n_steps is not None:
+            data = np.zeros((self._n_fft // 2 + 1, 0), np.float32)
         else:
             return None
+        if self._n_steps is not None:
+            # the last steps, followed by empty (NaN) columns
+            ring = np.full((data.shape[0], self._n_steps), np.nan, np.float32)
+            data = data[:, -self._n_steps:]
+            ring[:, :data.shape[1]] = data
+            self._set_head(data.shape[1] % self._n_steps)
+            if self._x is not None:
+                self._trim()
+            data = ring
+        return data
+
+    def _build_interpolation(self):
+        super(SpectrogramVisual, self)._build_interpolation()
+        self._set_head(self._head)
 
     def _update_image(self):
         data = self._calculate_spectrogram()
+        if data is None:
+            return
         self.set_data(data)
         self.update()
         if self._clim_auto:
@@ -1,8 +1,12 @@
 # *Very* basic collections tests
 
+import numpy as np
+from numpy.testing import assert_allclose, assert_array_equal
+
 from vispy.visuals.collections import (PathCollection, PointCollection,
                                        PolygonCollection, SegmentCollection,
                                        TriangleCollection)
+from vispy.visuals.collections.base_collection import BaseCollection
 from vispy.testing import requires_application, TestingCanvas
 
 
@@ -13,3 +17,110 @@ def test_init():
         for coll in (PathCollection, PointCollection, PolygonCollection,
                      SegmentCollection, TriangleCollection):
             coll()
+
+
+def _commands(glir_object):
+    """Pop the queued GLIR commands of a buffer or texture"""
+    return [c for c in glir_object._glir.clear() if c[0] in ('SIZE', 'DATA')]
+
+
+def _vertices(coll, n, value):
+    vertices = np.zeros(n, coll.vtype)
+    vertices['position'] = value
+    return vertices
+
+
+def _uniforms(coll, value):
+    uniforms = np.zeros(1, coll.utype)
+    uniforms['color'] = value
+    return uniforms
+
+
+def test_collection_slots():
+    """Test reusing slots and uploading only what changed"""
+    vtype = [('position', np.float32, 2)]
+    utype = [('color', np.float32, 4)]
+    coll = BaseCollection(vtype, utype, np.uint32)
+    coll.reserve(vertices=1000, indices=1000, items=100)
+    for i in range(10):
+        coll.append(_vertices(coll, 4, i), indices=[0, 1, 2, 0, 2, 3],
+                    uniforms=_uniforms(coll, i / 10.))
+    assert len(coll) == 10
+    coll._update()
+    vbuf = coll._vertices_buffer
+    assert vbuf.size == 1024  # the capacity of the list
+    assert _commands(vbuf)[0][0] == 'SIZE'
+    _commands(coll._indices_buffer)
+
+    # appending only uploads the new item
+    coll.append(_vertices(coll, 4, 10), indices=[0, 1, 2, 0, 2, 3])
+    coll._update()
+    (cmd, _, offset, data), = _commands(vbuf)
+    assert (cmd, offset, len(data)) == ('DATA', 40 * vbuf.itemsize, 4)
+    assert len(_commands(coll._indices_buffer)) == 2  # resized
+
+    # deleting leaves a tombstone with degenerate indices
+    del coll[2]
+    assert len(coll) == 10
+    coll._update()
+    assert _commands(vbuf) == []
+    (_, _, offset, data), = _commands(coll._indices_buffer)
+    assert offset == 12 * 4
+    assert_array_equal(data, 8)
+    assert_array_equal(coll[2]['position'], 3)
+
+    # a smaller item reuses the free slot
+    coll.append(_vertices(coll, 3, 20), indices=[0, 1, 2], uniforms=_uniforms(coll, 1))
+    assert len(coll._vertices_list) == 11
+    item = coll[10]
+    assert_array_equal(item.vertices['position'], 20)
+    assert_array_equal(item.vertices['collection_index'], 2)
+    assert_array_equal(item.indices, [8, 9, 10])
+    assert_array_equal(coll._indices_list[2], [8, 9, 10, 8, 8, 8])
+    assert_array_equal(item.uniforms['color'], 1)
+    coll._update()
+    (_, _, offset, data), = _commands(vbuf)
+    assert (offset, len(data)) == (8 * vbuf.itemsize, 3)
+    item['color'] = (0, 0, 1, 1)
+    assert coll._dirty['uniforms'] == (2, 3)
+
+    # whole fields are read and written in item order, without tombstones
+    sizes = [4] * 10 + [3]
+    assert_allclose(coll['color'][:, 2],
+                    [0, .1, .3, .4, .5, .6, .7, .8, .9, 0, 1])
+    assert_array_equal(coll['position'][:, 0],
+                       np.repeat([0, 1, 3, 4, 5, 6, 7, 8, 9, 10, 20], sizes))
+    colors = np.zeros((11, 4))
+    colors[:, 0] = np.arange(11) / 10.
+    coll['color'] = colors
+    assert_allclose(coll['color'], colors)
+    assert_allclose(coll[10]['color'], [[1, 0, 0, 0]])
+    positions = np.repeat(np.arange(11), sizes)
+    coll['position'] = np.stack([positions, positions], axis=1)
+    assert_array_equal(coll['position'][:, 1], positions)
+    assert_array_equal(coll[10].vertices['position'], 10)
+    coll['color'] = (0, 0, 1, 1)
+    assert_allclose(coll['color'][:, 2], 1)
+
+    # the tombstones are compacted when they hold most vertices
+    del coll[:6]
+    assert coll._free_slots == []
+    assert len(coll._vertices_list) == len(coll) == 5
+    sizes = [4, 4, 4, 4, 3]
+    assert_array_equal(coll['collection_index'], np.repeat(range(5), sizes))
+    assert_array_equal(coll['position'][:, 0],
+                       np.repeat([6, 7, 8, 9, 10], sizes))
+    assert_array_equal(coll._indices_list[3], [12, 13, 14, 12, 14, 15])
+    assert_array_equal(coll[4].indices, [16, 17, 18])
+    assert_allclose(coll['color'][:, 2], 1)
+    del coll[...]
+    assert len(coll) == 0
+    assert len(coll._vertices_list) == 0
+
+    # collections without indices move the following items
+    coll = BaseCollection(vtype, utype)
+    coll.append(_vertices(coll, 6, np.arange(12).reshape(6, 2)), itemsize=2)
+    del coll[1]
+    assert len(coll) == 2
+    assert_array_equal(coll['collection_index'], [0, 0, 1, 1])
+    assert_array_equal(coll[1].vertices['position'], [[8, 9], [10, 11]])
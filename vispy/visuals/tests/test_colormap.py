@@ -12,6 +12,8 @@ from vispy.testing import (requires_application, TestingCanvas,
                            run_tests_if_main)
 from vispy.testing.image_tester import assert_image_approved
 from vispy.color import Colormap
+from vispy.gloo.context import FakeCanvas, forget_canvas
+from vispy.visuals import MeshVisual, VolumeVisual, ColorBarVisual
 
 size = (100, 100)
 
@@ -94,4 +96,28 @@ def test_colormap_CubeHelix():
         assert_image_approved(c.render(), "visuals/colormap_cubehelix.png")
 
 
+def test_colormap_texture_of_drawing_canvas():
+    """Test that visuals use the LUT texture of the canvas drawn to"""
+    created = FakeCanvas()
+    try:
+        mesh = MeshVisual(np.random.rand(3, 3), np.array([[0, 1, 2]]),
+                          vertex_values=np.arange(3.))
+        mesh.cmap = 'viridis'
+        volume = VolumeVisual(np.random.rand(4, 4, 4).astype(np.float32),
+                              cmap='viridis')
+        colorbar = ColorBarVisual(cmap='viridis', orientation='top',
+                                  size=(100, 10))._colorbar
+        drawing = FakeCanvas()
+        try:
+            for visual in (mesh, volume, colorbar):
+                visual._prepare_draw(None)
+                lut = visual.shared_program['texture2D_LUT']
+                assert lut is visual.cmap.texture_lut()
+        finally:
+            forget_canvas(drawing)
+        assert mesh.cmap.texture_lut() is not lut
+    finally:
+        forget_canvas(created)
+
+
 run_tests_if_main()
@@ -132,4 +132,19 @@ def test_markers_canvas_size_limits(rendering_method):
     assert markers.canvas_size_limits is None
 
 
+def test_markers_low_quality():
+    """Test drawing a subset of the markers without antialiasing"""
+    markers = Markers(pos=np.random.rand(25, 2), antialias=2)
+    markers.low_quality_max_markers = 10
+    markers.low_quality = True
+    assert markers.shared_program['u_antialias'] == 0
+    assert markers._index_buffer.size == 9
+    markers.set_data(pos=np.random.rand(100, 2))
+    markers._prepare_draw(markers)
+    assert markers._index_buffer.size == 10
+    markers.low_quality = False
+    assert markers._index_buffer is None
+    assert markers.shared_program['u_antialias'] == 2
+
+
 run_tests_if_main()
@@ -1,10 +1,12 @@
 # -*- coding: utf-8 -*-
 import numpy as np
+from numpy.testing import assert_allclose
 
 from vispy.scene.visuals import Spectrogram
 from vispy.testing import (requires_application, TestingCanvas,
                            run_tests_if_main, raises)
 from vispy.testing.image_tester import assert_image_approved
+from vispy.util.fourier import stft
 
 
 @requires_application()
@@ -39,4 +41,39 @@ def test_spectrogram():
         with raises(ValueError):
             spec.color_scale = 'line_log'
 
+
+def test_spectrogram_append():
+    """Test appending samples to a spectrogram"""
+    rng = np.random.RandomState(0)
+    data = rng.normal(size=5000)
+    n_fft, step = 64, 32
+    expected = 20 * np.log10(np.abs(stft(data, n_fft, step)))
+
+    # growing spectrogram
+    spec = Spectrogram(data[:1000].copy(), n_fft=n_fft, step=step)
+    for start in range(1000, 5000, 333):
+        spec.append(data[start:start + 333])
+    assert_allclose(spec._data, expected, atol=1e-4)
+    assert len(spec.x) == 5000
+
+    # circular spectrogram, starting without data
+    spec = Spectrogram(n_fft=n_fft, step=step, n_steps=50)
+    assert spec.n_steps == 50
+    assert spec._data.shape == (n_fft // 2 + 1, 50)
+    for start in range(0, 1000, 10):
+        spec.append(data[start:start + 10])
+    spec._build_texture()
+    spec._build_interpolation()
+    for start in range(1000, 5000, 333):
+        spec.append(data[start:start + 333])
+    assert spec._data.shape == (n_fft // 2 + 1, 50)
+    assert_allclose(np.roll(spec._data, -spec._head, axis=1),
+                    expected[:, -50:], atol=1e-4)
+    assert spec._scroll == spec._head / 50.
+    # only the samples of the shown steps are kept
+    assert len(spec.x) < 50 * step + n_fft
+    with raises(ValueError):
+        spec.append(np.zeros((2, 2)))
+
+
 run_tests_if_main()
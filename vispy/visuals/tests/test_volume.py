@@ -60,6 +60,19 @@ def test_volume_bounds():
     assert V._compute_bounds(2, V) == (0, 20)  # z
 
 
+@requires_pyopengl()
+def test_volume_low_quality():
+    vol = scene.visuals.Volume(np.zeros((10, 10, 10), np.float32),
+                               relative_step_size=0.5)
+    vol.low_quality = True
+    assert vol.shared_program['u_relative_step_size'] == 2.
+    vol.relative_step_size = 1.
+    assert vol.shared_program['u_relative_step_size'] == 4.
+    vol.low_quality = False
+    assert vol.relative_step_size == 1.
+    assert vol.shared_program['u_relative_step_size'] == 1.
+
+
 @requires_pyopengl()
 @requires_application()
 def test_volume_draw():
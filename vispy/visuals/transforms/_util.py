@@ -144,9 +144,21 @@ class TransformCache(object):
     transforms that were not accessed during the last draw cycle.
     """
 
-    def __init__(self, max_age=1):
+    def __init__(self, max_age=1, fuse_linear=False):
         self._cache = {}  # maps {key: [age, transform]}
         self.max_age = max_age
+        self._fuse_linear = fuse_linear
+
+    @property
+    def fuse_linear(self):
+        """The ``fuse_linear`` setting of the cached ChainTransforms."""
+        return self._fuse_linear
+
+    @fuse_linear.setter
+    def fuse_linear(self, fuse):
+        self._fuse_linear = fuse
+        for item in self._cache.values():
+            item[1].fuse_linear = fuse
 
     def get(self, path):
         """Get a transform from the cache that maps along *path*, which must
@@ -174,7 +186,7 @@ class TransformCache(object):
     def _create(self, path):
         # import here to avoid import cycle
         from .chain import ChainTransform
-        return ChainTransform(path)
+        return ChainTransform(path, fuse_linear=self._fuse_linear)
 
     def roll(self):
         """Increase the age of all items in the cache by 1. Items whose age
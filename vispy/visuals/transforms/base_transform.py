@@ -200,6 +200,11 @@ class InverseTransform(BaseTransform):
         self._inverse = transform
         self.map = transform.imap
         self.imap = transform.map
+        # the inverse changes along with the transform
+        transform.changed.connect(self._transform_changed)
+
+    def _transform_changed(self, ev):
+        self.update(ev)
 
     @property
     def Linear(self):
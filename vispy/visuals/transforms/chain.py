@@ -4,9 +4,88 @@
 
 from __future__ import division
 
-from ..shaders import FunctionChain
-from .base_transform import BaseTransform
-from .linear import NullTransform
+import numpy as np
+
+from ..shaders import Function, FunctionChain
+from ._util import as_vec4
+from .base_transform import BaseTransform, InverseTransform
+from .linear import NullTransform, STTransform, MatrixTransform
+
+
+# Shader function for a run of linear transforms in a chain with fuse_linear
+_FUSED_GLSL = """
+    vec4 fused_transform_map(vec4 pos) {
+        return $matrix * pos;
+    }
+"""
+
+
+def _flatten(tr, inverse, out):
+    """Append the transforms of *tr*, expanding nested chains, to the list
+    *out* in the order in which they are applied by map() or imap()
+    """
+    if isinstance(tr, ChainTransform):
+        for t in (tr.transforms if inverse else tr.transforms[::-1]):
+            _flatten(t, inverse, out)
+    else:
+        out.append(tr)
+    return out
+
+
+def _linear_matrix(tr, inverse=False):
+    """Get the matrix of a linear transform
+
+    Returns a tuple (matrix, st), where *matrix* is the 4x4 matrix (for row
+    vectors, as used by MatrixTransform) that performs the mapping (or
+    inverse mapping) of *tr*, and *st* is True if the matrix only scales
+    and translates. Returns None if *tr* cannot be expressed as a matrix.
+    """
+    if isinstance(tr, NullTransform):
+        return np.eye(4), True
+    if isinstance(tr, STTransform):
+        scale = tr.scale[:3].astype(np.float64)
+        translate = tr.translate[:3].astype(np.float64)
+        if inverse:
+            if not np.all(scale):
+                return None
+            scale = 1. / scale
+            translate = -translate * scale
+        m = np.diag(np.append(scale, 1.))
+        m[3, :3] = translate
+        return m, True
+    if isinstance(tr, MatrixTransform):
+        if not inverse:
+            return np.asarray(tr.matrix, np.float64), False
+        try:
+            return np.asarray(tr.inv_matrix, np.float64), False
+        except np.linalg.LinAlgError:
+            return None
+    if isinstance(tr, InverseTransform):
+        return _linear_matrix(tr._inverse, not inverse)
+    if isinstance(tr, ChainTransform):
+        steps = tr._get_steps(inverse)
+        if len(steps) == 0:
+            return np.eye(4), True
+        if len(steps) == 1 and isinstance(steps[0], tuple):
+            return steps[0]
+    return None
+
+
+def _apply_matrix(coords, matrix, st, out=None):
+    """Map vec4 coordinates through a matrix from _linear_matrix"""
+    if out is None:
+        out = np.empty(coords.shape)
+    if not st:
+        return np.matmul(coords, matrix, out=out)
+    # Only scale and translate, which unlike the matrix product does not
+    # mix non-finite values into the other components
+    np.multiply(coords[..., :3], matrix[[0, 1, 2], [0, 1, 2]],
+                out=out[..., :3])
+    translate = matrix[3, :3]
+    if np.any(translate):
+        out[..., :3] += coords[..., 3:] * translate
+    out[..., 3] = coords[..., 3]
+    return out
 
 
 class ChainTransform(BaseTransform):
@@ -19,6 +98,8 @@ class ChainTransform(BaseTransform):
     ----------
     transforms : list of BaseTransform instances
         See ``transforms`` property.
+    fuse_linear : bool
+        See ``fuse_linear`` property.
     """
 
     glsl_map = None
@@ -29,10 +110,15 @@ class ChainTransform(BaseTransform):
     NonScaling = False
     Isometric = False
 
-    def __init__(self, *transforms):
+    def __init__(self, *transforms, fuse_linear=False):
         super(ChainTransform, self).__init__()
         self._transforms = []
         self._simplified = None
+        # Cached steps for map() and imap(), see _get_steps()
+        self._steps = {}
+        self._fuse_linear = bool(fuse_linear)
+        # The non-linear transforms in the fused shader functions
+        self._fused_structure = {}
         self._null_transform = NullTransform()
         nmap = self._null_transform.shader_map()
 
@@ -95,6 +181,27 @@ class ChainTransform(BaseTransform):
         self._rebuild_shaders()
         self.update()
 
+    @property
+    def fuse_linear(self):
+        """Whether the shader functions combine linear transforms.
+
+        If True, each run of consecutive linear transforms in the chain
+        (including the transforms of nested chains) is computed on the CPU
+        into a single matrix, and passed to the shader as one mat4 uniform.
+        When these transforms change, only the uniform values are updated;
+        the shader code only changes when the chain's non-linear
+        transforms change.
+        """
+        return self._fuse_linear
+
+    @fuse_linear.setter
+    def fuse_linear(self, fuse):
+        fuse = bool(fuse)
+        if fuse != self._fuse_linear:
+            self._fuse_linear = fuse
+            self._fused_structure.clear()
+            self._rebuild_shaders()
+
     @property
     def simplified(self):
         """A simplified representation of the same transformation."""
@@ -130,38 +237,95 @@ class ChainTransform(BaseTransform):
             b &= tr.Isometric
         return b
 
-    def map(self, coords):
+    def map(self, coords, out=None):
         """Map coordinates
 
+        Consecutive linear transforms in the chain (``NullTransform``,
+        ``STTransform`` and ``MatrixTransform``) are combined into a single
+        matrix, which is cached until one of the transforms changes.
+
         Parameters
         ----------
         coords : array-like
             Coordinates to map.
+        out : ndarray | None
+            Array of the same shape as the mapped coordinates, in which to
+            store the result. This can be *coords* itself, if it is an array
+            of 4-component float64 coordinates, to map in place.
 
         Returns
         -------
         coords : ndarray
             Coordinates.
         """
-        for tr in reversed(self.transforms):
-            coords = tr.map(coords)
-        return coords
+        return self._map(coords, out, inverse=False)
 
-    def imap(self, coords):
+    def imap(self, coords, out=None):
         """Inverse map coordinates
 
         Parameters
         ----------
         coords : array-like
             Coordinates to inverse map.
+        out : ndarray | None
+            Array of the same shape as the mapped coordinates, in which to
+            store the result (see ``map``).
 
         Returns
         -------
         coords : ndarray
             Coordinates.
         """
-        for tr in self.transforms:
-            coords = tr.imap(coords)
+        return self._map(coords, out, inverse=True)
+
+    def _get_steps(self, inverse):
+        """Get the list of steps to map coordinates through the chain
+
+        Each step is either a tuple (matrix, st) from _linear_matrix for a
+        run of linear transforms, or a transform to apply by itself.
+        """
+        steps = self._steps.get(inverse)
+        if steps is None:
+            steps = []
+            for tr in _flatten(self, inverse, []):
+                mat = _linear_matrix(tr, inverse)
+                if mat is None:
+                    steps.append(tr)
+                elif steps and isinstance(steps[-1], tuple):
+                    prev, st = steps[-1]
+                    steps[-1] = (np.dot(prev, mat[0]), st and mat[1])
+                else:
+                    steps.append(mat)
+            self._steps[inverse] = steps
+        return steps
+
+    def _map(self, coords, out, inverse):
+        if len(self.transforms) == 0 and out is None:
+            return coords
+        if hasattr(coords, '_transform_in'):
+            return coords._transform_out(
+                self._map(coords._transform_in(), None, inverse))
+        steps = self._get_steps(inverse)
+        coords = np.asarray(coords)
+        flatten = coords.ndim == 1
+        coords = as_vec4(coords)
+        for i, step in enumerate(steps):
+            if isinstance(step, tuple):
+                dest = None
+                if (i == len(steps) - 1 and out is not None and
+                        out.shape == coords.shape):
+                    dest = out
+                coords = _apply_matrix(coords, step[0], step[1], dest)
+            elif inverse:
+                coords = step.imap(coords)
+            else:
+                coords = step.map(coords)
+        if out is not None:
+            if coords is not out:
+                out[...] = coords.reshape(out.shape)
+            return out
+        if flatten:
+            return coords.flatten()
         return coords
 
     def shader_map(self):
@@ -171,12 +335,44 @@ class ChainTransform(BaseTransform):
         return self._shader_imap
 
     def _rebuild_shaders(self):
+        self._steps.clear()
+        if self._fuse_linear:
+            self._update_fused_shaders()
+            return
         trs = self.transforms
         if len(trs) == 0:
             trs = [self._null_transform]
         self._shader_map.functions = [tr.shader_map() for tr in reversed(trs)]
         self._shader_imap.functions = [tr.shader_imap() for tr in trs]
 
+    def _update_fused_shaders(self):
+        """Update the shader functions when fuse_linear is enabled."""
+        for inverse, chain in ((False, self._shader_map),
+                               (True, self._shader_imap)):
+            steps = self._get_steps(inverse)
+            structure = [None if isinstance(step, tuple) else step
+                         for step in steps]
+            if structure == self._fused_structure.get(inverse):
+                # only the matrices changed
+                for fn, step in zip(chain.functions, steps):
+                    if isinstance(step, tuple):
+                        fn['matrix'] = step[0]
+                continue
+            self._fused_structure[inverse] = structure
+            functions = []
+            for step in steps:
+                if isinstance(step, tuple):
+                    fn = Function(_FUSED_GLSL)
+                    fn['matrix'] = step[0]
+                elif inverse:
+                    fn = step.shader_imap()
+                else:
+                    fn = step.shader_map()
+                functions.append(fn)
+            if len(functions) == 0:
+                functions = [self._null_transform.shader_map()]
+            chain.functions = functions
+
     def append(self, tr):
         """
         Add a new transform to the end of this chain.
@@ -207,12 +403,15 @@ class ChainTransform(BaseTransform):
 
     def _subtr_changed(self, ev):
         """One of the internal transforms changed; propagate the signal."""
+        self._steps.clear()
+        if self._fuse_linear:
+            self._update_fused_shaders()
         self.update(ev)
 
     def __setitem__(self, index, tr):
         self._transforms[index].changed.disconnect(self._subtr_changed)
         self._transforms[index] = tr
-        tr.changed.connect(self.subtr_changed)
+        tr.changed.connect(self._subtr_changed)
         self._rebuild_shaders()
         self.update()
 
@@ -221,14 +420,14 @@ class ChainTransform(BaseTransform):
             trs = tr.transforms
         else:
             trs = [tr]
-        return ChainTransform(self.transforms+trs)
+        return ChainTransform(self.transforms+trs, fuse_linear=self.fuse_linear)
 
     def __rmul__(self, tr):
         if isinstance(tr, ChainTransform):
             trs = tr.transforms
         else:
             trs = [tr]
-        return ChainTransform(trs+self.transforms)
+        return ChainTransform(trs+self.transforms, fuse_linear=self.fuse_linear)
 
     def __str__(self):
         names = [tr.__class__.__name__ for tr in self.transforms]
@@ -3,7 +3,7 @@
 # Distributed under the (new) BSD License. See LICENSE.txt for more info.
 
 import numpy as np
-from numpy.testing import assert_allclose
+from numpy.testing import assert_allclose, assert_array_equal
 import pytest
 
 import vispy.visuals.transforms as tr
@@ -215,6 +215,123 @@ def test_affine_mapping():
     assert np.allclose(t.map(p1)[:, :p2.shape[1]], p2)
 
 
+def test_chain_fused_map():
+    """Test mapping through the combined matrices of a chain"""
+    rng = np.random.RandomState(0)
+    rot = AT()
+    rot.rotate(30, (0, 0, 1))
+    st1 = ST(scale=(2, 3), translate=(1, 2))
+    st2 = ST(translate=(4, 5, 6))
+    trs = [st1, rot, PT(), ST(scale=(0.5, 0.5)), NT(), st2]
+    chain = CT(trs)
+    types = [type(step) for step in chain._get_steps(False)]
+    assert types == [tuple, PT, tuple]
+    pos = rng.uniform(1, 2, size=(100, 3))
+
+    def mapped(pos):
+        for trn in reversed(chain.transforms):
+            pos = trn.map(pos)
+        return pos
+
+    def imapped(pos):
+        for trn in chain.transforms:
+            pos = trn.imap(pos)
+        return pos
+
+    assert_allclose(chain.map(pos), mapped(pos))
+    assert_allclose(chain.map(pos[0]), mapped(pos[0]))
+    assert_allclose(chain.imap(pos), imapped(pos))
+
+    # the combined matrices follow changes of the transforms
+    st2.translate = (-1, 0, 0)
+    rot.rotate(10, (0, 0, 1))
+    assert_allclose(chain.map(pos), mapped(pos))
+    chain.append(ST(scale=(2, 1)))
+    assert_allclose(chain.map(pos), mapped(pos))
+
+    # and changes of the transforms whose inverse is in the chain
+    chain = CT([st1.inverse, rot.inverse, ST(translate=(1, 1))])
+    assert_allclose(chain.map(pos), mapped(pos))
+    st1.scale = (4, 5)
+    rot.rotate(20, (1, 0, 0))
+    assert_allclose(chain.map(pos), mapped(pos))
+    assert_allclose(chain.imap(pos), imapped(pos))
+
+    # mapping in place, and into an output array
+    pos4 = np.c_[pos, np.ones(len(pos))]
+    out = np.empty_like(pos4)
+    assert chain.map(pos4, out=out) is out
+    assert_allclose(out, mapped(pos))
+    chain.map(pos4, out=pos4)
+    assert_allclose(pos4, out)
+    chain.imap(pos4, out=pos4)
+    assert_allclose(pos4, imapped(out))
+
+    # scale and translate runs do not mix in non-finite values
+    chain = CT(ST(scale=(2, 2)), ST(translate=(1, 1)))
+    assert_array_equal(chain.map([np.inf, 1]), [np.inf, 4, 0, 1])
+
+
+def test_chain_fuse_linear():
+    """Test combining linear transforms in the shader functions"""
+    st = ST(scale=(2, 3), translate=(1, 2))
+    polar = PT()
+    inner = CT(AT(), NT())
+    chain = CT([ST(translate=(1, 0)), polar, inner, st], fuse_linear=True)
+    assert chain.fuse_linear
+    fn = chain.shader_map()
+    assert len(fn.functions) == 3
+    assert fn.functions[1] is polar.shader_map()
+    code = fn.compile()
+    assert code.count('fused_transform_map') == 4  # 2 definitions, 2 calls
+    assert 'st_transform_map' not in code
+
+    # changing a linear transform only changes the matrix uniforms
+    code_changes = []
+
+    class Dependent(object):
+        def _dep_changed(self, dep, code_changed=False, value_changed=False):
+            code_changes.append(code_changed)
+    dependent = Dependent()
+    fn._dependents[dependent] = None
+    st.translate = (5, 6)
+    inner.transforms[0].scale((2, 2))
+    assert not any(code_changes)
+    matrix = fn.functions[0]['matrix'].value
+    assert_allclose(np.dot([1, 1, 0, 1], matrix),
+                    inner.map(st.map([1, 1])))
+
+    # the matrix of a run that includes the inverse of a moving camera
+    cam = AT()
+    view = CT([ST(scale=(2, 2)), cam.inverse], fuse_linear=True)
+    view_fn = view.shader_map()
+    for angle in (30, 60):
+        cam.rotate(angle, (0, 1, 0))
+        matrix = view_fn.functions[0]['matrix'].value
+        assert_allclose(np.dot([1, 2, 3, 1], matrix), view.map([1, 2, 3]))
+
+    # changing the non-linear transforms rebuilds the shader functions
+    inner.transforms = [AT(), LT(base=(2, 0, 0))]
+    assert any(code_changes)
+    assert len(chain.shader_map().functions) == 5
+    assert len(chain.shader_imap().functions) == 5
+
+    # without fusion, each transform has its own function
+    chain.fuse_linear = False
+    assert 'st_transform_map' in chain.shader_map().compile()
+    assert_chain_objects(chain * st, CT(chain.transforms + [st]))
+
+    # transform systems create chains with the same setting
+    trsys = tr.TransformSystem()
+    trsys.visual_transform = ST(scale=(2, 2))
+    chain = trsys.get_transform()
+    assert not chain.fuse_linear
+    trsys.fuse_linear = True
+    assert chain.fuse_linear
+    assert trsys.get_transform('visual', 'document').fuse_linear
+    assert len(chain.shader_map().functions) == 1
+
+
 m = np.random.RandomState(0).normal(size=(4, 4))
 transforms = [
     NT(),
@@ -309,6 +309,18 @@ class TransformSystem(object):
     def framebuffer_transform(self, tr):
         self._framebuffer_transform.transforms = tr
 
+    @property
+    def fuse_linear(self):
+        """Whether the transforms returned by ``get_transform()`` combine
+        runs of linear transforms into a single matrix in their shader
+        functions (see ``ChainTransform.fuse_linear``).
+        """
+        return self._cache.fuse_linear
+
+    @fuse_linear.setter
+    def fuse_linear(self, fuse):
+        self._cache.fuse_linear = bool(fuse)
+
     def get_transform(self, map_from='visual', map_to='render'):
         """Return a transform mapping between any two coordinate systems.
 
@@ -86,12 +86,14 @@ will appear to behave as a single visual.
 from __future__ import division
 import weakref
 from contextlib import contextmanager
+from time import perf_counter
 
 import numpy as np
 
 from .. import gloo
 from ..util.event import EmitterGroup, Event
 from ..util import logger, Frozen
+from ..util import metrics as _metrics
 from .shaders import StatementList, MultiProgram
 from .transforms import TransformSystem
 
@@ -158,6 +160,7 @@ class BaseVisual(Frozen):
 
         self._transforms = None
         self.transforms = TransformSystem()
+        self._low_quality = False
 
     @property
     def transform(self):
@@ -205,6 +208,28 @@ class BaseVisual(Frozen):
             self._vshare.visible = v
             self.update()
 
+    @property
+    def low_quality(self):
+        """Whether the visual is drawn with cheaper settings
+
+        This is set by the canvas while the scene is interacted with and
+        drawing at full quality is too slow (see
+        `SceneCanvas.target_frame_time`). Visuals that can be drawn at
+        reduced quality implement ``_set_low_quality``.
+        """
+        return self._low_quality
+
+    @low_quality.setter
+    def low_quality(self, low):
+        low = bool(low)
+        if low != self._low_quality:
+            self._low_quality = low
+            self._set_low_quality(low)
+
+    def _set_low_quality(self, low):
+        """Switch to cheaper settings (low=True) or back to full quality"""
+        pass
+
     def view(self):
         """Return a new view of this visual."""
         return self._view_class(self)
@@ -454,6 +479,21 @@ class Visual(BaseVisual):
         """
         return True
 
+    def _set_lut_texture(self, program, cmap):
+        """Use the LUT texture of *cmap* in *program*.
+
+        The textures are shared by the canvases whose GL contexts share
+        objects, so this is done while preparing to draw, when the canvas
+        being drawn to is current.
+        """
+        texture = None if cmap is None else cmap.texture_lut()
+        try:
+            current = program['texture2D_LUT']
+        except KeyError:
+            current = None
+        if texture is not current:
+            program['texture2D_LUT'] = texture
+
     def _prepare_transforms(self, view):
         """This method is called whenever the TransformSystem instance is
         changed for a view.
@@ -502,8 +542,13 @@ class Visual(BaseVisual):
     def draw(self):
         if not self.visible:
             return
+        metrics = _metrics._active
+        if metrics is not None:
+            t0 = perf_counter()
         if self._prepare_draw(view=self) is False:
             return
+        if metrics is not None:
+            metrics.add_prepare(perf_counter() - t0)
 
         if self._vshare.draw_mode is None:
             raise ValueError("_draw_mode has not been set for visual %r" %
@@ -651,6 +696,10 @@ class CompoundVisual(BaseVisual):
     def _subv_update(self, event):
         self.update()
 
+    def _set_low_quality(self, low):
+        for v in self._subvisuals:
+            v.low_quality = low
+
     def _transform_changed(self, event=None):
         for v in self._subvisuals:
             v.transforms = self.transforms
@@ -660,8 +709,13 @@ class CompoundVisual(BaseVisual):
         """Draw the visual"""
         if not self.visible:
             return
+        metrics = _metrics._active
+        if metrics is not None:
+            t0 = perf_counter()
         if self._prepare_draw(view=self) is False:
             return
+        if metrics is not None:
+            metrics.add_prepare(perf_counter() - t0)
 
         for v in self._subvisuals:
             if v.visible:
@@ -693,6 +693,11 @@ class VolumeVisual(Visual):
         plane interrogated during rendering. Defined in data coordinates.
         Only relevant in raycasting_mode = 'plane'.
 
+    Notes
+    -----
+    At low quality (see `low_quality`), the relative step size is
+    increased by ``low_quality_step_factor``.
+
 
     .. versionchanged: 0.7
 
@@ -700,6 +705,8 @@ class VolumeVisual(Visual):
 
     """
 
+    low_quality_step_factor = 4.
+
     _rendering_methods = {
         'mip': _MIP_SNIPPETS,
         'minip': _MINIP_SNIPPETS,
@@ -949,7 +956,6 @@ class VolumeVisual(Visual):
     def cmap(self, cmap):
         self._cmap = get_colormap(cmap)
         self.shared_program.frag['cmap'] = Function(self._cmap.glsl_map)
-        self.shared_program['texture2D_LUT'] = self.cmap.texture_lut()
         self.update()
 
     @property
@@ -1127,7 +1133,6 @@ class VolumeVisual(Visual):
         self.shared_program.frag['after_loop'] = self._after_loop_snippet
         self.shared_program.frag['sampler_type'] = self._texture.glsl_sampler_type
         self.shared_program.frag['cmap'] = Function(self._cmap.glsl_map)
-        self.shared_program['texture2D_LUT'] = self.cmap.texture_lut()
         self.shared_program['u_mip_cutoff'] = self._mip_cutoff
         self.shared_program['u_minip_cutoff'] = self._minip_cutoff
         self._need_interpolation_update = True
@@ -1226,8 +1231,15 @@ class VolumeVisual(Visual):
             )
             value = minimum_val
         self._relative_step_size = value
+        if self._low_quality:
+            value *= self.low_quality_step_factor
         self.shared_program['u_relative_step_size'] = value
 
+    def _set_low_quality(self, low):
+        factor = self.low_quality_step_factor if low else 1.
+        self.shared_program['u_relative_step_size'] = \
+            self._relative_step_size * factor
+
     @property
     def plane_position(self):
         """Position on a plane through the volume.
@@ -1390,3 +1402,5 @@ class VolumeVisual(Visual):
 
         if self._need_interpolation_update:
             self._build_interpolation()
+
+        self._set_lut_texture(self.shared_program, self.cmap)